@@ -1,9 +1,16 @@
-from . import connections
-from . import controllers
-from . import equipment
-from . import functions
-from . import lab
-from . import loggers
-from . import exceptions
-from . import plotting
-from . import optimize
\ No newline at end of file
+import importlib
+
+# The subpackages are imported when they are first used such that scripts only pay for what they use
+_subpackages = ["connections", "controllers", "equipment", "functions", "lab", "loggers", "exceptions", "plotting", "optimize"]
+__all__ = list(_subpackages)
+
+# Imports a subpackage the first time it is accessed
+# Name (str): The name of the subpackage
+def __getattr__(Name):
+    if Name in _subpackages:
+        return importlib.import_module(f".{Name}", __name__)
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {Name!r}")
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_subpackages))
@@ -1,6 +1,6 @@
-from .connections_timer import timer
+from .connections_timer import timer, scheduler, schedulerTask, getScheduler
 from .connections_queue import queue, queueNoThread
-from .connections_base import deviceBase, device
+from .connections_base import deviceBase, device, commandBatch
 from .connections_serial import serial
 from .connections_visa import visa
 from .connections_dll import dll
@@ -1,3 +1,4 @@
+import threading as th
 from ..connections import queue, queueNoThread
 from .. import exceptions as e
 
@@ -38,6 +39,12 @@ class deviceBase:
 
 # The base class for any device
 class device(deviceBase):
+    # If False then sendCommands will send one command at the time, must be False if a response can only be read right after writing
+    _pipelining = True
+    
+    # If False then the commands cannot be collected with batch, must be False if the sub class uses the return value of sendCommand
+    _batchable = True
+    
     # ReconnectTries (int): How many times to attempt to reconnect if it disconnects, must not be smaller than 0
     # ReconnectDelay (float): The delay in seconds between each reconnect attempt, must not be negative
     # MaxAttempts (int): The maximum number attempts to send a command before giving up, must not be smaller than 1
@@ -47,9 +54,14 @@ class device(deviceBase):
     # Empty (bool): If True then it will not communicate with the device
     # OpenArgs (set): Arguments sent to open
     # OpenKwargs (dict): Arguments sent to open
+    # QueueKwargs (dict): Arguments sent to the queue like MaxLength and Policy
+    # CacheTTL (float): The time in seconds a cached parameter is valid, None to keep it until it is invalidated, 0 to disable the parameter cache
+    # SkipUnchanged (bool): If True then writes which allow it are not sent if the value is already set, only use it if nothing else changes the settings of the device
     # DeviceName (str): The name of the device, only used for error messages
     # ID (str): The ID name for the device, only used for displaying infomation
-    def __init__(self, *args, ReconnectTries = 10, ReconnectDelay = 1, MaxAttempts = 10, AttemptDelay = 1, UseQueue = True, ForceClose = False, Empty = False, OpenArgs = set(), OpenKwargs = dict(), **kwargs):
+    def __init__(self, *args, ReconnectTries = 10, ReconnectDelay = 1, MaxAttempts = 10, AttemptDelay = 1, UseQueue = True, ForceClose = False, Empty = False, OpenArgs = set(), OpenKwargs = dict(), QueueKwargs = dict(), CacheTTL = None, SkipUnchanged = False, **kwargs):
+        import weakref
+        
         super().__init__(*args, **kwargs)
             
         # Set default values
@@ -72,19 +84,42 @@ class device(deviceBase):
 
         if self._attemptDelay < 0:
             raise e.MinValueError("AttemptDelay", self._attemptDelay, 0)
+            
+        if CacheTTL is not None and float(CacheTTL) < 0:
+            raise e.MinValueError("CacheTTL", CacheTTL, 0)
+            
+        # Setup the parameter cache, the generation of a parameter is increased when it is invalidated such that a read started before is not cached
+        self._cacheTTL = None if CacheTTL is None else float(CacheTTL)
+        self._skipUnchanged = bool(SkipUnchanged)
+        self._cacheLock = th.Lock()
+        self._paramCache = dict()
+        self._paramWritten = dict()
+        self._paramGeneration = dict()
+        self.resetCacheStats()
 
         # Setup for empty
         self.empty = bool(Empty)
         self.setEmptyReturn("0")
         
+        # Setup batching of commands
+        self._batchLocal = th.local()
+        
+        # Only one command may use the connection at the time, the asyncio locks make the commands from each event loop wait in order
+        self._ioLock = th.Lock()
+        self._aLocks = weakref.WeakKeyDictionary()
+        
+        # The number of lines which have not been read when a command from asyncio was cancelled, the next command reads them first
+        self._unread = 0
+        
         # Setup a queue
         self._useQueue = bool(UseQueue)
+        self._queueKwargs = dict(QueueKwargs)
         
         if self._useQueue:
-            self._q = queue()
+            self._q = queue(**self._queueKwargs)
             
         else:
-            self._q = queueNoThread()
+            self._q = queueNoThread(**self._queueKwargs)
         
         # Opens device
         if not bool(Empty):
@@ -105,6 +140,62 @@ class device(deviceBase):
             
         self._emptyReturn = Value
         
+    # Gets the return value of a command when empty is true
+    # ReturnLines (int): The number of lines it expects to receive from the device
+    def _getEmptyReturn(self, ReturnLines):
+        ReturnString = self._emptyReturn.copy()
+        
+        if len(ReturnString) > ReturnLines:
+            ReturnString = ReturnString[:ReturnLines]
+            
+        elif len(ReturnString) < ReturnLines:
+            ReturnString += [ReturnString[-1]] * (ReturnLines - len(ReturnString))
+            
+        return ReturnString
+    
+    # Runs a function while holding the lock of the connection such that commands from the queue, other threads and asyncio are never mixed
+    # Function (callable): The function to run
+    # args and kwargs are passed to the function
+    def _exclusive(self, Function, *args, **kwargs):
+        with self._ioLock:
+            if self._unread > 0:
+                self._readUnread()
+                
+            return Function(*args, **kwargs)
+    
+    # Reads and throws away the lines of a cancelled command, flushes if they can not be read, the lock of the connection must be held
+    def _readUnread(self):
+        try:
+            self.read(self._unread)
+            
+        except Exception:
+            self.flush()
+            
+        self._unread = 0
+    
+    # Takes the lock of the connection from an asyncio event loop without blocking it, release it with _arelease
+    async def _aacquire(self):
+        import asyncio
+        
+        Lock = self._aLocks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        await Lock.acquire()
+        
+        # Wait for the commands from the queue and other threads to finish
+        try:
+            while not self._ioLock.acquire(blocking = False):
+                await asyncio.sleep(0.001)
+                
+        except BaseException:
+            Lock.release()
+            raise
+            
+    # Releases the lock of the connection taken with _aacquire
+    def _arelease(self):
+        import asyncio
+        
+        self._ioLock.release()
+        self._aLocks[asyncio.get_running_loop()].release()
+    
     # Writes a message to the device, must be overwritten by the sub class
     # Message (str): The message to write
     def write(self, Message):
@@ -116,9 +207,9 @@ class device(deviceBase):
     def read(self, Lines):
         raise e.ImplementationError("device.read")
     
-    # Flushes the device, must be overwritten by the sub class is flushing is posible
+    # Flushes the device and clears the parameter cache, must be overwritten by the sub class is flushing is posible
     def flush(self):
-        pass
+        self.clearParameterCache()
         
     # Opens the device again, must be overwritten by the sub class if it can be reopened
     def _reopen(self):
@@ -126,19 +217,48 @@ class device(deviceBase):
     
     # Reopens the device, implement own reopen in _reopen method
     def reopen(self, *args, **kwargs):
+        self.clearParameterCache()
         self._reopen(*args, **kwargs)
         
         if not self._q.isAlive():
             if self._useQueue:
-                self._q = queue()
+                self._q = queue(**self._queueKwargs)
                 
             else:
-                self._q = queueNoThread()
+                self._q = queueNoThread(**self._queueKwargs)
     
     # Opens a device, must be overwritten by the sub class
     def open(self):
         raise e.ImplementationError("device.open")
         
+    # Makes sure the device is open and attempts to reconnect if it is not
+    def _ensureOpen(self):
+        from .. import functions as f
+        
+        if self.isOpen():
+            return
+        
+        for _ in range(self._reconnectTries):
+            print(f"{self.deviceName} is disconnected attempting to reconnect")
+            
+            # Keep trying if the device can not be reached yet
+            try:
+                self.reopen()
+                
+            except Exception as ErrorMes:
+                self.lastError = ErrorMes
+                
+            if self.isOpen():
+                print("Reconnected")
+                break
+           
+            # Sleep for a bit
+            f.time.sleep(self._reconnectDelay)
+            
+        # Make sure it is connected
+        if not self.isOpen():
+            raise e.OpenError(self.deviceName, self)
+        
     # Send a command to the device
     # Command (str): The command to send the device
     # WriteArgs (set): The args sent to the write command
@@ -153,40 +273,21 @@ class device(deviceBase):
         
         # Check if it is empty
         if self.empty:
-            ReturnString = self._emptyReturn.copy()
-            
-            if len(ReturnString) > ReturnLines:
-                ReturnString = ReturnString[:ReturnLines]
-                
-            elif len(ReturnString) < ReturnLines:
-                ReturnString += [ReturnString[-1]] * (ReturnLines - len(ReturnString))
-                
-            return ReturnString
+            return self._getEmptyReturn(ReturnLines)
         
         # Reopen if forced to close
         if self._forceClose:
             self.reopen()
         
         # Check that the device is open
-        if not self.isOpen():
-            for _ in range(self._reconnectTries):
-                print(f"{self.deviceName} is disconnected attempting to reconnect")
-                
-                self.reopen()
-                if self.isOpen():
-                    print("Reconnected")
-                    break
-               
-                # Sleep for a bit
-                f.time.sleep(self._reconnectDelay)
-                
-            # Make sure it is connected
-            if not self.isOpen():
-                raise e.OpenError(self.deviceName, self)
+        self._ensureOpen()
             
         # Send the new command
         try:
             for _ in range(self._maxAttempts):
+                # Reconnect if the connection was lost during the last attempt
+                self._ensureOpen()
+                
                 # Write command
                 try:
                     self.write(Command, *WriteArgs, **WriteKwargs)
@@ -247,6 +348,7 @@ class device(deviceBase):
     # Send a command to the device
     # Command (str): The command to send the device
     # UseQueue (bool): Whether to run the command through the queue or not
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
     # WriteArgs (set): The args sent to the write command
     # WriteKwargs (dict): The kwargs sent to the write command
     # ReadArgs (set): The args sent to the read command
@@ -254,12 +356,19 @@ class device(deviceBase):
     # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
     # ReturnLines (int): The number of lines it expects to receive from the device
     # WaitTime (float): The time in seconds to wait before reading
-    def sendCommand(self, Command, *args, UseQueue = True, **kwargs):
+    def sendCommand(self, Command, *args, UseQueue = True, QueueTimeout = None, **kwargs):
+        # Add it to the batch if one is being collected on this thread
+        Batch = self._getBatch()
+        
+        if Batch is not None:
+            Batch.add(Command, *args, **kwargs)
+            return None
+        
         if UseQueue:
-            return self._q.call(self._sendCommand, Args = (Command,) + args, Kwargs = kwargs, Wait = True)
+            return self._q.call(self._exclusive, Args = (self._sendCommand, Command) + args, Kwargs = kwargs, Wait = True, Timeout = QueueTimeout)
             
         else:
-            return self._sendCommand(Command, *args, **kwargs)
+            return self._exclusive(self._sendCommand, Command, *args, **kwargs)
         
     # Sends a command without expecting a response
     # Command (str): The command to send the device
@@ -285,9 +394,311 @@ class device(deviceBase):
     # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, ReturnString) and must return None on succes or a string on failure with the error message
     # WaitTime (float): The time in seconds to wait before reading
     def query(self, *args, **kwargs):
+        # The response is not known until the batch is sent
+        if self._getBatch() is not None:
+            raise e.MethodError(self.deviceName, self, "query", Require = "outside a batch")
+        
         # Change the return lines
         kwargs["ReturnLines"] = 1
         return self.sendCommand(*args, **kwargs)[0]
+    
+    # Sends several commands, all commands are written to the device before reading the responses, if a command fails then it and all the commands after it are sent again one at the time in order
+    # Commands (list): The commands to send, each element is either the command or a tuple (Command, Kwargs) where Kwargs are the kwargs for that command like in sendCommand
+    # UseQueue (bool): Whether to run the commands through the queue or not, all commands are sent as a single item in the queue
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
+    # WriteArgs (set): The args sent to the write command
+    # WriteKwargs (dict): The kwargs sent to the write command
+    # ReadArgs (set): The args sent to the read command
+    # ReadKwargs (dict): The kwargs sent to the read command
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
+    # ReturnLines (int): The number of lines it expects to receive from the device
+    # WaitTime (float): The time in seconds to wait before reading, the longest wait time of all the commands is used once after writing all of them
+    # Returns a list with the return lines of each command
+    def sendCommands(self, Commands, UseQueue = True, QueueTimeout = None, **kwargs):
+        # Get the kwargs for each command
+        RunCommands = []
+        
+        for Command in Commands:
+            Kwargs = kwargs.copy()
+            
+            if isinstance(Command, tuple):
+                Kwargs.update(Command[1])
+                Command = Command[0]
+                
+            RunCommands.append((Command, Kwargs))
+        
+        if UseQueue:
+            return self._q.call(self._exclusive, Args = (self._sendCommands, RunCommands), Wait = True, Timeout = QueueTimeout)
+            
+        else:
+            return self._exclusive(self._sendCommands, RunCommands)
+    
+    # Sends several commands, all commands are written to the device before reading the responses
+    # Commands (list of tuple): A list with a tuple (Command, Kwargs) for each command where Kwargs are the kwargs for _sendCommand
+    def _sendCommands(self, Commands):
+        from .. import functions as f
+        
+        # Send one at the time if the device does not support pipelining
+        if self.empty or self._forceClose or not self._pipelining or len(Commands) < 2:
+            return [self._sendCommand(Command, **Kwargs) for Command, Kwargs in Commands]
+        
+        self._ensureOpen()
+        
+        Results = [None] * len(Commands)
+        Written = []
+        Failed = []
+        
+        # Write all of the commands
+        for i, (Command, Kwargs) in enumerate(Commands):
+            try:
+                self.write(Command, *Kwargs.get("WriteArgs", set()), **Kwargs.get("WriteKwargs", dict()))
+                Written.append(i)
+                
+            except Exception as ErrorMes:
+                self.lastError = ErrorMes
+                Failed.append(i)
+                
+        # Wait for the slowest command
+        WaitTime = max([float(Kwargs.get("WaitTime", 0)) for _, Kwargs in Commands])
+        
+        if WaitTime > 0:
+            f.time.sleep(WaitTime)
+        
+        # Read and check the responses in order
+        for j, i in enumerate(Written):
+            Command, Kwargs = Commands[i]
+            
+            try:
+                ReturnString = self.read(Kwargs.get("ReturnLines", 1), *Kwargs.get("ReadArgs", set()), **Kwargs.get("ReadKwargs", dict()))
+            
+            except Exception as ErrorMes:
+                # The rest of the responses can no longer be matched with the commands
+                self.lastError = ErrorMes
+                Failed += Written[j:]
+                break
+            
+            ResponseCheck = Kwargs.get("ResponseCheck", None)
+            
+            if ResponseCheck is not None:
+                Check = ResponseCheck(self, Command, ReturnString)
+            else:
+                Check = None
+                
+            if Check is None:
+                Results[i] = ReturnString
+                
+            else:
+                self.lastError = Check
+                Failed.append(i)
+                
+        # Send the failed and unconfirmed commands again one at the time in the original order, commands which passed the check are not repeated
+        if len(Failed) > 0:
+            print(f"{len(Failed)} of {len(Commands)} commands failed for {self.deviceName}, sending them again")
+            self.flush()
+            
+            for i in sorted(Failed):
+                Results[i] = self._sendCommand(Commands[i][0], **Commands[i][1])
+                
+        return Results
+    
+    # Collects all commands sent from this thread inside a with statement and sends them together with sendCommands when leaving it, the commands will return None and query cannot be used
+    # UseQueue (bool): Whether to run the commands through the queue or not
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
+    # kwargs are the default kwargs for all of the commands
+    def batch(self, **kwargs):
+        if not self._batchable:
+            raise e.MethodError(self.deviceName, self, "batch", Require = "able to send commands without using their response")
+        
+        return commandBatch(self, **kwargs)
+    
+    # Sends a command from an asyncio event loop without blocking it, the command is run through the queue or on the default executor if UseQueue is False, the queue is entered from the default executor so a full queue does not block the event loop, sub classes with non-blocking connections overwrite it with a native implementation
+    # Command (str): The command to send the device
+    # UseQueue (bool): Whether to run the command through the queue or not
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
+    # WriteArgs (set): The args sent to the write command
+    # WriteKwargs (dict): The kwargs sent to the write command
+    # ReadArgs (set): The args sent to the read command
+    # ReadKwargs (dict): The kwargs sent to the read command
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
+    # ReturnLines (int): The number of lines it expects to receive from the device
+    # WaitTime (float): The time in seconds to wait before reading
+    async def asend(self, Command, *args, UseQueue = True, QueueTimeout = None, **kwargs):
+        import asyncio
+        import functools
+        
+        Loop = asyncio.get_running_loop()
+        
+        # Sub classes which change sendCommand without changing asend must go through sendCommand to get the same result
+        if self._asendOverridden(["sendCommand"]):
+            return await Loop.run_in_executor(None, functools.partial(self.sendCommand, Command, *args, UseQueue = UseQueue, QueueTimeout = QueueTimeout, **kwargs))
+        
+        if UseQueue and self._useQueue:
+            # Put it in the queue from the executor since it blocks while the queue is full
+            Result = await Loop.run_in_executor(None, functools.partial(self._q.submit, self._exclusive, Args = (self._sendCommand, Command) + args, Kwargs = kwargs, Timeout = QueueTimeout))
+            
+        else:
+            Result = Loop.run_in_executor(None, functools.partial(self._exclusive, self._sendCommand, Command, *args, **kwargs))
+            
+        return await asyncio.wait_for(asyncio.wrap_future(Result), QueueTimeout)
+    
+    # Gets how far down the class hierarchy a method is defined, 0 is the class of this object
+    # Name (str): The name of the method
+    def _methodDepth(self, Name):
+        return next(i for i, Class in enumerate(type(self).__mro__) if Name in Class.__dict__)
+    
+    # Checks if a sub class changes any of the methods without changing asend, then asend must go through sendCommand to get the same result
+    # Names (list of str): The names of the methods used by asend
+    def _asendOverridden(self, Names):
+        Depth = self._methodDepth("asend")
+        
+        return any(self._methodDepth(Name) < Depth for Name in Names)
+    
+    # Sends a command expecting a single line of response from an asyncio event loop
+    # Command (str): The command to send the device
+    # UseQueue (bool): Whether to run the command through the queue or not
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
+    # WriteArgs (set): The args sent to the write command
+    # WriteKwargs (dict): The kwargs sent to the write command
+    # ReadArgs (set): The args sent to the read command
+    # ReadKwargs (dict): The kwargs sent to the read command
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
+    # WaitTime (float): The time in seconds to wait before reading
+    async def aquery(self, *args, **kwargs):
+        # Change the return lines
+        kwargs["ReturnLines"] = 1
+        return (await self.asend(*args, **kwargs))[0]
+    
+    # Gets the batch collecting commands on this thread, None if there is no batch
+    def _getBatch(self):
+        return getattr(self._batchLocal, "batch", None)
+        
+    # Returns a dict with statistics of the queue
+    def getQueueStats(self):
+        return self._q.getStats()
+    
+    # Checks if a cache entry is still valid, must be called while holding the cache lock
+    # Entry (tuple): The cache entry (Value, Time)
+    def _cacheValid(self, Entry):
+        import time
+        
+        return Entry is not None and (self._cacheTTL is None or time.monotonic() - Entry[1] < self._cacheTTL)
+    
+    # Reads a parameter through the parameter cache, the value is only read from the device if it is not cached, it has expired or it is volatile
+    # Key (hashable): The name of the parameter
+    # Function (func): The function to read the parameter from the device
+    # Args (tuple): The args for Function
+    # Kwargs (dict): The kwargs for Function
+    # Volatile (bool): If True then the device may change the value by itself so it is always read and never cached
+    def cacheRead(self, Key, Function, Args = tuple(), Kwargs = dict(), Volatile = False):
+        import time
+        
+        # Commands in a batch are not sent until the batch is sent
+        if Volatile or self._cacheTTL == 0 or self._getBatch() is not None:
+            with self._cacheLock:
+                self._cacheMisses += 1
+                
+            return Function(*Args, **Kwargs)
+        
+        with self._cacheLock:
+            Entry = self._paramCache.get(Key, None)
+            
+            if self._cacheValid(Entry):
+                self._cacheHits += 1
+                return Entry[0]
+            
+            self._cacheMisses += 1
+            Generation = self._paramGeneration.get(Key, 0)
+            
+        Value = Function(*Args, **Kwargs)
+        
+        # Only cache it if it was not written or invalidated while reading
+        with self._cacheLock:
+            if self._paramGeneration.get(Key, 0) == Generation:
+                self._paramCache[Key] = (Value, time.monotonic())
+        
+        return Value
+    
+    # Writes a parameter through the parameter cache, the cached value is invalidated before writing and the written value is recorded afterwards
+    # Key (hashable): The name of the parameter
+    # Value (any): The value being written, it must be the value cacheRead would return
+    # Function (func): The function to write the parameter to the device
+    # Args (tuple): The args for Function
+    # Kwargs (dict): The kwargs for Function
+    # Record (bool): If True then Value is cached, if False then the next cacheRead reads it from the device, use it when the device may round the value
+    # SkipUnchanged (bool): If True then it does not write if Value is the same as the last value written which is still valid, ignored unless the device was initialized with SkipUnchanged = True
+    def cacheWrite(self, Key, Value, Function, Args = tuple(), Kwargs = dict(), Record = True, SkipUnchanged = False):
+        import time
+        
+        Batch = self._getBatch() is not None
+        
+        with self._cacheLock:
+            Entry = self._paramWritten.get(Key, None)
+            
+            if SkipUnchanged and self._skipUnchanged and not Batch and self._cacheTTL != 0 and self._cacheValid(Entry) and type(Entry[0]) == type(Value) and Entry[0] == Value:
+                self._skippedWrites += 1
+                return None
+            
+            self._invalidate(Key)
+            self._cacheWrites += 1
+        
+        Result = Function(*Args, **Kwargs)
+        
+        # Commands in a batch are not sent until the batch is sent so the value is not known
+        if Batch or self._cacheTTL == 0:
+            return Result
+        
+        with self._cacheLock:
+            Now = time.monotonic()
+            self._paramWritten[Key] = (Value, Now)
+            
+            if Record:
+                self._paramCache[Key] = (Value, Now)
+            
+        return Result
+    
+    # Invalidates a parameter, must be called while holding the cache lock
+    # Key (hashable): The name of the parameter
+    def _invalidate(self, Key):
+        self._paramCache.pop(Key, None)
+        self._paramWritten.pop(Key, None)
+        self._paramGeneration[Key] = self._paramGeneration.get(Key, 0) + 1
+        
+    # Removes parameters from the parameter cache such that they are read from the device next time
+    # Key (hashable): The name of the parameter to remove, None to remove all parameters
+    def clearParameterCache(self, Key = None):
+        with self._cacheLock:
+            if Key is not None:
+                self._invalidate(Key)
+                return
+            
+            for Name in set(self._paramCache) | set(self._paramWritten):
+                self._invalidate(Name)
+                
+            self._cacheInvalidations += 1
+            
+    # Returns a dict with statistics of the parameter cache
+    def getCacheStats(self):
+        with self._cacheLock:
+            Reads = self._cacheHits + self._cacheMisses
+            
+            return {
+                "Size": len(self._paramCache),
+                "Hits": self._cacheHits,
+                "Misses": self._cacheMisses,
+                "HitRate": self._cacheHits / Reads if Reads > 0 else 0,
+                "Writes": self._cacheWrites,
+                "SkippedWrites": self._skippedWrites,
+                "Invalidations": self._cacheInvalidations,
+            }
+        
+    # Resets the statistics of the parameter cache
+    def resetCacheStats(self):
+        with self._cacheLock:
+            self._cacheHits = 0
+            self._cacheMisses = 0
+            self._cacheWrites = 0
+            self._skippedWrites = 0
+            self._cacheInvalidations = 0
         
     def _close(self):
         self._q.kill()   
@@ -296,3 +707,73 @@ class device(deviceBase):
     def close(self):
         if not self.empty:
             super().close()
+
+
+# Collects commands for a device and sends them all at once with sendCommands when leaving the with statement
+class commandBatch:
+    # Device (device): The device to send the commands to
+    # UseQueue (bool): Whether to run the commands through the queue or not
+    # QueueTimeout (float): The maximum time in seconds to wait for the queue, None to wait forever
+    # kwargs are the default kwargs for all of the commands
+    def __init__(self, Device, *args, UseQueue = True, QueueTimeout = None, **kwargs):
+        super().__init__(*args)
+        
+        self.device = Device
+        self.results = None
+        self._commands = []
+        self._useQueue = bool(UseQueue)
+        self._queueTimeout = QueueTimeout
+        self._kwargs = kwargs
+        self._parent = None
+        
+    # Adds a command to the batch
+    # Command (str): The command to send the device
+    # args and kwargs are the same as for sendCommand
+    def add(self, Command, *args, **kwargs):
+        # Add it to the outer batch to keep the order
+        if self._parent is not None:
+            self._parent.add(Command, *args, **kwargs)
+            return
+        
+        Kwargs = self._kwargs.copy()
+        Kwargs.update(zip(["WriteArgs", "WriteKwargs", "ReadArgs", "ReadKwargs", "ResponseCheck", "ReturnLines", "WaitTime"], args))
+        Kwargs.update(kwargs)
+        
+        # These are used for the whole batch
+        Kwargs.pop("UseQueue", None)
+        Kwargs.pop("QueueTimeout", None)
+        
+        self._commands.append((Command, Kwargs))
+        
+    # Sends all of the commands in the batch
+    # Returns a list with the return lines of each command
+    def send(self):
+        Commands = self._commands
+        self._commands = []
+        
+        if len(Commands) == 0:
+            self.results = []
+            
+        else:
+            self.results = self.device.sendCommands(Commands, UseQueue = self._useQueue, QueueTimeout = self._queueTimeout)
+            
+        return self.results
+        
+    def __enter__(self):
+        # Join the batch already collecting on this thread
+        self._parent = self.device._getBatch()
+        
+        if self._parent is None:
+            self.device._batchLocal.batch = self
+            
+        return self
+    
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        if self._parent is not None:
+            return
+        
+        self.device._batchLocal.batch = None
+        
+        # Do not send anything if an error occured
+        if ExceptionType is None:
+            self.send()
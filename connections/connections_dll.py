@@ -2,6 +2,9 @@ from ..connections import device
     
 # Class to control a dll controled device
 class dll(device):
+    # The return value is stored when writing so each command must be read before the next is written
+    _pipelining = False
+    
     # DLLPath (str): The path to the dll to load
     # ReconnectTries (int): How many times to attempt to reconnect if it disconnects, must not be smaller than 0
     # ReconnectDelay (float): The delay in seconds between each reconnect attempt, must not be negative
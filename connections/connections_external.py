@@ -2,6 +2,9 @@ from ..connections import device
     
 # A controller for a device which is controlled by other python functions
 class external(device):
+    # The return value is stored when writing so each command must be read before the next is written
+    _pipelining = False
+    
     # Library (object): The object containing all the external functions
     # ReconnectTries (int): How many times to attempt to reconnect if it disconnects, must not be smaller than 0
     # ReconnectDelay (float): The delay in seconds between each reconnect attempt, must not be negative
@@ -3,96 +3,224 @@ from .. import exceptions as e
 
 # Implements a queue system while allowing plotting interactions by the user
 class queue(th.Thread):
-    # MaxLength (int): The maximum length of the queue
-    # WaitInterval (float): The time in seconds to wait between checking for updates
-    def __init__(self, *args, MaxLength = 1000, WaitInterval = 0.001, **kwargs):
+    # MaxLength (int): The maximum length of the queue, if None then the queue is unbounded
+    # WaitInterval (float): Kept for compatibility, the queue is woken up when a new item is added instead of polling
+    # Policy (str): What to do when the queue is full, block: Wait until there is room, drop: Drop the oldest item which has not started yet, raise: Raise a QueueError
+    def __init__(self, *args, MaxLength = 1000, WaitInterval = 0.001, Policy = "block", **kwargs):
         import weakref
+        import collections
         
         super().__init__(*args, **kwargs)
         
+        # Check the policy
+        if not str(Policy).lower() in ["block", "drop", "raise"]:
+            raise e.KeywordError("Policy", str(Policy).lower(), ["block", "drop", "raise"])
+        
+        # The thread sleeps while idle so it must not keep the interpreter from exiting
+        self.daemon = True
         self._alive = True
-        self._size = int(MaxLength)
-        self._q = [None] * int(MaxLength)
-        self._getPos = 0
-        self._putPos = 0
+        self._policy = str(Policy).lower()
         self._waitTime = float(WaitInterval)
+        self._currentTask = None
+        
+        if MaxLength is None:
+            self._size = None
+            
+        else:
+            self._size = int(MaxLength)
+            
+            if self._size < 1:
+                raise e.MinValueError("MaxLength", self._size, 1)
+        
+        # The items waiting to be run, each item is [ID, Function, Args, Kwargs, Future, PutTime]
+        self._q = collections.deque()
+        self._nextID = 0
+        self._running = False
+        
+        # The futures of all items which are not done yet
+        self._futures = dict()
+        
+        # The condition is notified every time an item is added or finished
+        self._cond = th.Condition()
+        
+        self.resetStats()
         
         self.start()
         weakref.finalize(self, self.kill)
         
-    # Adds an item to the queue
+    # Puts an item in the queue and returns the ID and the future of the item
     # Function (callable): The function to run
     # Args (tuple): The args of the function
     # Kwargs (dict): The kwargs for the function
-    # Wait (bool): If True then it will wait until it has been processed and then return the return value, if False then it returns the ID
-    def call(self, Function, Args = tuple(), Kwargs = dict(), Wait = True):
+    # Timeout (float): The maximum time in seconds to wait for room in the queue when the policy is block, None to wait forever
+    # Force (bool): If True then the item is added even if the queue is full
+    def _put(self, Function, Args, Kwargs, Timeout = None, Force = False):
+        import time
+        from concurrent.futures import Future
+        
         if not self.is_alive():
             raise e.NotRunningError("Queue", self)
 
-        Return = [None]
-
         # Make sure Function is a callable
         if not (callable(Function) or Function == "kill"):
             raise e.TypeDefError("Function", Function, "callable")
             
         Args = tuple(Args)
         Kwargs = dict(Kwargs)
+        Result = Future()
         
-        # Get the ID to put at
-        ID = self._putPos
+        with self._cond:
+            # Make room for the item
+            if not Force and self._isFull():
+                if self._policy == "raise":
+                    self._rejected += 1
+                    raise e.QueueError()
+                    
+                elif self._policy == "drop":
+                    # The kill item must always stay in the queue
+                    for Task in self._q:
+                        if Task[1] != "kill":
+                            self._q.remove(Task)
+                            self._futures.pop(Task[0], None)
+                            Task[4].set_exception(e.QueueError())
+                            self._dropped += 1
+                            break
+                        
+                    # Reject the new item if nothing could be dropped
+                    else:
+                        self._rejected += 1
+                        raise e.QueueError()
+                        
+                else: # block
+                    if not self._cond.wait_for(lambda: not self._isFull(), timeout = Timeout):
+                        self._timedOut += 1
+                        raise e.TimeoutError("Queue", self)
+                        
+            # Put the item and wake up the queue
+            ID = self._nextID
+            self._nextID += 1
+            self._q.append([ID, Function, Args, Kwargs, Result, time.perf_counter()])
+            self._futures[ID] = Result
+            self._maxDepth = max(self._maxDepth, self._getSize())
+            self._cond.notify_all()
+            
+        return ID, Result
+    
+    # Checks if the queue is full, cancelled items are removed before deciding that it is full, the lock must be held
+    def _isFull(self):
+        if self._size is None or self._getSize() < self._size:
+            return False
         
-        if self._q[ID] is not None:
-            raise e.QueueError()
+        self._prune()
+        return self._getSize() >= self._size
+    
+    # Removes the cancelled items from the queue, the lock must be held
+    def _prune(self):
+        for Task in [Task for Task in self._q if Task[4].cancelled()]:
+            self._q.remove(Task)
+            self._futures.pop(Task[0], None)
+    
+    # Gets the size of the queue, the lock must be held
+    def _getSize(self):
+        return len(self._q) + int(self._running)
+    
+    # Waits for a future to finish
+    # Result (concurrent.futures.Future): The future to wait for
+    # Timeout (float): The maximum time in seconds to wait, None to wait forever
+    def _waitFuture(self, Result, Timeout = None):
+        from concurrent.futures import wait
         
-        self._putPos = (self._putPos + 1) % self._size
+        if len(wait([Result], timeout = Timeout).not_done) > 0:
+            # Remove it from the queue if it has not started yet
+            Result.cancel()
+            
+            with self._cond:
+                self._timedOut += 1
+                self._cond.notify_all()
+            
+            raise e.TimeoutError("Queue", self)
+        
+    # Adds an item to the queue
+    # Function (callable): The function to run
+    # Args (tuple): The args of the function
+    # Kwargs (dict): The kwargs for the function
+    # Wait (bool): If True then it will wait until it has been processed and then return the return value, if False then it returns the ID
+    # Timeout (float): The maximum time in seconds to wait for room in the queue and for the item to be processed, None to wait forever
+    def call(self, Function, Args = tuple(), Kwargs = dict(), Wait = True, Timeout = None):
+        import time
         
-        # Put the item
-        self._q[ID] = (Function, Args, Kwargs, Return)
+        StartTime = time.perf_counter()
+        ID, Result = self._put(Function, Args, Kwargs, Timeout = Timeout)
         
-        # Wait
-        if Wait:
-            self.wait(ID)
-            
-        else:
+        if not Wait:
             return ID
         
-        # Check for error
-        if Return[0][0]:
-            return Return[0][1]
+        if Timeout is not None:
+            Timeout = max(float(Timeout) - (time.perf_counter() - StartTime), 0)
+            
+        self._waitFuture(Result, Timeout = Timeout)
         
-        else:
-            raise Return[0][1]
+        # Returns the result or raises the error from the function
+        return Result.result()
+    
+    # Adds an item to the queue without waiting for it
+    # Function (callable): The function to run
+    # Args (tuple): The args of the function
+    # Kwargs (dict): The kwargs for the function
+    # Timeout (float): The maximum time in seconds to wait for room in the queue, None to wait forever
+    # Returns a concurrent.futures.Future which will hold the return value of the function
+    def submit(self, Function, Args = tuple(), Kwargs = dict(), Timeout = None):
+        return self._put(Function, Args, Kwargs, Timeout = Timeout)[1]
             
-    # Waits for an item to finish, still allows interactive plotting
+    # Waits for an item to finish
     # ID (int): The ID of the item
-    def wait(self, ID):
-        from .. import functions as f
-        import time
-        
-        while self._q[ID] is not None:
-            time.sleep(self._waitTime)
+    # Timeout (float): The maximum time in seconds to wait, None to wait forever
+    def wait(self, ID, Timeout = None):
+        with self._cond:
+            Result = self._futures.get(ID, None)
+            
+        if Result is not None:
+            self._waitFuture(Result, Timeout = Timeout)
             
     def run(self):
+        import time
         import warnings
-        from .. import functions as f
        
         while True:
-            # If there is no task
-            if self._q[self._getPos] is None:
-                f.time.sleep(self._waitTime)
-                continue
-            
-            # Run a taks
-            Task = self._q[self._getPos]
+            # Sleep until there is a task
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._q) > 0)
+                Task = self._q.popleft()
+                
+                # Skip it if it has been cancelled
+                if not Task[4].set_running_or_notify_cancel():
+                    self._futures.pop(Task[0], None)
+                    self._cond.notify_all()
+                    continue
+                
+                self._running = True
+                
+                # Save the wait time
+                WaitTime = time.perf_counter() - Task[5]
+                self._totalWait += WaitTime
+                self._maxWait = max(self._maxWait, WaitTime)
+                self._lastWait = WaitTime
             
             # Check if it should kill the queue
-            if Task[0] == "kill":
+            if Task[1] == "kill":
+                Task[4].set_result(None)
+                
+                with self._cond:
+                    self._futures.pop(Task[0], None)
+                    self._running = False
+                    self._cond.notify_all()
+                    
                 break
                 
             # Run a function
             try:
-                self._currentTask = Task[0]
-                Result = Task[0](*Task[1], **Task[2])
+                self._currentTask = Task[1]
+                Result = Task[1](*Task[2], **Task[3])
                 self._currentTask = None
                 State = True
                 
@@ -104,17 +232,24 @@ class queue(th.Thread):
                 State = False
             
             # Send result
-            Task[3][0] = (State, Result)
-
+            if State:
+                Task[4].set_result(Result)
+                
+            else:
+                Task[4].set_exception(Result)
+                
             # Mark the task as done
-            self._q[self._getPos] = None
-            self._getPos = (self._getPos + 1) % self._size
+            with self._cond:
+                self._futures.pop(Task[0], None)
+                self._running = False
+                self._processed += 1
+                self._cond.notify_all()
            
     # Kills the queue after finishing all tasks
     def kill(self):
         if self.isAlive():
             self._alive = False
-            self.call("kill", Wait = False)
+            self._put("kill", tuple(), dict(), Force = True)
             
     # Kills the current task
     def killCurrent(self):
@@ -130,26 +265,63 @@ class queue(th.Thread):
       
     # Returns the number of elements in the queue
     def getSize(self):
-        Size = self._putPos - self._getPos
+        with self._cond:
+            return self._getSize()
         
-        if Size < 0:
-            Size += self._size
+    # Returns a dict with statistics of the queue
+    def getStats(self):
+        with self._cond:
+            Started = self._processed + int(self._running)
             
-        return Size
+            return {
+                "Size": self._getSize(),
+                "MaxSize": self._size,
+                "MaxDepth": self._maxDepth,
+                "Processed": self._processed,
+                "Dropped": self._dropped,
+                "Rejected": self._rejected,
+                "TimedOut": self._timedOut,
+                "MeanWait": self._totalWait / Started if Started > 0 else 0,
+                "MaxWait": self._maxWait,
+                "LastWait": self._lastWait,
+            }
+        
+    # Resets the statistics of the queue
+    def resetStats(self):
+        with self._cond:
+            self._maxDepth = 0
+            self._processed = 0
+            self._dropped = 0
+            self._rejected = 0
+            self._timedOut = 0
+            self._totalWait = 0
+            self._maxWait = 0
+            self._lastWait = 0
 
 
 # A queue object for replacing queue if no new thread should be created
 class queueNoThread:
-    # MaxLength (int): The maximum length of the queue, kept for compatibility
+    # MaxLength (int): The maximum length of the queue, None for unbounded, kept for compatibility
     # WaitInterval (float): The time in seconds to wait between checking for updates, kept for compatibility
-    def __init__(self, *args, MaxLength = 1000, WaitInterval = 0.01, **kwargs):
+    # Policy (str): What to do when the queue is full, kept for compatibility
+    def __init__(self, *args, MaxLength = 1000, WaitInterval = 0.01, Policy = "block", **kwargs):
         import weakref
         
         super().__init__(*args, **kwargs)
         
         self._alive = True
-        self._size = int(MaxLength)
-        self._q = [None] * int(MaxLength)
+        
+        # None is unbounded like for the threaded queue
+        if MaxLength is None:
+            self._size = None
+            
+        else:
+            self._size = int(MaxLength)
+            
+            if self._size < 1:
+                raise e.MinValueError("MaxLength", self._size, 1)
+                
+        self._q = []
         self._getPos = 0
         self._putPos = 0
         self._waitTime = float(WaitInterval)
@@ -161,8 +333,9 @@ class queueNoThread:
     # Args (tuple): The args of the function
     # Kwargs (dict): The kwargs for the function
     # Wait (bool): If True then it will wait until it has been processed and then return the return value, if False then it returns the ID
-    def call(self, Function, Args = tuple(), Kwargs = dict(), Wait = True):
-        if not self.is_alive():
+    # Timeout (float): Kept for compatibility
+    def call(self, Function, Args = tuple(), Kwargs = dict(), Wait = True, Timeout = None):
+        if not self.isAlive():
             raise e.NotRunningError("Queue", self)
 
         # Make sure Function is a callable
@@ -181,10 +354,29 @@ class queueNoThread:
             
         else:
             return 0
+    
+    # Runs the function right away and returns a finished future, kept for compatibility
+    # Function (callable): The function to run
+    # Args (tuple): The args of the function
+    # Kwargs (dict): The kwargs for the function
+    # Timeout (float): Kept for compatibility
+    def submit(self, Function, Args = tuple(), Kwargs = dict(), Timeout = None):
+        from concurrent.futures import Future
+        
+        Result = Future()
+        
+        try:
+            Result.set_result(self.call(Function, Args = Args, Kwargs = Kwargs))
+            
+        except Exception as ErrorMes:
+            Result.set_exception(ErrorMes)
+            
+        return Result
             
     # Waits for an item to finish, still allows interactive plotting
     # ID (int): The ID of the item
-    def wait(self, ID):
+    # Timeout (float): Kept for compatibility
+    def wait(self, ID, Timeout = None):
         pass
        
     # Kills the queue after finishing all tasks
@@ -203,4 +395,11 @@ class queueNoThread:
     # Returns the number of elements in the queue
     def getSize(self):
         return 0
-        
\ No newline at end of file
+    
+    # Returns a dict with statistics of the queue, kept for compatibility
+    def getStats(self):
+        return {"Size": 0, "MaxSize": self._size, "MaxDepth": 0, "Processed": 0, "Dropped": 0, "Rejected": 0, "TimedOut": 0, "MeanWait": 0, "MaxWait": 0, "LastWait": 0}
+    
+    # Not used
+    def resetStats(self):
+        pass
@@ -58,6 +58,7 @@ class serial(device):
     
     # Flushes the device
     def flush(self):
+        self.clearParameterCache()
         self._serial.reset_input_buffer()
         self._serial.reset_output_buffer()
     
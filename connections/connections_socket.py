@@ -1,5 +1,78 @@
 from ..connections import device, deviceBase
 from .. import exceptions as e
+import struct
+
+# The message a client sends to ask a socketServer to switch the connection to binary frames
+_binaryRequest = "*binary"
+
+# The header of a binary frame with the kind of frame, b"s" for text and b"a" for an array, and the size of the payload in bytes
+_frameHeader = struct.Struct("<cQ")
+
+# Checks if a message is a numpy array without importing numpy
+# Message (any): The message to check
+def _isArray(Message):
+    import sys
+    
+    Numpy = sys.modules.get("numpy", None)
+    
+    return Numpy is not None and isinstance(Message, Numpy.ndarray)
+
+# Converts a reply from a serverFunction to a text line, arrays are sent as all of their values separated by |
+# Reply (str/numpy.ndarray): The reply to convert
+def _replyText(Reply):
+    if _isArray(Reply):
+        return "|".join(["1"] + [str(Value) for Value in Reply.ravel().tolist()])
+    
+    return Reply
+
+# Converts a message to the parts of a binary frame, an array frame contains the dtype, the shape and the raw data of the array
+# Message (str/numpy.ndarray): The message to convert
+def _encodeFrame(Message):
+    if not _isArray(Message):
+        Payload = str(Message).encode("utf-8")
+        
+        return [_frameHeader.pack(b"s", len(Payload)), Payload]
+    
+    import numpy as np
+    
+    Array = Message if Message.flags.c_contiguous else Message.copy(order = "C")
+    DType = Array.dtype.str.encode("utf-8")
+    ArrayHeader = struct.pack(f"<B{len(DType)}sB{Array.ndim}Q", len(DType), DType, Array.ndim, *Array.shape)
+    
+    return [_frameHeader.pack(b"a", len(ArrayHeader) + Array.nbytes), ArrayHeader, Array.reshape(-1).view(np.uint8).data]
+
+# Sends a message as a binary frame, large arrays are sent directly from the memory of the array
+# Connection (socket.socket): The connection to send it through
+# Message (str/numpy.ndarray): The message to send
+def _sendFrame(Connection, Message):
+    Parts = _encodeFrame(Message)
+    
+    if sum([len(Part) for Part in Parts]) < 2 ** 16:
+        Connection.sendall(b"".join(Parts))
+        
+    else:
+        for Part in Parts:
+            Connection.sendall(Part)
+
+# Converts the payload of a binary frame to a message
+# Kind (bytes): The kind of frame, b"s" for text and b"a" for an array
+# Payload (bytearray): The payload of the frame
+def _decodeFrame(Kind, Payload):
+    if Kind == b"s":
+        return Payload.decode("utf-8")
+    
+    if Kind != b"a":
+        raise ValueError(f"Unknown kind of binary frame: {Kind}")
+    
+    import numpy as np
+    
+    Length = Payload[0]
+    DType = np.dtype(Payload[1:1 + Length].decode("utf-8"))
+    Dimensions = Payload[1 + Length]
+    Shape = struct.unpack_from(f"<{Dimensions}Q", Payload, 2 + Length)
+    
+    return np.frombuffer(Payload, dtype = DType, offset = 2 + Length + 8 * Dimensions).reshape(Shape)
+
 
 # Controls a socket connection
 class socket(device):
@@ -25,18 +98,22 @@ class socket(device):
 
         kwargs["OpenArgs"] = (IP, Port)
         kwargs["OpenKwargs"] = {"Timeout": Timeout}
-            
-        # Run the super init
-        super().__init__(*args, **kwargs)
-
-        # Set default values
+        
+        import collections
+        
+        # Set default values, the connection is opened in the super init so this must be set first
         self._bufferSize = int(BufferSize)
-        self._lines = []
-        self._mes = b""
+        self._lines = collections.deque()
+        self._mes = bytearray()
+        self._buffer = bytearray(self._bufferSize)
+        self._bufferView = memoryview(self._buffer)
         self._timeout = float(Timeout)
         self._readTermination = str(ReadTermination).encode("utf-8")
-        self._readTerminationLength = len(ReadTermination)
+        self._readTerminationLength = len(self._readTermination)
         self._writeTermination = str(WriteTermination)
+            
+        # Run the super init
+        super().__init__(*args, **kwargs)
         
     # Writes a message to the device
     # Message (str): The message to write
@@ -50,33 +127,48 @@ class socket(device):
         StartTime = time.time()
         
         while (time.time() - StartTime) < self._timeout:
-            Read = self._socket.recv(self._bufferSize)
-            
-            # Append to the message
-            self._mes += Read
-            
-            # Look for a newline
-            if self._readTermination in Read:
-                # Split the message
-                FirstPos = 0
-                i = 0
-                
-                while i <= len(self._mes) - self._readTerminationLength:
-                    if self._mes[i:i + self._readTerminationLength] == self._readTermination:
-                        Line = self._mes[FirstPos:i]
-                        FirstPos = i + self._readTerminationLength
-                        i += self._readTerminationLength - 1
-                        
-                        # Convert to text
-                        self._lines.append(self.decode(Line))
-                        
-                    i += 1
-                        
-                self._mes = self._mes[FirstPos:]
-                    
+            if self._addData(self._received(self._socket.recv_into(self._bufferView))):
                 return
         
         raise e.TimeoutError(self.deviceName, self)
+    
+    # Checks the number of bytes received, 0 bytes means that the other side has closed the connection so it is closed such that the next attempt reconnects
+    # Size (int): The number of bytes received
+    # Returns Size
+    def _received(self, Size):
+        if Size == 0:
+            self._socket.close()
+            raise ConnectionResetError(f"{self.deviceName} was disconnected")
+        
+        return Size
+    
+    # Checks if the connection is open, it is not open if it was closed by the other side
+    # Returns True if it is open
+    def isOpen(self):
+        return super().isOpen() and getattr(self, "_socket", None) is not None and self._socket.fileno() != -1
+    
+    # Adds received data from the buffer to the message and splits off the finished lines
+    # Size (int): The number of bytes received into the buffer
+    # Returns True if a line was finished
+    def _addData(self, Size):
+        # Only the new data and the end of the old message can contain a new termination
+        SearchStart = max(len(self._mes) - self._readTerminationLength + 1, 0)
+        
+        # Append to the message
+        self._mes += self._bufferView[:Size]
+        
+        # Split the message into lines and keep the unfinished line
+        if self._mes.find(self._readTermination, SearchStart) == -1:
+            return False
+        
+        Lines = self._mes.split(self._readTermination)
+        self._mes = Lines.pop()
+        
+        # Convert to text
+        for Line in Lines:
+            self._lines.append(self.decode(bytes(Line)))
+            
+        return True
         
     # Decodes bytes to data, may be overwritten by subclass
     # Mes (bytes): The bytes to decode
@@ -88,10 +180,7 @@ class socket(device):
         if len(self._lines) == 0:
             self._readUntilLine()
             
-        Line = self._lines[0]
-        self._lines = self._lines[1:]
-        
-        return Line
+        return self._lines.popleft()
     
     # Reads a message from a device
     # Returns a list of all the lines
@@ -122,14 +211,24 @@ class socket(device):
         import socket
 
         self._socket = socket.create_connection(self._address, timeout = self._timeout)
+        self._lines.clear()
+        self._mes = bytearray()
     
     # Close the device
     def _close(self):
         self._socket.close()
         super()._close()
-
+        
     # Forces a flush for the device
     def flush(self):
+        self.clearParameterCache()
+        self._lines.clear()
+        self._mes = bytearray()
+        
+        # There is nothing to flush if the connection has been lost
+        if not self.isOpen():
+            return
+        
         # Send message
         self._socket.send(self._writeTermination.encode("utf-8"))
         
@@ -138,17 +237,229 @@ class socket(device):
         
         while True:
             try:
-                self._socket.recv(self._bufferSize)
+                if self._socket.recv_into(self._bufferView) == 0:
+                    break
             except:
                 break
             
         self._socket.settimeout(self._timeout)
-        self._lines = []
-        self._mes = b""
+        self._lines.clear()
+        self._mes = bytearray()
+        
+    # Sends a command from an asyncio event loop using non-blocking calls on the connection instead of a thread, it waits for the commands from the queue and other threads to finish such that they are never mixed
+    # Sub classes which change how commands are sent and devices which are empty or forced to close use device.asend instead
+    # Command (str): The command to send the device
+    # UseQueue (bool): Kept for compatibility, the command is always run in order with the commands of the queue
+    # QueueTimeout (float): The maximum time in seconds to wait for the other commands to finish, None to wait forever
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
+    # ReturnLines (int): The number of lines it expects to receive from the device
+    # WaitTime (float): The time in seconds to wait before reading
+    async def asend(self, Command, *args, UseQueue = True, QueueTimeout = None, **kwargs):
+        import asyncio
+        
+        if self.empty or self._forceClose or self._asendOverridden(["sendCommand", "_sendCommand", "write", "read", "_readLine", "flush"]):
+            return await super().asend(Command, *args, UseQueue = UseQueue, QueueTimeout = QueueTimeout, **kwargs)
+        
+        await asyncio.wait_for(self._aacquire(), QueueTimeout)
+        
+        try:
+            # The calls of the event loop need a non-blocking socket
+            self._setBlocking(False)
+            
+            try:
+                if self._unread > 0:
+                    await self._areadUnread()
+                    
+                return await self._asendCommand(Command, *args, **kwargs)
+            
+            finally:
+                self._setBlocking(True)
+            
+        finally:
+            self._arelease()
+            
+    # Sends a command from an asyncio event loop with the same attempts as _sendCommand, the lock of the connection must be held
+    # Command (str): The command to send the device
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used
+    # ReturnLines (int): The number of lines it expects to receive from the device
+    # WaitTime (float): The time in seconds to wait before reading
+    async def _asendCommand(self, Command, WriteArgs = set(), WriteKwargs = dict(), ReadArgs = set(), ReadKwargs = dict(), ResponseCheck = None, ReturnLines = 1, WaitTime = 0):
+        import asyncio
+        
+        for _ in range(self._maxAttempts):
+            # Reconnect if the connection was lost, reconnecting blocks so it is done on the default executor
+            if not self.isOpen():
+                await asyncio.get_running_loop().run_in_executor(None, self._ensureOpen)
+                self._setBlocking(False)
+                
+            # Write command
+            try:
+                await self._awrite(Command, *WriteArgs, **WriteKwargs)
+                
+            except Exception as ErrorMes:
+                self.lastError = ErrorMes
+                print(f"Unable to write to {self.deviceName}, trying again")
+                await asyncio.sleep(self._attemptDelay)
+                Check = ErrorMes
+                continue
+            
+            # The response must be read before the next command if this is cancelled
+            self._unread = ReturnLines
+            
+            if float(WaitTime) > 0:
+                await asyncio.sleep(float(WaitTime))
+                
+            # Get the return value
+            try:
+                ReturnString = await self._aread(ReturnLines, *ReadArgs, **ReadKwargs)
+                
+            except Exception as ErrorMes:
+                self._unread = 0
+                self.lastError = ErrorMes
+                print(f"Unable to read from {self.deviceName}, trying again")
+                await asyncio.sleep(self._attemptDelay)
+                Check = ErrorMes
+                continue
+            
+            # Check if it worked
+            if ResponseCheck is not None:
+                Check = ResponseCheck(self, Command, ReturnString)
+            else:
+                Check = None
+                
+            if Check is None:
+                return ReturnString
+            
+            # Flush the input buffer to make sure it is ready for a new command
+            await self._aflush()
+            
+            # Wait
+            self.lastError = Check
+            print(Check)
+            await asyncio.sleep(self._attemptDelay)
+            
+        raise e.CommunicationError(self.deviceName, self, Command, Check)
+    
+    # Switches the connection between blocking with the timeout and non-blocking for the calls of the event loop
+    # Blocking (bool): If True then the timeout is used
+    def _setBlocking(self, Blocking):
+        if self.isOpen():
+            self._socket.settimeout(self._timeout if Blocking else 0)
+    
+    # Writes a message to the device from an asyncio event loop
+    # Message (str): The message to write
+    async def _awrite(self, Message):
+        import asyncio
+        
+        await asyncio.get_running_loop().sock_sendall(self._socket, f"{str(Message)}{self._writeTermination}".encode("utf-8"))
+        
+    # Receives data into the buffer from an asyncio event loop
+    # Timeout (float): The maximum time in seconds to wait for data
+    # Returns the number of bytes received
+    async def _arecv(self, Timeout):
+        import asyncio
+        
+        try:
+            return await asyncio.wait_for(asyncio.get_running_loop().sock_recv_into(self._socket, self._bufferView), max(Timeout, 0))
+        
+        except asyncio.TimeoutError:
+            raise e.TimeoutError(self.deviceName, self)
+        
+    # Read until it has received a line from an asyncio event loop
+    async def _areadUntilLine(self):
+        import time
+        
+        StartTime = time.time()
+        
+        while True:
+            if self._addData(self._received(await self._arecv(self._timeout - (time.time() - StartTime)))):
+                return
+            
+    # Read one line from the device from an asyncio event loop
+    async def _areadLine(self):
+        if len(self._lines) == 0:
+            await self._areadUntilLine()
+            
+        return self._lines.popleft()
+        
+    # Reads a message from a device from an asyncio event loop, the lines which are still unread are counted in case it is cancelled
+    # Returns a list of all the lines
+    # Lines (int): The number of lines to read
+    async def _aread(self, Lines):
+        ReadLines = []
+        
+        for _ in range(Lines):
+            ReadLines.append(await self._areadLine())
+            self._unread -= 1
+            
+        return ReadLines
+    
+    # Reads and throws away the lines of a cancelled command from an asyncio event loop, flushes if they can not be read
+    async def _areadUnread(self):
+        try:
+            await self._aread(self._unread)
+            
+        except Exception:
+            await self._aflush()
+            
+        self._unread = 0
+    
+    # Forces a flush for the device from an asyncio event loop
+    async def _aflush(self):
+        import asyncio
+        
+        self.clearParameterCache()
+        self._lines.clear()
+        self._mes = bytearray()
+        
+        # There is nothing to flush if the connection has been lost
+        if not self.isOpen():
+            return
+        
+        # Send message
+        await asyncio.get_running_loop().sock_sendall(self._socket, self._writeTermination.encode("utf-8"))
+        
+        # Empty res buffer
+        await self._adrain()
+        self._lines.clear()
+        self._mes = bytearray()
+        
+    # Receives and throws away everything until nothing has been received for 0.01 seconds
+    async def _adrain(self):
+        while True:
+            try:
+                if await self._arecv(0.01) == 0:
+                    break
+                
+            except e.TimeoutError:
+                break
        
 
 # A socket object tailored to communicate with a socketServer
 class socketClient(socket):
+    # IP (str): The IP of the connection
+    # Port (int): The port to communicate through
+    # Binary (bool): If True then it will ask the server to use length prefixed binary frames instead of text lines such that arrays are received as numpy arrays, if the server does not support it then text lines are used
+    # BufferSize (int): The size of the buffer when getting data
+    # Timeout (float): The timeout in seconds
+    # ReadTermination (str): The termination character to look for when reading
+    # WriteTermination (str): The termination character when writing a message
+    # ReconnectTries (int): How many times to attempt to reconnect if it disconnects, must not be smaller than 0
+    # ReconnectDelay (float): The delay in seconds between each reconnect attempt, must not be negative
+    # MaxAttempts (int): The maximum number attempts to send a command before giving up, must not be smaller than 1
+    # AttemptDelay (float): The delay in seconds between each attempt to send a command, must not be negative
+    # UseQueue (bool): If True then it will set up a queue which can be used in the sendCommand method, if False the UseQueue in sendCommand is ignored
+    # ForceClose (bool): If true then it should close the connection every time it sends a message and reopen
+    # Empty (bool): If True then it will not communicate with the device
+    # DeviceName (str): The name of the device, only used for error messages
+    # ID (str): The ID name for the device, only used for displaying infomation
+    def __init__(self, IP, Port, *args, Binary = False, **kwargs):
+        # The connection is opened in the super init so this must be set first
+        self._binary = bool(Binary)
+        self._binaryActive = False
+        
+        super().__init__(IP, Port, *args, **kwargs)
+        
     # Command (str): The command to send the device
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
@@ -166,7 +477,190 @@ class socketClient(socket):
         else:
             kwargs["ResponseCheck"] = f.responseCheck.socketClient(None)
             
-        return super().sendCommand(*args, **kwargs)[0][2:].split("|")
+        Result = super().sendCommand(*args, **kwargs)
+        
+        # The command was added to a batch
+        if Result is None:
+            return None
+        
+        return self._splitReply(Result[0])
+    
+    # Sends a command from an asyncio event loop using non-blocking calls on the connection, see socket.asend
+    # Command (str): The command to send the device
+    # QueueTimeout (float): The maximum time in seconds to wait for the other commands to finish, None to wait forever
+    # ResponseCheck (Func): A function to check if the response was correct, None if no check should be used, the function must have the arguments (Class, Command, ReturnString) and must return None on succes or a string on failure with the error message
+    # WaitTime (float): The time in seconds to wait before reading
+    async def asend(self, *args, **kwargs):
+        from .. import functions as f
+        
+        # Sub classes which change sendCommand are routed through it, which already splits the reply
+        if self._methodDepth("sendCommand") < self._methodDepth("asend"):
+            return await super().asend(*args, **kwargs)
+        
+        # Set the return lines to be 1
+        kwargs["ReturnLines"] = 1
+        kwargs["ResponseCheck"] = f.responseCheck.socketClient(kwargs.get("ResponseCheck", None))
+        
+        return self._splitReply((await super().asend(*args, **kwargs))[0])
+    
+    # Splits a reply from the server into its values, an array is returned as the only value
+    # Reply (str/numpy.ndarray): The reply from the server
+    def _splitReply(self, Reply):
+        if isinstance(Reply, str):
+            return Reply[2:].split("|")
+        
+        return [Reply]
+    
+    # Reopens a connection, binary frames are negotiated again for the new connection
+    def _reopen(self):
+        self._binaryActive = False
+        
+        super()._reopen()
+        
+        if self._binary:
+            self._negotiate()
+        
+    # Asks the server to use binary frames, uses text lines if the server does not support it
+    def _negotiate(self):
+        super().write(_binaryRequest)
+        
+        try:
+            Reply = self._readLine()
+            
+        except e.TimeoutError:
+            Reply = None
+        
+        if Reply == "1|binary":
+            self._binaryActive = True
+            
+        else:
+            print(f"{self.deviceName} does not support binary frames, using text lines instead")
+            self._binary = False
+            
+    # Writes a message to the device
+    # Message (str): The message to write
+    def write(self, Message):
+        if self._binaryActive:
+            _sendFrame(self._socket, str(Message))
+            
+        else:
+            super().write(Message)
+            
+    # Reads exactly Size bytes from the device
+    # Size (int): The number of bytes to read
+    def _readBytes(self, Size):
+        import time
+        
+        Data = bytearray(Size)
+        View = memoryview(Data)
+        
+        # Use the data which has already been received
+        Received = min(len(self._mes), Size)
+        View[:Received] = self._mes[:Received]
+        del self._mes[:Received]
+        
+        # Receive the rest directly into the data
+        StartTime = time.time()
+        
+        while Received < Size:
+            if (time.time() - StartTime) >= self._timeout:
+                raise e.TimeoutError(self.deviceName, self)
+            
+            Received += self._received(self._socket.recv_into(View[Received:]))
+            
+        return Data
+            
+    # Writes a message to the device from an asyncio event loop
+    # Message (str): The message to write
+    async def _awrite(self, Message):
+        import asyncio
+        
+        if self._binaryActive:
+            await asyncio.get_running_loop().sock_sendall(self._socket, b"".join(_encodeFrame(str(Message))))
+            
+        else:
+            await super()._awrite(Message)
+            
+    # Reads exactly Size bytes from the device from an asyncio event loop
+    # Size (int): The number of bytes to read
+    async def _areadBytes(self, Size):
+        import time
+        import asyncio
+        
+        Data = bytearray(Size)
+        View = memoryview(Data)
+        
+        # Use the data which has already been received
+        Received = min(len(self._mes), Size)
+        View[:Received] = self._mes[:Received]
+        del self._mes[:Received]
+        
+        # Receive the rest directly into the data
+        StartTime = time.time()
+        
+        while Received < Size:
+            try:
+                Size = await asyncio.wait_for(asyncio.get_running_loop().sock_recv_into(self._socket, View[Received:]), max(self._timeout - (time.time() - StartTime), 0))
+                
+            except asyncio.TimeoutError:
+                raise e.TimeoutError(self.deviceName, self)
+            
+            Received += self._received(Size)
+            
+        return Data
+    
+    # Read one line or one binary frame from the device from an asyncio event loop
+    async def _areadLine(self):
+        if not self._binaryActive:
+            return await super()._areadLine()
+        
+        Kind, Size = _frameHeader.unpack(await self._areadBytes(_frameHeader.size))
+        
+        return _decodeFrame(Kind, await self._areadBytes(Size))
+    
+    # Forces a flush for the device from an asyncio event loop
+    async def _aflush(self):
+        if not self._binaryActive or not self.isOpen():
+            await super()._aflush()
+            return
+        
+        self.clearParameterCache()
+        
+        # A frame can not be terminated so only empty the res buffer
+        await self._adrain()
+        self._lines.clear()
+        self._mes = bytearray()
+            
+    # Read one line or one binary frame from the device
+    def _readLine(self):
+        if not self._binaryActive:
+            return super()._readLine()
+        
+        Kind, Size = _frameHeader.unpack(self._readBytes(_frameHeader.size))
+        
+        return _decodeFrame(Kind, self._readBytes(Size))
+    
+    # Forces a flush for the device
+    def flush(self):
+        if not self._binaryActive or not self.isOpen():
+            super().flush()
+            return
+        
+        self.clearParameterCache()
+        
+        # A frame can not be terminated so only empty the res buffer
+        self._socket.settimeout(0.01)
+        
+        while True:
+            try:
+                if self._socket.recv_into(self._bufferView) == 0:
+                    break
+            except:
+                break
+            
+        self._socket.settimeout(self._timeout)
+        self._lines.clear()
+        self._mes = bytearray()
         
         
 # A communication channel for a socket server to a single client
@@ -176,16 +670,20 @@ class socketChannel(object):
     # ProcessFunc (func): The _process method from the server to process any incoming message
     # StopEvent (threading.Event): The stop event to signal that it should shut down
     # MaxSize (int): The maximum buffer size
+    # MaxFrameSize (int): The maximum size in bytes of the payload of a binary frame, the client is disconnected if it sends a larger frame
     # ForceClose (bool): If True then it will force the connection to close after 1 message, should not be used
     # ReadTermination (str): The character to look for when reading to terminate a command
     # WriteTermination (str): The character to put at the end of a message when writing to the client
     # DisplayConnection (bool): If True then it will print when a client has connected or disconnected    
-    def __init__(self, Connection, Address, ProcessFunc, StopEvent, *args, MaxSize = 4096, ForceClose = False, ReadTermination = "\n", WriteTermination = "\n", DisplayConnection = True, **kwargs):
+    # AllowBinary (bool): If True then the client may ask to use binary frames instead of text lines
+    # SendTimeout (float): The maximum time in seconds to send a reply, if exceeded the client is disconnected, None to wait forever
+    def __init__(self, Connection, Address, ProcessFunc, StopEvent, *args, MaxSize = 4096, MaxFrameSize = 2 ** 20, ForceClose = False, ReadTermination = "\n", WriteTermination = "\n", DisplayConnection = True, AllowBinary = True, SendTimeout = 10, **kwargs):
         super().__init__(*args, **kwargs)
         
         self._connection = Connection
         self._address = Address
         self._maxSize = int(MaxSize)
+        self._maxFrameSize = int(MaxFrameSize)
         self._stopEvent = StopEvent
         self._readTermination = str(ReadTermination)
         self._writeTermination = str(WriteTermination)
@@ -193,6 +691,10 @@ class socketChannel(object):
         self._process = ProcessFunc
         self._forceClose = bool(ForceClose)
         self._displayConnection = bool(DisplayConnection)
+        self._allowBinary = bool(AllowBinary)
+        self._sendTimeout = None if SendTimeout is None else float(SendTimeout)
+        self._binary = False
+        self._frames = bytearray()
      
     def communicate(self):
         while not self._stopEvent.is_set():
@@ -219,52 +721,134 @@ class socketChannel(object):
         import socket
         
         try:
-            Data = self._connection.recv(self._maxSize).decode("utf-8")
+            Data = self._connection.recv(self._maxSize)
 
             # Break if the connection has been closed
             if not Data:
                 self._connection.close()
                 return False
             
+            if self._binary:
+                self._frames += Data
+                self._readFrames()
+                return True
+            
             # Merge with own message
-            self._mes += Data
+            self._mes += Data.decode("utf-8")
             
             # Process
             SplitData = self._mes.split(self._readTermination)
     
             self._mes = SplitData[-1]
             
-            for DataLine in SplitData[:-1]:
-                try:
-                    self._connection.send(f"{self._process(DataLine)}{self._writeTermination}".encode("utf-8"))
+            for i, DataLine in enumerate(SplitData[:-1]):
+                # Switch to binary frames
+                if self._allowBinary and DataLine.strip() == _binaryRequest:
+                    self._send(lambda: self._connection.sendall(f"1|binary{self._writeTermination}".encode("utf-8")))
+                    self._binary = True
                     
-                except Exception as m:
-                    print(f"An exception occured while processing the message \"{DataLine}\": {m}")
-                    
-                    self._connection.send(f"0|An exception occured{self._writeTermination}".encode("utf-8"))
+                    # Anything sent after the request is binary frames
+                    self._frames += self._readTermination.join(SplitData[i + 1:]).encode("utf-8")
+                    self._mes = ""
+                    self._readFrames()
+                    break
+                
+                self._reply(DataLine)
             
         except socket.timeout:
             pass
         
         return True
     
+    # Processes all of the complete binary frames which has been received
+    def _readFrames(self):
+        while len(self._frames) >= _frameHeader.size:
+            Kind, Size = _frameHeader.unpack_from(self._frames)
+            End = _frameHeader.size + Size
+            
+            if Size > self._maxFrameSize:
+                self._badFrame(f"The frame of {Size} bytes is larger than the maximum of {self._maxFrameSize} bytes")
+            
+            # Wait for the rest of the frame
+            if len(self._frames) < End:
+                break
+            
+            try:
+                Message = _decodeFrame(Kind, self._frames[_frameHeader.size:End])
+                
+            except Exception as m:
+                self._badFrame(m)
+                
+            del self._frames[:End]
+            
+            self._reply(Message)
+            
+    # Closes the connection after receiving a binary frame which can not be used, the start of the next frame is unknown so the rest of the data can not be read
+    # Reason (str): The reason the frame can not be used
+    def _badFrame(self, Reason):
+        print(f"Received a bad binary frame from {self._address}: {Reason}")
+        
+        self._frames = bytearray()
+        self._connection.close()
+        
+        raise ConnectionResetError(f"Received a bad binary frame from {self._address}")
+            
+    # Processes a message and sends the reply to the client
+    # Message (str): The message to process
+    def _reply(self, Message):
+        try:
+            Reply = self._process(Message)
+            
+        except Exception as m:
+            print(f"An exception occured while processing the message \"{Message}\": {m}")
+            
+            Reply = "0|An exception occured"
+            
+        if self._binary:
+            self._send(lambda: _sendFrame(self._connection, Reply))
+            
+        else:
+            self._send(lambda: self._connection.sendall(f"{_replyText(Reply)}{self._writeTermination}".encode("utf-8")))
+            
+    # Sends data to the client using the send timeout instead of the read timeout, a client which stops reading is disconnected such that it can not block the server
+    # SendFunc (func): The function sending the data, takes no arguments
+    def _send(self, SendFunc):
+        import socket
+        
+        Timeout = self._connection.gettimeout()
+        self._connection.settimeout(self._sendTimeout)
+        
+        try:
+            SendFunc()
+            
+        except socket.timeout:
+            # Part of the reply may have been sent so the connection can not be used anymore
+            self._connection.close()
+            raise ConnectionResetError(f"Timed out sending a reply to {self._address}")
+        
+        self._connection.settimeout(Timeout)
+    
     
 # Controls a socket server
 class socketServer(deviceBase):
     # Port (int): The port to use
     # Methods (serverFunction): The possible methods to use
     # IP (str): The IP address of the device to run it on
-    # Mode (str): The mode of the server, single: Only allow a single client at the time, multi: Allow multiple clients at the time this is a bit slower than single, threaded: Same as multi but with every client on its own thread, this is as fast as single
+    # Mode (str): The mode of the server, single: Only allow a single client at the time, multi: Allow multiple clients at the time this is a bit slower than single, threaded: Same as multi but with every client on its own thread, this is as fast as single, select: Same as multi but only reads from clients which has sent data using a selector on a single thread, this is as fast as single
     # MaxClients (int): The maximum number of clients allowed to wait
     # MaxSize (int): The maximum number of bytes per message
+    # MaxFrameSize (int): The maximum size in bytes of the payload of a binary frame from a client, a client which sends a larger frame is disconnected
     # ReadTermination (str): The character to look for when reading to terminate a command
     # WriteTermination (str): The character to put at the end of a message when writing to the client
     # DisplayConnection (bool): If True then it will print when a client has connected or disconnected
     # Timeout (float): How long it will wait for new clients or messages before moving on to the next task
     # ForceClose (bool): Not recommended, if True, then it will force a connection to close after one call
+    # CommandSeparator (str): If given then a message may contain several commands separated by this string which are all run and the results are joined with the same string, None to run the whole message as one command
+    # AllowBinary (bool): If True then clients may ask to use length prefixed binary frames instead of text lines such that numpy arrays returned from the methods are sent without converting them to text
+    # SendTimeout (float): The maximum time in seconds to send a reply to a client, if exceeded the client is disconnected such that a client which stops reading can not block the server, None to wait forever
     # DeviceName (str): The name of the device, only used for error messages
     # ID (str): The ID name for the device, only used for displaying infomation
-    def __init__(self, Port, Methods, *args, IP = None, Mode = "Single", MaxClients = 100, MaxSize = 4096, ReadTermination = "\n", WriteTermination = "\n", Timeout = 0.01, DisplayConnection = True, ForceClose = False, **kwargs):
+    def __init__(self, Port, Methods, *args, IP = None, Mode = "Single", MaxClients = 100, MaxSize = 4096, MaxFrameSize = 2 ** 20, ReadTermination = "\n", WriteTermination = "\n", Timeout = 0.01, DisplayConnection = True, ForceClose = False, CommandSeparator = None, AllowBinary = True, SendTimeout = 10, **kwargs):
         import socket
         import threading as th
         
@@ -278,18 +862,22 @@ class socketServer(deviceBase):
             IP = socket.gethostname()
         
         # Create the server
-        if not str(Mode).lower() in ["single", "multi", "threaded"]:
-            raise e.KeywordError("Mode", str(Mode).lower(), ["single", "multi", "threaded"])
+        if not str(Mode).lower() in ["single", "multi", "threaded", "select"]:
+            raise e.KeywordError("Mode", str(Mode).lower(), ["single", "multi", "threaded", "select"])
         
         self._mode = str(Mode).lower()
         self._server = socket.create_server((str(IP), int(Port)), backlog = int(MaxClients))            
         self._timeout = Timeout
         self._server.settimeout(Timeout)
         self._maxSize = int(MaxSize)
+        self._maxFrameSize = int(MaxFrameSize)
         self._readTermination = str(ReadTermination)
         self._writeTermination = str(WriteTermination)
         self._forceClose = bool(ForceClose)
         self._methods = Methods
+        self._commandSeparator = None if CommandSeparator is None else str(CommandSeparator)
+        self._allowBinary = bool(AllowBinary)
+        self._sendTimeout = None if SendTimeout is None else float(SendTimeout)
         self._displayConnection = bool(DisplayConnection)
         self._IP = str(IP)
         self._port = int(Port)
@@ -304,6 +892,10 @@ class socketServer(deviceBase):
         import socket
         import threading as th
         
+        if self._mode == "select":
+            self._listenSelect()
+            return
+        
         try:
             # Listen
             self._server.listen()
@@ -314,7 +906,7 @@ class socketServer(deviceBase):
                 try:
                     Connection, Address = self._server.accept()
                     Connection.settimeout(self._timeout)
-                    NewChannel = socketChannel(Connection, Address, self._process, self._stopEvent, MaxSize = self._maxSize, ForceClose = self._forceClose, ReadTermination = self._readTermination, WriteTermination = self._writeTermination, DisplayConnection = self._displayConnection)
+                    NewChannel = socketChannel(Connection, Address, self._process, self._stopEvent, MaxSize = self._maxSize, MaxFrameSize = self._maxFrameSize, ForceClose = self._forceClose, ReadTermination = self._readTermination, WriteTermination = self._writeTermination, DisplayConnection = self._displayConnection, AllowBinary = self._allowBinary, SendTimeout = self._sendTimeout)
                        
                     if self._displayConnection:
                         print(f"Established connection to {Address}")
@@ -357,9 +949,70 @@ class socketServer(deviceBase):
             
         self._server.close()
     
+    # Listen for connections and messages from all clients with a selector
+    def _listenSelect(self):
+        import selectors
+        
+        Selector = selectors.DefaultSelector()
+        
+        try:
+            # Listen
+            self._server.listen()
+            Selector.register(self._server, selectors.EVENT_READ, None)
+            
+            # Wait for new clients or messages
+            while not self._stopEvent.is_set():
+                for Key, _ in Selector.select(timeout = self._timeout):
+                    # Add a new client
+                    if Key.data is None:
+                        Connection, Address = self._server.accept()
+                        Connection.settimeout(self._timeout)
+                        NewChannel = socketChannel(Connection, Address, self._process, self._stopEvent, MaxSize = self._maxSize, MaxFrameSize = self._maxFrameSize, ForceClose = self._forceClose, ReadTermination = self._readTermination, WriteTermination = self._writeTermination, DisplayConnection = self._displayConnection, AllowBinary = self._allowBinary, SendTimeout = self._sendTimeout)
+                        Selector.register(Connection, selectors.EVENT_READ, NewChannel)
+                        
+                        if self._displayConnection:
+                            print(f"Established connection to {Address}")
+                            
+                        continue
+                    
+                    # Read from a client
+                    Channel = Key.data
+                    
+                    try:
+                        Result = Channel.read()
+                        
+                    except ConnectionResetError:
+                        Result = False
+                        
+                    except Exception as m:
+                        print(f"An error occured while reading from {Channel._address}: {m}")
+                        Result = True
+                    
+                    # Remove the client if the connection is closed
+                    if not Result or self._forceClose:
+                        Selector.unregister(Key.fileobj)
+                        Key.fileobj.close()
+                        
+                        if self._displayConnection:
+                            print(f"Closed connection to {Channel._address}")
+                
+        except Exception as m:
+            print(m)
+            
+        # Close all of the clients
+        for Key in list(Selector.get_map().values()):
+            if Key.data is not None:
+                Key.fileobj.close()
+                
+        Selector.close()
+        self._server.close()
+    
     # Process a message
     # Message (str): The message to process
     def _process(self, Message):
+        if self._commandSeparator is not None:
+            return self._methods.runMultiple(Message, Separator = self._commandSeparator)
+        
         return self._methods.run(Message)
     
     # Returns the IP and port of the server
@@ -379,7 +1032,8 @@ class serverFunction:
     # ToggleFunction (func): The function to run when toggling a parameter, the function must take the parameters (Data [list])
     # InfoConverter (func): A function which must be given if info is expected, it will take the info string and return (bool, Value) where bool is False on error and then Value is an error message, on success value is the converted info
     # ParameterDict (dict): A dictionary containing all of the sub parameters which are all serverFunction
-    def __init__(self, *args, SetFunction = None, GetFunction = None, ToggleFunction = None, ParameterDict = dict(), InfoConverter = None, **kwargs):
+    # CacheSize (int): The maximum number of parsed messages to keep when this is the top function
+    def __init__(self, *args, SetFunction = None, GetFunction = None, ToggleFunction = None, ParameterDict = dict(), InfoConverter = None, CacheSize = 1000, **kwargs):
         super().__init__(*args, **kwargs)
         
         self._setFunction = SetFunction
@@ -387,23 +1041,208 @@ class serverFunction:
         self._toggleFunction = ToggleFunction
         self._subParameters = {}
         self._infoConverter = InfoConverter
+        self._cacheSize = int(CacheSize)
+        self._table = None
+        self._cache = dict()
         
         for Key in ParameterDict:
             self._subParameters[Key.lower()] = ParameterDict[Key]
+            
+    # Compiles the tree of functions into a table from the path of parameters to the list of functions along the path, is done automatically the first time run is used
+    def compile(self):
+        Table = {tuple(): [self]}
+        
+        # Add all of the sub parameters
+        def addFunctions(Path, Functions):
+            for Key, Function in Functions[-1]._subParameters.items():
+                NewPath = Path + (Key,)
+                NewFunctions = Functions + [Function]
+                Table[NewPath] = NewFunctions
+                addFunctions(NewPath, NewFunctions)
+                
+        addFunctions(tuple(), [self])
+        
+        self._table = Table
+        self._cache = dict()
+        
+    # Parses the parameters of a message, returns (Functions, Infos, Names) with the functions, info and name of each step along the path, None if the path does not exist
+    # Path (str): The part of the message before the set or get character
+    # Last (bool): True if there is no set or get character after Path
+    def _parse(self, Path, Last):
+        Parameters = []
+        Infos = [None]
+        Names = [None]
+        Parts = Path.split(":")
+        
+        # A colon at the end of a toggle does nothing
+        if Last and len(Parts[-1].strip()) == 0:
+            Parts.pop()
+        
+        for i, Part in enumerate(Parts):
+            Part = Part.lstrip()
+            
+            if Last and i == len(Parts) - 1:
+                Part = Part.rstrip()
+                
+            # Figure out if there is info
+            NextInfo = Part.find("-")
+            
+            if NextInfo == -1:
+                Info = None
+                NextInfo = len(Part)
+                
+            else:
+                Info = Part[NextInfo + 1:]
+                
+            # Find the parameter
+            Parameter = Part[:NextInfo].replace(" ", "")
+            Parameters.append(Parameter.lower())
+            Infos.append(Info)
+            
+            if tuple(Parameters) not in self._table:
+                return None
+            
+            if Names[-1] is None:
+                Names.append(f"{Parameter}")
+                
+            else:
+                Names.append(Names[-1] + f":{Parameter}")
+                
+        return self._table[tuple(Parameters)], Infos, Names
+    
+    # Runs a message using the compiled table
+    # Message (str): The command to run
+    def _runCompiled(self, Message):
+        if self._table is None:
+            self.compile()
+            
+        Message = str(Message).strip()
+        
+        # Find the set or get character
+        NextSet = Message.find("=")
+        NextGet = Message.find("?")
+        
+        if NextSet == -1:
+            NextSet = len(Message)
+            
+        if NextGet == -1:
+            NextGet = len(Message)
+            
+        End = min(NextSet, NextGet)
+        Set = NextSet < NextGet
+        Get = NextGet < NextSet
+        Path = Message[:End]
+        
+        # Parse the parameters
+        Parsed = self._cache.get((Path, Set or Get), None)
+        
+        if Parsed is None:
+            Parsed = self._parse(Path, not (Set or Get))
+            
+            if Parsed is None:
+                Parsed = False
+            
+            if len(self._cache) >= self._cacheSize:
+                self._cache.clear()
+                
+            self._cache[(Path, Set or Get)] = Parsed
+            
+        # Walk the tree on errors so the error message is the same
+        if not Parsed:
+            return self.runTree(Message)
+        
+        Functions, Infos, Names = Parsed
+        Data = []
+        
+        # Convert all of the info
+        for Function, Info in zip(Functions, Infos):
+            if (Info is None) != (Function._infoConverter is None):
+                return self.runTree(Message)
+            
+            elif Function._infoConverter is not None:
+                Code, Value = Function._infoConverter(str(Info))
+                
+                if not Code:
+                    return self._errorMessage(Value)
+                
+                Data.append(Value)
+                
+        return Functions[-1]._runFunction(Message[End + 1:].strip(), Data, Set, Get, Names[-1])
+    
+    # Runs the set, get or toggle function
+    # Message (str): The rest of the message
+    # Data (list): A list of all previous info
+    # Set (bool): True if this function is a setter
+    # Get (bool): True if this function is a getter
+    # Name (str): The name of the previous fields, used for error handling
+    def _runFunction(self, Message, Data, Set, Get, Name):
+        # Run get function
+        if Get:
+            if self._getFunction is None:
+                return self._errorMessage(f"Requested get function for {Name} but this does not exist, remaining message: {Message}")
+            
+            Code, Message = self._getFunction(Data)
+        
+        # Run the set function
+        elif Set:
+            if self._setFunction is None:
+                return self._errorMessage(f"Requested set function for {Name} but this does not exist, remaining message: {Message}")
+
+            Code, Message = self._setFunction(Message, Data)
+
+        # Run the toggle function
+        else:
+            if self._toggleFunction is None:
+                return self._errorMessage(f"Requested toggle function for {Name} but this does not exist, remaining message: {Message}")
+                
+            Code, Message = self._toggleFunction(Data)
+            
+        if Code:
+            return self._correctMessage(Message)
+        
+        else:
+            return self._errorMessage(Message)
+        
+    # Runs several commands in a single message and returns all of the return strings joined by Separator, a single command returns the same as run
+    # Message (str): The commands to run
+    # Separator (str): The character separating the commands
+    def runMultiple(self, Message, Separator = ";"):
+        Commands = str(Message).split(str(Separator))
+        
+        if len(Commands) == 1:
+            return self.run(Commands[0])
+        
+        return str(Separator).join([_replyText(self.run(Command)) for Command in Commands])
         
     def _errorMessage(self, Message):
         return f"0|{Message}"
     
+    # Arrays are kept such that they can be sent as binary frames
     def _correctMessage(self, Message):
+        if _isArray(Message):
+            return Message
+        
         return f"1|{Message}"
         
-    # Runs the function
+    # Runs the function, messages from outside are run with the compiled table
     # Message (str): The command to run
     # Info (str): The extra data it gets, None if no info
     # Data (list): A list of all previous info
     # Set (bool): True if this function is a setter
     # Get (bool): True if this function is a getter
     def run(self, Message, Info = None, Data = None, Set = False, Get = False, Name = None):
+        if Info is None and Data is None and not Set and not Get and Name is None:
+            return self._runCompiled(Message)
+        
+        return self.runTree(Message, Info = Info, Data = Data, Set = Set, Get = Get, Name = Name)
+        
+    # Runs the function by walking through the tree of functions
+    # Message (str): The command to run
+    # Info (str): The extra data it gets, None if no info
+    # Data (list): A list of all previous info
+    # Set (bool): True if this function is a setter
+    # Get (bool): True if this function is a getter
+    def runTree(self, Message, Info = None, Data = None, Set = False, Get = False, Name = None):
         if Data is None:
             Data = []
             
@@ -491,7 +1330,7 @@ class serverFunction:
             else:
                 NewName = Name + f":{Parameter}"
                 
-            return self._subParameters[Parameter.lower()].run(Message[NextPar + 1:], Info = Info, Data = Data, Set = Set, Get = Get, Name = NewName)
+            return self._subParameters[Parameter.lower()].runTree(Message[NextPar + 1:], Info = Info, Data = Data, Set = Set, Get = Get, Name = NewName)
             
         if Code:
             return self._correctMessage(Message)
@@ -46,28 +46,450 @@ class timerObj(th.Thread):
             
     
 class timer(object):
-    # Initialize a timer which runs runs Function every Interval seconds
+    # Initialize a timer which runs runs Function every Interval seconds, it runs on a scheduler such that many timers do not need a thread each
+    # Calls which are late by more than an interval or due while the previous call is still running are skipped instead of being run afterwards to catch up, they are counted as missed in the statistics
     # Interval (float): The number of seconds between each function call
     # Function (func): The function to call every interval, the first argument must be the counter   
+    # Scheduler (connections.scheduler): The scheduler to run the timer on, None to use the shared scheduler
     # TimerKwargs may include:
     # FunctionArgs (set): The args to pass Function
     # FunctionKwargs (dict): The kwargs to pass Function
-    def __init__(self, Interval, Function, *args, TimerKwargs = dict(), **kwargs):
+    # Name (str): The name of the timer used in warnings and statistics
+    def __init__(self, Interval, Function, *args, TimerKwargs = dict(), Scheduler = None, **kwargs):
         import weakref
         
         super().__init__(*args, **kwargs)
         
-        # Create the timer object
-        self._stopEvent = th.Event()
+        self._int = float(Interval)
+        self._f = Function
+        self._timerKwargs = dict(TimerKwargs)
+        self._scheduler = Scheduler
+        self._task = None
         
-        self._timer = timerObj(Interval, Function, self._stopEvent, **TimerKwargs)
+        # Create the stop event
+        self._stopEvent = th.Event()
         
-        weakref.finalize(self, self.stop)
+        weakref.finalize(self, self._stopEvent.set)
         
     # Starts the timer
     def start(self):
-        self._timer.start()
+        if self._task is not None:
+            raise RuntimeError("The timer can only be started once")
+        
+        Scheduler = getScheduler() if self._scheduler is None else self._scheduler
+        
+        self._task = Scheduler.add(self._int, self._f, FunctionArgs = tuple(self._timerKwargs.get("FunctionArgs", tuple())), FunctionKwargs = self._timerKwargs.get("FunctionKwargs", dict()), Name = self._timerKwargs.get("Name", None), StopEvent = self._stopEvent)
         
     # Stops the timer
+    def stop(self):
+        if self._task is not None:
+            self._task.stop()
+            
+        else:
+            self._stopEvent.set()
+            
+    # Gets the statistics of the timer from schedulerTask.getStats, returns None if it has not been started
+    def getStats(self):
+        if self._task is None:
+            return None
+        
+        return self._task.getStats()
+    
+    
+# A periodic task run by a scheduler, it is created by scheduler.add
+class schedulerTask(object):
+    def __init__(self, Scheduler, Interval, Function, FunctionArgs, FunctionKwargs, Read, ReadArgs, ReadKwargs, Key, Name, MaxCount, StopEvent, Finish, StartTime):
+        self.scheduler = Scheduler
+        self.interval = Interval
+        self.name = Name
+        self.key = Key
+        
+        self._f = Function
+        self._args = FunctionArgs
+        self._kwargs = FunctionKwargs
+        self._read = Read
+        self._readArgs = ReadArgs
+        self._readKwargs = ReadKwargs
+        self._maxCount = MaxCount
+        self._finish = Finish
+        
+        self._startTime = StartTime
+        self._stopEvent = th.Event() if StopEvent is None else StopEvent
+        self._doneEvent = th.Event()
+        
+        # The next count to run, it is the number of intervals since the start time
+        self._count = 0
+        self._busy = False
+        self._finished = False
+        
+        # The missed deadlines which have not been warned about yet and the time of the last warning
+        self._unwarned = 0
+        self._lastWarning = None
+        
+        self.resetStats()
+        
+    # Stops the task, it will finish after the current call if it is running
     def stop(self):
         self._stopEvent.set()
+        self.scheduler._stopTask(self)
+        
+    # Returns True if the task has not finished
+    def isRunning(self):
+        return not self._doneEvent.is_set()
+        
+    # Waits for the task to finish, returns True if it has finished
+    # Timeout (float): The maximum time in seconds to wait, None to wait forever
+    def wait(self, Timeout = None):
+        return self._doneEvent.wait(Timeout)
+    
+    # Gets statistics of the task
+    def getStats(self):
+        with self.scheduler._cond:
+            Mean = self._totalLateness / self._calls if self._calls > 0 else 0
+            
+            return {
+                "Calls": self._calls,
+                "Missed": self._missed,
+                "SharedReads": self._sharedReads,
+                "MeanLateness": Mean,
+                "Jitter": max(self._totalLateness2 / self._calls - Mean**2, 0)**0.5 if self._calls > 0 else 0,
+                "MaxLateness": self._maxLateness,
+                "LastLateness": self._lastLateness,
+                "MeanDuration": self._totalDuration / self._calls if self._calls > 0 else 0,
+                "MaxDuration": self._maxDuration,
+            }
+        
+    # Resets the statistics of the task
+    def resetStats(self):
+        with self.scheduler._cond:
+            self._calls = 0
+            self._missed = 0
+            self._sharedReads = 0
+            self._totalLateness = 0
+            self._totalLateness2 = 0
+            self._maxLateness = 0
+            self._lastLateness = 0
+            self._totalDuration = 0
+            self._maxDuration = 0
+            
+    # Adds the timing of a call to the statistics, must be called while holding the lock of the scheduler
+    # Lateness (float): The time in seconds from the deadline until the call started
+    # Duration (float): The time in seconds the call took
+    def _addTiming(self, Lateness, Duration):
+        self._calls += 1
+        self._totalLateness += Lateness
+        self._totalLateness2 += Lateness**2
+        self._maxLateness = max(self._maxLateness, Lateness)
+        self._lastLateness = Lateness
+        self._totalDuration += Duration
+        self._maxDuration = max(self._maxDuration, Duration)
+        
+        
+# Runs periodic tasks for many loggers and locks from a single thread using a heap of deadlines, the calls are run by a pool of worker threads
+# The deadlines are StartTime + Interval * Count such that a task never drifts, if a deadline has passed by more than an interval or the task is still running then the call is skipped and counted as missed
+# Tasks with the same key which are due in the same tick share one call to their read function such that a device is only read once per tick
+class scheduler(object):
+    # MaxWorkers (int): The maximum number of threads running the tasks, a task never runs on two threads at once, None to have a thread for each task such that a task which blocks for a long time can not delay the others
+    # Resolution (float): Tasks which are due within this many seconds are run in the same tick
+    # WarnMissed (bool): If True then a warning is given when a task misses deadlines
+    # WarnInterval (float): The minimum time in seconds between two warnings about missed deadlines for the same task, the missed deadlines in between are added together
+    def __init__(self, MaxWorkers = None, Resolution = 0.001, WarnMissed = True, WarnInterval = 60):
+        from .. import exceptions as e
+        
+        if MaxWorkers is not None and int(MaxWorkers) < 1:
+            raise e.MinValueError("MaxWorkers", MaxWorkers, 1)
+            
+        if float(Resolution) < 0:
+            raise e.MinValueError("Resolution", Resolution, 0)
+            
+        if float(WarnInterval) < 0:
+            raise e.MinValueError("WarnInterval", WarnInterval, 0)
+        
+        self._maxWorkers = None if MaxWorkers is None else int(MaxWorkers)
+        self._resolution = float(Resolution)
+        self._warnMissed = bool(WarnMissed)
+        self._warnInterval = float(WarnInterval)
+        
+        self._cond = th.Condition()
+        self._heap = []
+        self._tasks = []
+        self._order = 0
+        self._closed = False
+        
+        # The thread and workers are started when the first task is added
+        self._thread = None
+        self._pool = None
+        self._poolSize = 0
+        
+    # Adds a periodic task
+    # Interval (float): The number of seconds between each call, must be positive
+    # Function (func): The function to call every interval, the first argument is the count, if Read is given then the second argument is the return value of Read
+    # FunctionArgs (tuple): The args to pass Function
+    # FunctionKwargs (dict): The kwargs to pass Function
+    # Read (func): The function to read the device, None to not read
+    # ReadArgs (tuple): The args to pass Read
+    # ReadKwargs (dict): The kwargs to pass Read
+    # Key (hashable): Tasks with the same key which are due in the same tick share the call to the Read of one of them, None to never share
+    # Name (str): The name of the task used in warnings and statistics
+    # MaxCount (int): The number of intervals to run for, None to run until stopped
+    # StopEvent (threading.Event): An event which stops the task at the next deadline when it is set, None to create one
+    # Finish (func): A function with no arguments to call when the task has finished
+    # Align (bool): If True then the first call is delayed to a multiple of Interval such that tasks with the same interval are due in the same tick
+    def add(self, Interval, Function, FunctionArgs = tuple(), FunctionKwargs = dict(), Read = None, ReadArgs = tuple(), ReadKwargs = dict(), Key = None, Name = None, MaxCount = None, StopEvent = None, Finish = None, Align = False):
+        import time
+        import math
+        import heapq
+        from .. import exceptions as e
+        
+        Interval = float(Interval)
+        
+        if Interval <= 0:
+            raise e.SharpMinValueError("Interval", Interval, 0)
+            
+        if MaxCount is not None and int(MaxCount) < 0:
+            raise e.MinValueError("MaxCount", MaxCount, 0)
+        
+        StartTime = time.monotonic()
+        
+        if Align:
+            StartTime = math.ceil(StartTime / Interval) * Interval
+        
+        with self._cond:
+            if self._closed:
+                raise e.NotRunningError("Scheduler", self)
+            
+            if Name is None:
+                Name = f"{getattr(Function, '__name__', 'task')}_{self._order}"
+            
+            Task = schedulerTask(self, Interval, Function, tuple(FunctionArgs), dict(FunctionKwargs), Read, tuple(ReadArgs), dict(ReadKwargs), Key, str(Name), None if MaxCount is None else int(MaxCount), StopEvent, Finish, StartTime)
+            self._tasks.append(Task)
+            
+            heapq.heappush(self._heap, (StartTime, self._order, Task))
+            self._order += 1
+            
+            self._start()
+            self._cond.notify()
+            
+        return Task
+        
+    # Gets the tasks which have not finished
+    def getTasks(self):
+        with self._cond:
+            return list(self._tasks)
+        
+    # Gets the statistics of all of the tasks which have not finished
+    # Returns a dict with the name of each task as key and the dict from schedulerTask.getStats
+    def getStats(self):
+        return {Task.name: Task.getStats() for Task in self.getTasks()}
+    
+    # Stops all of the tasks and the scheduler thread
+    # Timeout (float): The maximum time in seconds to wait for the running calls to finish, None to wait forever
+    def close(self, Timeout = None):
+        for Task in self.getTasks():
+            Task.stop()
+            
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            
+        if self._thread is not None:
+            self._thread.join(Timeout)
+            self._pool.shutdown(wait = Timeout is None)
+            
+    # Starts the thread and the workers if they are not running and makes sure there are enough workers for the tasks, must be called while holding the lock
+    def _start(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # One worker for each task and one for finishing tasks, it is doubled when too small such that it is not replaced for every task
+        Size = self._maxWorkers
+        
+        if Size is None:
+            Size = self._poolSize if self._poolSize > len(self._tasks) else 2 * (len(self._tasks) + 1)
+        
+        # Threads are only started when needed, the old pool finishes the calls it has been given
+        if Size != self._poolSize:
+            if self._pool is not None:
+                self._pool.shutdown(wait = False)
+                
+            self._pool = ThreadPoolExecutor(max_workers = Size, thread_name_prefix = "schedulerWorker")
+            self._poolSize = Size
+        
+        if self._thread is None:
+            self._thread = th.Thread(target = self._run, name = "scheduler", daemon = True)
+            self._thread.start()
+            
+    # Finishes a task which has been stopped if it is not running
+    # Task (schedulerTask): The task to stop
+    def _stopTask(self, Task):
+        with self._cond:
+            if Task._busy or Task._finished:
+                return
+            
+            Task._finished = True
+            
+        self._pool.submit(self._finishTask, Task)
+        
+    # Calls the finish function of a task and removes it
+    # Task (schedulerTask): The task which has finished
+    def _finishTask(self, Task):
+        import warnings
+        
+        if Task._finish is not None:
+            try:
+                Task._finish()
+                
+            except Exception as ErrorMes:
+                warnings.warn(f"An exception occured when finishing scheduler task {Task.name}: {ErrorMes}")
+        
+        with self._cond:
+            if Task in self._tasks:
+                self._tasks.remove(Task)
+            
+        Task._doneEvent.set()
+        
+    # Counts missed deadlines and gives a warning at most once every WarnInterval for each task, must be called while holding the lock
+    # Task (schedulerTask): The task which missed the deadlines
+    # Count (int): The count of the first missed deadline
+    # Missed (int): The number of missed deadlines
+    def _missed(self, Task, Count, Missed):
+        import time
+        import warnings
+        
+        Task._missed += Missed
+        
+        if not self._warnMissed:
+            return
+        
+        Task._unwarned += Missed
+        Now = time.monotonic()
+        
+        if Task._lastWarning is None or Now - Task._lastWarning >= self._warnInterval:
+            warnings.warn(f"Scheduler task {Task.name} missed {Task._unwarned} deadline(s) since the last warning, the latest from count {Count}")
+            Task._unwarned = 0
+            Task._lastWarning = Now
+            
+    # The scheduler thread, it waits for the next deadline and gives the due tasks to the workers
+    def _run(self):
+        import time
+        import heapq
+        
+        with self._cond:
+            while not self._closed:
+                if len(self._heap) == 0:
+                    self._cond.wait()
+                    continue
+                
+                Now = time.monotonic()
+                
+                if self._heap[0][0] - Now > self._resolution:
+                    self._cond.wait(self._heap[0][0] - Now)
+                    continue
+                    
+                # Group the due tasks by key
+                Groups = {}
+                
+                while len(self._heap) > 0 and self._heap[0][0] - Now <= self._resolution:
+                    Deadline, Order, Task = heapq.heappop(self._heap)
+                    
+                    if Task._finished:
+                        continue
+                    
+                    Count = Task._count
+                    
+                    # Skip deadlines which have already passed
+                    Skipped = int((Now - Deadline) // Task.interval)
+                    
+                    if Task._maxCount is not None:
+                        Skipped = min(Skipped, Task._maxCount - Count)
+                    
+                    if Skipped > 0 and not Task._stopEvent.is_set():
+                        self._missed(Task, Count, Skipped)
+                        Count += Skipped
+                        Deadline += Skipped * Task.interval
+                    
+                    # Finish the task if it has been stopped or it has used all of its counts
+                    if Task._stopEvent.is_set() or (Task._maxCount is not None and Count >= Task._maxCount):
+                        if not Task._busy:
+                            Task._finished = True
+                            self._pool.submit(self._finishTask, Task)
+                            
+                        else:
+                            Task._stopEvent.set()
+                            
+                        continue
+                    
+                    Task._count = Count + 1
+                    heapq.heappush(self._heap, (Task._startTime + Task._count * Task.interval, Order, Task))
+                    
+                    if Task._busy:
+                        self._missed(Task, Count, 1)
+                        continue
+                    
+                    Task._busy = True
+                    Key = ("Task", Order) if Task.key is None else ("Key", Task.key)
+                    Groups.setdefault(Key, []).append((Task, Count, Deadline))
+                    
+                for Group in Groups.values():
+                    self._pool.submit(self._runGroup, Group)
+                    
+    # Runs the tasks which share a read in a tick
+    # Group (list of tuple): A tuple of (Task (schedulerTask), Count (int), Deadline (float)) for each task
+    def _runGroup(self, Group):
+        import time
+        import warnings
+        
+        StartTime = time.monotonic()
+        Reader = Group[0][0]
+        Result = None
+        ReadFailed = False
+        
+        # Read once for the whole group
+        if Reader._read is not None:
+            try:
+                Result = Reader._read(*Reader._readArgs, **Reader._readKwargs)
+                
+            except Exception as ErrorMes:
+                warnings.warn(f"An exception occured in the read of scheduler task {Reader.name} at count {Group[0][1]}: {ErrorMes}")
+                ReadFailed = True
+                
+        for Task, Count, Deadline in Group:
+            if not ReadFailed:
+                try:
+                    if Task._read is None:
+                        Task._f(Count, *Task._args, **Task._kwargs)
+                        
+                    else:
+                        Task._f(Count, Result, *Task._args, **Task._kwargs)
+                    
+                except Exception as ErrorMes:
+                    warnings.warn(f"An exception occured in scheduler task {Task.name} at count {Count}: {ErrorMes}")
+            
+            with self._cond:
+                Task._addTiming(StartTime - Deadline, time.monotonic() - StartTime)
+                
+                if len(Group) > 1:
+                    Task._sharedReads += 1
+                    
+                Task._busy = False
+                Finish = not Task._finished and (Task._stopEvent.is_set() or (Task._maxCount is not None and Task._count >= Task._maxCount))
+                
+                if Finish:
+                    Task._finished = True
+                    
+            if Finish:
+                self._finishTask(Task)
+                
+                
+# The scheduler shared by all timers and loggers
+_scheduler = None
+_schedulerLock = th.Lock()
+    
+# Gets the shared scheduler, it is created the first time it is needed
+def getScheduler():
+    global _scheduler
+    
+    with _schedulerLock:
+        if _scheduler is None:
+            _scheduler = scheduler()
+            
+        return _scheduler
@@ -46,6 +46,8 @@ class visa(device):
     # Flushes the device
     def flush(self):
         import pyvisa
+        
+        self.clearParameterCache()
         self._visa.flush(pyvisa.constants.VI_READ_BUF | pyvisa.constants.VI_WRITE_BUF)
     
     # Checks if the device is open, must be overwritten by the sub class if it can be closed
@@ -1,16 +1,43 @@
-from .controllers_powerPID import powerPID
-from .controllers_PTC10 import PTC10 
-from .controllers_tempArduino import tempArduino
-from .controllers_keithly import keithly
-from .controllers_PM100D import PM100D
-from .controllers_NIDAC import NIDAC
-from .controllers_highFinesseWM import highFinesseWM
-from .controllers_DLCPro import DLCPro
-from .controllers_DACLaser import DACLaser
-from .controllers_rigol import rigol
-from .controllers_timeBandit import FPGASequence, FPGAChannel, FPGAChannelPulse, FPGAChannelPhasedPulse, timeBandit
-from .controllers_photonSpot import photonSpot
-from .controllers_kinesisRotationStage import kinesisRotationStage
-from .controllers_ELLO import ELLOControl, ELLO
-from .controllers_swabianTimeTagger import swabianTimeTagger
-from .controllers_AWG import AWGSequence, AWGSingleSequence, AWG      
\ No newline at end of file
+import importlib
+
+# The module of each controller class, a module is only imported when one of its classes is first used such that the vendor libraries are only loaded when needed
+_classes = {
+    "powerPID": "controllers_powerPID",
+    "PTC10": "controllers_PTC10",
+    "tempArduino": "controllers_tempArduino",
+    "keithly": "controllers_keithly",
+    "PM100D": "controllers_PM100D",
+    "NIDAC": "controllers_NIDAC",
+    "highFinesseWM": "controllers_highFinesseWM",
+    "DLCPro": "controllers_DLCPro",
+    "DACLaser": "controllers_DACLaser",
+    "rigol": "controllers_rigol",
+    "FPGASequence": "controllers_timeBandit",
+    "FPGAChannel": "controllers_timeBandit",
+    "FPGAChannelPulse": "controllers_timeBandit",
+    "FPGAChannelPhasedPulse": "controllers_timeBandit",
+    "timeBandit": "controllers_timeBandit",
+    "photonSpot": "controllers_photonSpot",
+    "kinesisRotationStage": "controllers_kinesisRotationStage",
+    "ELLOControl": "controllers_ELLO",
+    "ELLO": "controllers_ELLO",
+    "swabianTimeTagger": "controllers_swabianTimeTagger",
+    "swabianMeasurements": "controllers_swabianTimeTagger",
+    "AWGSequence": "controllers_AWG",
+    "AWGSingleSequence": "controllers_AWG",
+    "AWG": "controllers_AWG"
+}
+__all__ = list(_classes.keys())
+
+# Imports the module of a controller class the first time it is accessed
+# Name (str): The name of the class
+def __getattr__(Name):
+    if Name in _classes:
+        Value = getattr(importlib.import_module(f".{_classes[Name]}", __name__), Name)
+        globals()[Name] = Value
+        return Value
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {Name!r}")
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_classes.keys()))
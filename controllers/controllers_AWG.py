@@ -450,44 +450,46 @@ class AWG(c.visa):
             
         Name = f"{Sequence.name}_BB"
             
-        # Check if it is not uploaded
-        if not Name in self.sequences:
-            for Entry, EntrySequence in enumerate(Sequence.sequences):
-                for Channel, ChannelSequence in enumerate(EntrySequence):
-                    if ChannelSequence is not None:
-                        self.importWaveform(ChannelSequence.normWaveform, f"{Name}_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
+        # Send all of the commands together
+        with self.batch(**kwargs):
+            # Check if it is not uploaded
+            if not Name in self.sequences:
+                for Entry, EntrySequence in enumerate(Sequence.sequences):
+                    for Channel, ChannelSequence in enumerate(EntrySequence):
+                        if ChannelSequence is not None:
+                            self.importWaveform(ChannelSequence.normWaveform, f"{Name}_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
 
-            self.sequences[Name] = Sequence
+                self.sequences[Name] = Sequence
 
-        # Set the sequence count
-        self.sendWithoutResponse(f"SEQuence:LENGth {len(self._sequences[Name])}", **kwargs)
+            # Set the sequence count
+            self.sendWithoutResponse(f"SEQuence:LENGth {len(self._sequences[Name])}", **kwargs)
 
-        # Set waveform to be active
-        ActiveChannels = [False] * len[self.sequences[Name].sequences[0]]
+            # Set waveform to be active
+            ActiveChannels = [False] * len[self.sequences[Name].sequences[0]]
         
-        for Entry, EntrySequence in enumerate(self.sequences[Name].sequences):
-            # Set the loop count
-            self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LOOP:COUNt 1", **kwargs)
+            for Entry, EntrySequence in enumerate(self.sequences[Name].sequences):
+                # Set the loop count
+                self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LOOP:COUNt 1", **kwargs)
             
-            for Channel, ChannelSequence in enumerate(EntrySequence):
-                if ChannelSequence is not None:
-                    ActiveChannels[Channel] = True
+                for Channel, ChannelSequence in enumerate(EntrySequence):
+                    if ChannelSequence is not None:
+                        ActiveChannels[Channel] = True
                     
-                    # Set waveform
-                    self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:WAVeform{Channel + 1} \"{Name}_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
+                        # Set waveform
+                        self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:WAVeform{Channel + 1} \"{Name}_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
 
-                    # Set voltage
-                    self.setBBMin(ChannelSequence.min, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
-                    self.setBBMax(ChannelSequence.max, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
+                        # Set voltage
+                        self.setBBMin(ChannelSequence.min, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
+                        self.setBBMax(ChannelSequence.max, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
 
                         
-        # Turn on channels
-        for Channel, Active in enumerate(ActiveChannels):
-            if Active:
-                self.on(Channel = Channel + 1, **kwargs)
+            # Turn on channels
+            for Channel, Active in enumerate(ActiveChannels):
+                if Active:
+                    self.on(Channel = Channel + 1, **kwargs)
                 
-            else:
-                self.off(Channel = Channel + 1, **kwargs)            
+                else:
+                    self.off(Channel = Channel + 1, **kwargs)            
 
 
     # Loads an arbitrary waveform for RF mode
@@ -504,53 +506,55 @@ class AWG(c.visa):
             
         Name = f"{Sequence.name}_RF"
             
-        # Check if it is not uploaded
-        if not Name in self.sequences:
-            for Entry, EntrySequence in enumerate(Sequence.sequences):
-                for Channel, ChannelSequence in enumerate(EntrySequence):
-                    if ChannelSequence is not None:
-                        self.importWaveform(ChannelSequence[0].normWaveform, f"{Name}I_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
-                        self.importWaveform(ChannelSequence[1].normWaveform, f"{Name}Q_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
+        # Send all of the commands together
+        with self.batch(**kwargs):
+            # Check if it is not uploaded
+            if not Name in self.sequences:
+                for Entry, EntrySequence in enumerate(Sequence.sequences):
+                    for Channel, ChannelSequence in enumerate(EntrySequence):
+                        if ChannelSequence is not None:
+                            self.importWaveform(ChannelSequence[0].normWaveform, f"{Name}I_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
+                            self.importWaveform(ChannelSequence[1].normWaveform, f"{Name}Q_CH{Channel + 1}_ENTRY{Entry + 1}", **kwargs)
                         
-            self.sequences[Name] = Sequence
+                self.sequences[Name] = Sequence
 
-        # Set the sequence count
-        self.sendWithoutResponse(f"SEQuence:LENGth {len(self._sequences[Name])}", **kwargs)
+            # Set the sequence count
+            self.sendWithoutResponse(f"SEQuence:LENGth {len(self._sequences[Name])}", **kwargs)
 
-        # Set waveform to be active
-        ActiveChannels = [False] * len[self.sequences[Name].sequences[0]]
+            # Set waveform to be active
+            ActiveChannels = [False] * len[self.sequences[Name].sequences[0]]
         
-        for Entry, EntrySequence in enumerate(self.sequences[Name].sequences):
-            # Set the loop count
-            self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LOOP:COUNt 1", **kwargs)
+            for Entry, EntrySequence in enumerate(self.sequences[Name].sequences):
+                # Set the loop count
+                self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LOOP:COUNt 1", **kwargs)
 
-            Length = 0
+                Length = 0
             
-            for Channel, ChannelSequence in enumerate(EntrySequence):
-                if ChannelSequence is not None:
-                    ActiveChannels[Channel] = True
-                    Length = max(Length, len(ChannelSequence[0].normWaveform), len(ChannelSequence[1].normWaveform))
+                for Channel, ChannelSequence in enumerate(EntrySequence):
+                    if ChannelSequence is not None:
+                        ActiveChannels[Channel] = True
+                        Length = max(Length, len(ChannelSequence[0].normWaveform), len(ChannelSequence[1].normWaveform))
                     
-                    # Set waveform
-                    self.sendWithoutResponse(f"RF:SEQuence:ELEM{Entry + 1}:OUTPut{Channel + 1}:WAVeform1 \"{Name}I_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
-                    self.sendWithoutResponse(f"RF:SEQuence:ELEM{Entry + 1}:OUTPut{Channel + 1}:WAVeform2 \"{Name}Q_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
+                        # Set waveform
+                        self.sendWithoutResponse(f"RF:SEQuence:ELEM{Entry + 1}:OUTPut{Channel + 1}:WAVeform1 \"{Name}I_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
+                        self.sendWithoutResponse(f"RF:SEQuence:ELEM{Entry + 1}:OUTPut{Channel + 1}:WAVeform2 \"{Name}Q_CH{Channel + 1}_ENTRY{Entry + 1}\"", **kwargs)
 
-                    # Set voltage
-                    self.setRFMin(ChannelSequence[0].min, ChannelSequence[1].min, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
-                    self.setRFMax(ChannelSequence[0].max, ChannelSequence[1].max, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
+                        # Set voltage
+                        self.setRFMin(ChannelSequence[0].min, ChannelSequence[1].min, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
+                        self.setRFMax(ChannelSequence[0].max, ChannelSequence[1].max, Channel = Channel + 1, Entry = Entry + 1, **kwargs)
                   
-            # Set the length
-            self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LENGth {Length}", **kwargs)
+                # Set the length
+                self.sendWithoutResponse(f"SEQuence:ELEM{Entry + 1}:LENGth {Length}", **kwargs)
                     
-        # Turn on channels
-        for Channel, Active in enumerate(ActiveChannels):
-            if Active:
-                self.on(Channel = Channel + 1, **kwargs)
+            # Turn on channels
+            for Channel, Active in enumerate(ActiveChannels):
+                if Active:
+                    self.on(Channel = Channel + 1, **kwargs)
                 
-            else:
-                self.off(Channel = Channel + 1, **kwargs)
+                else:
+                    self.off(Channel = Channel + 1, **kwargs)
                 
-        self.currentSequence = Name
+            self.currentSequence = Name
                 
     # Loads an arbitrary waveform
     # Sequence (AWGSingleSequence): The sequence to load
@@ -4,6 +4,9 @@ from ..interface import laser
 
 # Class to control a CTL
 class DLCPro(laser, c.socket):
+    # sendCommand uses the response so the commands cannot be batched
+    _batchable = False
+    
     # IP (str): The IP of the connection
     # Port (int): The port to communicate through
     # FrequencyControl (bool): If False then it cannot set or get the frequency for this laser
@@ -22,40 +22,48 @@ class PM100D(powermeter, c.visa):
     # Sets a bool value
     # Parameter (str): The parameter to set
     # Value (bool): The value to set
+    # SkipUnchanged (bool): If True then it is not written if it is already set, only if the device was initialized with SkipUnchanged = True
     # UseQueue (bool): True if it should use the command queue    
-    def _setBool(self, Parameter, Value, **kwargs):
-        self.sendWithoutResponse(f"{Parameter} {int(bool(Value))}", **kwargs)
+    def _setBool(self, Parameter, Value, SkipUnchanged = False, **kwargs):
+        self.cacheWrite(Parameter, bool(Value), self.sendWithoutResponse, Args = (f"{Parameter} {int(bool(Value))}",), Kwargs = kwargs, SkipUnchanged = SkipUnchanged)
         
-    # Sets a float value
+    # Sets a float value, the powermeter rounds the value so it is read from the device the next time
     # Parameter (str): The parameter to set
     # Value (bool): The value to set
+    # SkipUnchanged (bool): If True then it is not written if it is already set, only if the device was initialized with SkipUnchanged = True
     # UseQueue (bool): True if it should use the command queue    
-    def _setFloat(self, Parameter, Value, **kwargs):
-        self.sendWithoutResponse(f"{Parameter} {Value:g}", **kwargs)
+    def _setFloat(self, Parameter, Value, SkipUnchanged = False, **kwargs):
+        self.cacheWrite(Parameter, float(Value), self.sendWithoutResponse, Args = (f"{Parameter} {Value:g}",), Kwargs = kwargs, Record = False, SkipUnchanged = SkipUnchanged)
         
     # Gets a bool value
     # Parameter (str): The parameter to get
+    # Volatile (bool): If True then it is always read from the device
     # UseQueue (bool): True if it should use the command queue    
-    def _getBool(self, Parameter, **kwargs):
+    def _getBool(self, Parameter, Volatile = False, **kwargs):
         from .. import functions as f
         
         kwargs["ResponseCheck"] = f.responseCheck.getBool()
-        return bool(self.query(f"{Parameter}?", **kwargs))
+        return self.cacheRead(Parameter, lambda: bool(self.query(f"{Parameter}?", **kwargs)), Volatile = Volatile)
     
     # Gets a float value
     # Parameter (str): The parameter to get
+    # Volatile (bool): If True then it is always read from the device
     # UseQueue (bool): True if it should use the command queue    
-    def _getFloat(self, Parameter, **kwargs):
+    def _getFloat(self, Parameter, Volatile = False, **kwargs):
         from .. import functions as f
         
         kwargs["ResponseCheck"] = f.responseCheck.getNumber()
-        return float(self.query(f"{Parameter}?", **kwargs))
+        return self.cacheRead(Parameter, lambda: float(self.query(f"{Parameter}?", **kwargs)), Volatile = Volatile)
 
     # Sets the power auto range
     # Value (bool): True if auto range should be enabled
     # UseQueue (bool): True if it should use the command queue    
     def setPowerAutoRange(self, Value, **kwargs):
         self._setBool("power:range:auto", Value, **kwargs)
+        
+        # The auto range will change the range
+        if Value:
+            self.clearParameterCache("power:range")
     
     # Gets the status of the power auto range
     # UseQueue (bool): True if it should use the command queue    
@@ -66,18 +74,18 @@ class PM100D(powermeter, c.visa):
     # Value (float): The value of the max power
     # UseQueue (bool): True if it should use the command queue    
     def setPowerRange(self, Value, **kwargs):
-        self._setFloat("power:range", Value, **kwargs)
+        self._setFloat("power:range", Value, SkipUnchanged = True, **kwargs)
     
     # Gets the max power setting
     # UseQueue (bool): True if it should use the command queue    
     def getPowerRange(self, **kwargs):
-        return self._getFloat("power:range", **kwargs)
+        return self._getFloat("power:range", Volatile = self.getPowerAutoRange(**kwargs), **kwargs)
     
     # Sets the max frequency
     # Value (float): The value of the max frequency
     # UseQueue (bool): True if it should use the command queue    
     def setFrequencyRange(self, Value, **kwargs):
-        self._setFloat("frequency:range", Value, **kwargs)
+        self._setFloat("frequency:range", Value, SkipUnchanged = True, **kwargs)
     
     # Gets the max frequency setting
     # UseQueue (bool): True if it should use the command queue    
@@ -87,4 +95,4 @@ class PM100D(powermeter, c.visa):
     # Gets a power measurement
     # UseQueue (bool): True if it should use the command queue    
     def getPower(self, **kwargs):
-        return self._getFloat("measure:power", **kwargs)
+        return self._getFloat("measure:power", Volatile = True, **kwargs)
@@ -34,37 +34,41 @@ class keithly(c.visa):
         self._stableTries = int(StableTries)
         self._stableDelay = float(StableDelay)
         
-    # Retrieves a parameter
+    # Retrieves a parameter, function calls like smu.measure.read() are always sent to the device
     # Parameter (str): The parameter to retrieve
+    # Volatile (bool): If True then it is always read from the device
     # UseQueue (bool): True if it should use the command queue    
-    def _getParameter(self, Parameter, **kwargs):
+    def _getParameter(self, Parameter, Volatile = False, **kwargs):
         from .. import functions as f
         
         kwargs["ResponseCheck"] = f.responseCheck.default()
-        return self.query(f"print({Parameter})", **kwargs)
+        return self.cacheRead(Parameter, self.query, Args = (f"print({Parameter})",), Kwargs = kwargs, Volatile = Volatile or "(" in Parameter)
     
-    # Retrieves a float
+    # Retrieves a float, function calls like smu.measure.read() are always sent to the device
     # Parameter (str): The parameter to retrieve
+    # Volatile (bool): If True then it is always read from the device
     # UseQueue (bool): True if it should use the command queue    
-    def _getValue(self, Parameter, **kwargs):
+    def _getValue(self, Parameter, Volatile = False, **kwargs):
         from .. import functions as f
         
         kwargs["ResponseCheck"] = f.responseCheck.getValue()
-        return float(self.query(f"print({Parameter})", **kwargs))
+        return self.cacheRead(Parameter, lambda: float(self.query(f"print({Parameter})", **kwargs)), Volatile = Volatile or "(" in Parameter)
     
     # Sets a parameter
     # Parameter (str): The parameter to set
     # Value (str): The value to set the parameter to
+    # SkipUnchanged (bool): If True then it is not sent if the parameter is already set to the value, only if the device was initialized with SkipUnchanged = True
     # UseQueue (bool): True if it should use the command queue    
-    def _setParameter(self, Parameter, Value, **kwargs):
-        self.sendWithoutResponse(f"{Parameter}={Value}", **kwargs)
+    def _setParameter(self, Parameter, Value, SkipUnchanged = False, **kwargs):
+        self.cacheWrite(Parameter, str(Value), self.sendWithoutResponse, Args = (f"{Parameter}={Value}",), Kwargs = kwargs, Record = False, SkipUnchanged = SkipUnchanged)
         
     # Sets a float
     # Parameter (str): The parameter to set
     # Value (float): The value to set the parameter to
     # UseQueue (bool): True if it should use the command queue    
     def _setValue(self, Parameter, Value, **kwargs):
-        self.sendWithoutResponse(f"{Parameter}={float(Value):1.6g}", **kwargs)
+        Value = f"{float(Value):1.6g}"
+        self.cacheWrite(Parameter, float(Value), self.sendWithoutResponse, Args = (f"{Parameter}={Value}",), Kwargs = kwargs)
 
     # Sets the voltage and waits until it is locked
     # Value (float): The value of the voltage
@@ -155,7 +159,7 @@ class keithly(c.visa):
     # Sets the wire sense mode to 2wire
     # UseQueue (bool): True if it should use the command queue    
     def use2WireSense(self, **kwargs):
-        self._setParameter("smu.measure.sense", "smu.SENSE_2WIRE", **kwargs)
+        self._setParameter("smu.measure.sense", "smu.SENSE_2WIRE", SkipUnchanged = True, **kwargs)
     
     # Turns on the voltage source
     # UseQueue (bool): True if it should use the command queue    
@@ -170,18 +174,18 @@ class keithly(c.visa):
     # Returns the activation status of the device
     # UseQueue (bool): True if it should use the command queue    
     def status(self, **kwargs):
-        return self._getParameter("smu.source.output", **kwargs)
+        return self._getParameter("smu.source.output", Volatile = True, **kwargs)
     
     # Sets the front terminal and turns voltage source on
     # UseQueue (bool): True if it should use the command queue    
     def front(self, **kwargs):
-        self._setParameter("smu.measure.terminals", "smu.TERMINALS_FRONT", **kwargs)    
+        self._setParameter("smu.measure.terminals", "smu.TERMINALS_FRONT", SkipUnchanged = True, **kwargs)    
         self.start(**kwargs)
     
     # Sets rear terminal and turns voltage source on
     # UseQueue (bool): True if it should use the command queue    
     def rear(self, **kwargs):
-        self._setParameter("smu.measure.terminals", "smu.TERMINALS_REAR", **kwargs)    
+        self._setParameter("smu.measure.terminals", "smu.TERMINALS_REAR", SkipUnchanged = True, **kwargs)    
         self.start(**kwargs)
         
     # Get which terminal is showing
@@ -192,12 +196,12 @@ class keithly(c.visa):
     # Enables auto delay
     # UseQueue (bool): True if it should use the command queue    
     def enableAutoDelay(self, **kwargs):
-        self._setParameter("smu.source.autodelay", "smu.ON", **kwargs)
+        self._setParameter("smu.source.autodelay", "smu.ON", SkipUnchanged = True, **kwargs)
     
     # Disables auto delay
     # UseQueue (bool): True if it should use the command queue    
     def disableAutoDelay(self, **kwargs):
-        self._setParameter("smu.source.autodelay", "smu.OFF", **kwargs)
+        self._setParameter("smu.source.autodelay", "smu.OFF", SkipUnchanged = True, **kwargs)
     
     # Gets the auto delay status
     # UseQueue (bool): True if it should use the command queue    
@@ -213,6 +217,7 @@ class keithly(c.visa):
     # UseQueue (bool): True if it should use the command queue    
     def reset(self, **kwargs):
         self.sendWithoutResponse("smu.reset()", **kwargs)
+        self.clearParameterCache()
         
         self._setParameter("smu.source.func", "smu.FUNC_DC_VOLTAGE", **kwargs)
         self._setParameter("smu.source.protect.level", "smu.PROTECT_5V", **kwargs)
@@ -50,4 +50,11 @@ class photonSpot(c.socketClient):
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     def setBias(self, Channel, Bias, **kwargs):
         self.sendWithoutResponse(f"Det-{int(Channel)}:Bias = {float(Bias)}")
-        
\ No newline at end of file
+        
+    # Sets the bias current of several channels of the SNSPD with a single call through the queue
+    # Biases (dict): The bias current to set with the channel as the key
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setBiases(self, Biases, **kwargs):
+        with self.batch(**kwargs):
+            for Channel, Bias in Biases.items():
+                self.setBias(Channel, Bias)
\ No newline at end of file
@@ -3,6 +3,12 @@ from ..interface import PID
 
 # Used to control a power controller PID
 class powerPID(PID, c.serial):
+    # sendCommand uses the response so the commands cannot be batched
+    _batchable = False
+    
+    # The parameters which the PID changes by itself and which must always be read
+    _volatileParameters = ["O", "V", "E"]
+    
     # Port (str): The name of the COM port through which to access the serial connection
     # P (float): The P-factor to initialize
     # I (float): The I-factor to initialize
@@ -43,7 +49,7 @@ class powerPID(PID, c.serial):
         kwargs["ReturnLines"] = 2
         return super().sendCommand(*args, **kwargs)[1]
         
-    # Set a parameter of the PID
+    # Set a parameter of the PID, the value is saved in the parameter cache
     # Parameter (str): The name of the parameter to set
     # Value (): The value of the parameter
     # Type (type): The type to cast to
@@ -58,17 +64,23 @@ class powerPID(PID, c.serial):
             
         # Send the command
         kwargs["ResponseCheck"] = f.responseCheck.matchReturn("OK", Line = 1)
-        return self.sendCommand(f"{Parameter}={CorrectValue}", **kwargs)
+        return self.cacheWrite(Parameter, float(CorrectValue), self.sendCommand, Args = (f"{Parameter}={CorrectValue}",), Kwargs = kwargs)
 
         
-    # Get a parameter from the PID
+    # Get a parameter from the PID, it is read from the parameter cache unless the PID changes it by itself
     # Parameter (str): The name of the parameter to get
     # UseQueue (bool): Whether to run the command through the queue or not
     def _getParameter(self, Parameter, **kwargs):
-        from .. import functions as f
-        
         Parameter = str(Parameter)
         
+        return self.cacheRead(Parameter, self._readParameter, Args = (Parameter,), Kwargs = kwargs, Volatile = Parameter in self._volatileParameters)
+        
+    # Reads a parameter from the PID
+    # Parameter (str): The name of the parameter to get
+    # UseQueue (bool): Whether to run the command through the queue or not
+    def _readParameter(self, Parameter, **kwargs):
+        from .. import functions as f
+        
         # Send command to get the value and read it
         kwargs["ResponseCheck"] = f.responseCheck.delimCount(2, Delimiter = ":", Line = 1)
         ReturnString = self.sendCommand(f"{Parameter}?", **kwargs)
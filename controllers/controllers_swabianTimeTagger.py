@@ -10,12 +10,15 @@ class swabianTimeTagger(c.external):
     # BinWidth (int): The width of a bin in ps
     # DefaultCorrelationBins (int): The number of correlation bins to use by default
     # ChannelCount (int): The number of channels accessable
+    # ClockRateTTL (float): The time in seconds a measured clock rate is reused for histograms, 0 to always measure it
     # UseQueue (bool): If True then it will set up a queue which can be used in the sendCommand method, if False the UseQueue in sendCommand is ignored
     # Empty (bool): If True then it will not communicate with the device
     # DeviceName (str): The name of the device, only used for error messages
     # ID (str): The ID name for the device, only used for displaying infomation    
-    def __init__(self, *args, DefaultChannel = 1, DefaultIntegrationTime = 1, ClockChannel = 1, DefaultGates = [], BinWidth = 4, DefaultCorrelationBins = 2500, ChannelCount = 8, **kwargs):        
+    def __init__(self, *args, DefaultChannel = 1, DefaultIntegrationTime = 1, ClockChannel = 1, DefaultGates = [], BinWidth = 4, DefaultCorrelationBins = 2500, ChannelCount = 8, ClockRateTTL = 1, **kwargs):        
         import TimeTagger as TT
+        import collections
+        import threading as th
         self._TT = TT
         
         if not "DeviceName" in kwargs:
@@ -35,12 +38,30 @@ class swabianTimeTagger(c.external):
         self._streamEnd = 0.
         self._triggerMode = [1] * int(ChannelCount)
         
+        # Histogram geometries and measured clock rates are reused between histograms
+        self._clockRateTTL = 0.
+        self._clockRates = dict()
+        self._histogramCache = dict()
+        self._histogramCacheSize = 100
+        self.setClockRateTTL(ClockRateTTL)
+        
+        # The continuous stream is read on its own thread into a buffer of chunks
+        self._continuousStream = None
+        self._streamThread = None
+        self._streamStop = th.Event()
+        self._streaming = False
+        self._chunks = collections.deque()
+        self._maxChunks = 1
+        self._chunkCond = th.Condition()
+        self._streamStats = {"Events": 0, "Chunks": 0, "DroppedEvents": 0, "DroppedChunks": 0, "Overflows": 0}
+        
     def open(self):
         self._device = self._TT.createTimeTagger()
         self._device.reset()
         self._device.sync()
                 
     def _close(self):
+        self.stopContinuousStream()
         self._TT.freeTimeTagger(self._device)
         super()._close()
         
@@ -109,6 +130,22 @@ class swabianTimeTagger(c.external):
     # Channels (int/list of int): The channel or channels to use, if None it will use the default
     # IntegrationTime (float): The integration time in seconds, if None it will use the default
     def _getCount(self, Channels = None, IntegrationTime = None):
+        if IntegrationTime is None:
+            IntegrationTime = self._intTime
+            
+        # Setup counter
+        Sampler, GetResult = self._createCount(self._device, Channels = Channels, IntegrationTime = IntegrationTime)
+
+        # Get counts
+        self._sample(Sampler, IntegrationTime)
+        
+        return GetResult()
+    
+    # Creates a counter, returns (Sampler, GetResult) where GetResult is a function returning the counts when the sampler is done
+    # Tagger (TimeTagger): The time tagger to create it on
+    # Channels (int/list of int): The channel or channels to use, if None it will use the default
+    # IntegrationTime (float): The integration time in seconds, if None it will use the default
+    def _createCount(self, Tagger, Channels = None, IntegrationTime = None):
         # Get parameters
         if Channels is None:
             Channels = self._channel
@@ -121,22 +158,21 @@ class swabianTimeTagger(c.external):
             Channels = [Channels]
             ToInt = True
             
-        for i in range(len(Channels)):
-            Channels[i] *= self._triggerMode[Channels[i] - 1]
+        Channels = [Channel * self._triggerMode[Channel - 1] for Channel in Channels]
         
         # Setup counter
-        Sampler = self._TT.Counter(self._device, Channels, int(float(IntegrationTime) * 1e12), 1)
-
-        # Get counts
-        self._sample(Sampler, IntegrationTime)
+        Sampler = self._TT.Counter(Tagger, Channels, int(float(IntegrationTime) * 1e12), 1)
         
         # Get data
-        Data = Sampler.getData()
-        
-        if ToInt:
-            Data = int(Data)
+        def GetResult():
+            Data = Sampler.getData()
             
-        return Data
+            if ToInt:
+                Data = int(Data)
+                
+            return Data
+        
+        return Sampler, GetResult
 
     # Gets the count within the specified gates
     # ClockChannel (int): The channel to use for the clock
@@ -152,14 +188,33 @@ class swabianTimeTagger(c.external):
     # Channel (int): The channel to get data from
     # IntegrationTime (float): The integration time for the histogram
     # Gates (list of 2-tuple of int): List of gates where each gate defines the start and end time of data aquisition
-    def _getGatedCount(self, **kwargs):
+    def _getGatedCount(self, IntegrationTime = None, **kwargs):
+        if IntegrationTime is None:
+            IntegrationTime = self._intTime
+            
+        Sampler, GetResult = self._createGatedCount(self._device, **kwargs)
+        self._sample(Sampler, IntegrationTime)
+        
+        return GetResult()
+    
+    # Creates a histogram for a gated count, returns (Sampler, GetResult) where GetResult is a function returning the count when the sampler is done
+    # Tagger (TimeTagger): The time tagger to create it on
+    # ClockChannel (int): The channel to use for the clock
+    # Channel (int): The channel to get data from
+    # Gates (list of 2-tuple of int): List of gates where each gate defines the start and end time of data aquisition
+    # ClockRate (float): The clock rate for the histogram, if not given then it will calculate it itself
+    def _createGatedCount(self, Tagger, **kwargs):
         import numpy as np
         
-        # Get histogram
-        Data, _ = self._getHistogram(**kwargs)
+        Sampler, GetHistogram = self._createHistogram(Tagger, **kwargs)
         
         # Sum them
-        return np.sum(Data)
+        def GetResult():
+            Data, _ = GetHistogram()
+            
+            return np.sum(Data)
+        
+        return Sampler, GetResult
     
     # Sets the default channel to use
     # Channel (int): The channel to set
@@ -298,6 +353,15 @@ class swabianTimeTagger(c.external):
     # Level (float): The voltage level for the trigger
     def _setTriggerLevel(self, Channel, Level):
         self._device.setTriggerLevel(Channel, Level)
+        self._clockRates.clear()
+
+    # Sets the trigger level of several channels with a single call through the queue
+    # Levels (dict): The voltage level for the trigger with the channel as the key
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setTriggerLevels(self, Levels, **kwargs):
+        with self.batch(**kwargs):
+            for Channel, Level in Levels.items():
+                self.setTriggerLevel(Channel, Level)
 
     # Gets the trigger level of a channel
     # Channel (int): The channel to get it from
@@ -332,6 +396,14 @@ class swabianTimeTagger(c.external):
         else:
             self._triggerMode[Channel - 1] = -1
 
+    # Sets the trigger mode of several channels with a single call through the queue
+    # Modes (dict): The mode of each channel with the channel as the key, either "rising" or "falling"
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setTriggerModes(self, Modes, **kwargs):
+        with self.batch(**kwargs):
+            for Channel, Mode in Modes.items():
+                self.setTriggerMode(Channel, Mode)
+
     # Gets the trigger mode for a channel
     # Channel (int): The channel to get the trigger mode for
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
@@ -359,6 +431,15 @@ class swabianTimeTagger(c.external):
     # DeadTime (float): The dead time in nano seconds
     def _setDeadTime(self, Channel, DeadTime):
         self._device.setDeadtime(Channel, int(round(float(DeadTime) * 1e3)))
+        self._clockRates.clear()
+
+    # Sets the dead time of several channels with a single call through the queue
+    # DeadTimes (dict): The dead time in nano seconds with the channel as the key
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setDeadTimes(self, DeadTimes, **kwargs):
+        with self.batch(**kwargs):
+            for Channel, DeadTime in DeadTimes.items():
+                self.setDeadTime(Channel, DeadTime)
     
     # Gets the dead time of a channel
     # Channel (int): The channel to get it from
@@ -384,6 +465,14 @@ class swabianTimeTagger(c.external):
     def _setChannelDelay(self, Channel, Delay):
         self._device.setInputDelay(Channel, int(round(float(Delay) * 1e3)))
 
+    # Sets an artificial delay of several channels with a single call through the queue
+    # Delays (dict): The delay time in nano seconds with the channel as the key
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setChannelDelays(self, Delays, **kwargs):
+        with self.batch(**kwargs):
+            for Channel, Delay in Delays.items():
+                self.setChannelDelay(Channel, Delay)
+
     # Gets the delay of a channel
     # Channel (int): The channel to get it from
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
@@ -433,6 +522,23 @@ class swabianTimeTagger(c.external):
     # Gates (list of 2-tuple of int): List of gates where each gate defines the start and end time of data aquisition
     # ClockRate (float): The clock rate for the histogram, if not given then it will calculate it itself
     def _getHistogram(self, ClockChannel = None, Channel = None, IntegrationTime = None, Gates = None, ClockRate = None):
+        if IntegrationTime is None:
+            IntegrationTime = self._intTime
+            
+        Sampler, GetResult = self._createHistogram(self._device, ClockChannel = ClockChannel, Channel = Channel, Gates = Gates, ClockRate = ClockRate)
+        
+        # Start the sampler
+        self._sample(Sampler, IntegrationTime)
+        
+        return GetResult()
+    
+    # Creates a histogram, returns (Sampler, GetResult) where GetResult is a function returning (Bins, Times) when the sampler is done
+    # Tagger (TimeTagger): The time tagger to create it on
+    # ClockChannel (int): The channel to use for the clock
+    # Channel (int): The channel to get data from
+    # Gates (list of 2-tuple of int): List of gates where each gate defines the start and end time of data aquisition
+    # ClockRate (float): The clock rate for the histogram, if not given then it will calculate it itself
+    def _createHistogram(self, Tagger, ClockChannel = None, Channel = None, Gates = None, ClockRate = None):
         import numpy as np
         
         if ClockChannel is None:
@@ -441,42 +547,30 @@ class swabianTimeTagger(c.external):
         if Channel is None:
             Channel = self._channel
             
-        if IntegrationTime is None:
-            IntegrationTime = self._intTime
-            
         if Gates is None:
             Gates = self._gates
             
-        # Get the count rate
-        if ClockRate is None:
-            ClockRate = self._getClockRate(ClockChannel = ClockChannel)
-        
         ClockChannel *= self._triggerMode[ClockChannel - 1]
         Channel *= self._triggerMode[Channel - 1]
         
-        Duration = 1 / ClockRate
-        BinCount = int(1e12 * Duration / self._binWidth)
+        BinCount, Times, GateIndex = self._getHistogramGeometry(ClockChannel, Channel, Gates, ClockRate)
 
-        Sampler = self._TT.Histogram(self._device, Channel, ClockChannel, self._binWidth, BinCount)
+        Sampler = self._TT.Histogram(Tagger, Channel, ClockChannel, self._binWidth, BinCount)
     
-        # Start the sampler
-        self._sample(Sampler, IntegrationTime)
-        
-        Bins = np.array(Sampler.getData(), dtype = int)
-        Times = np.array(Sampler.getIndex() * 1e-3, dtype = float)
-
-        # Gate the data
-        if len(Gates) > 0:
-            NewBins = np.zeros(BinCount)
+        def GetResult():
+            Bins = np.array(Sampler.getData(), dtype = int)
     
-            for Gate in Gates:
-                Mask = (Times >= Gate[0]) & (Times <= Gate[1])
-                NewBins[Mask] = Bins[Mask]
-                
-        else:
-            NewBins = Bins
+            # Gate the data
+            if GateIndex is not None:
+                NewBins = np.zeros(BinCount)
+                NewBins[GateIndex] = Bins[GateIndex]
+                    
+            else:
+                NewBins = Bins
+            
+            return NewBins, Times.copy()
         
-        return NewBins, Times
+        return Sampler, GetResult
     
     # Gets the histogram bins times
     # ClockChannel (int): The channel to use for the clock
@@ -489,27 +583,98 @@ class swabianTimeTagger(c.external):
     # ClockChannel (int): The channel to use for the clock
     # ClockRate (float): The clock rate for the histogram, if not given then it will calculate it itself
     def _getHistogramBins(self, ClockChannel = None, ClockRate = None):
-        import numpy as np
-        
         if ClockChannel is None:
             ClockChannel = self._clockChannel
             
-        ClockChannel = self._triggerMode[ClockChannel - 1]
+        ClockChannel *= self._triggerMode[ClockChannel - 1]
+        Channel = self._channel * self._triggerMode[self._channel - 1]
+        
+        _, Times, _ = self._getHistogramGeometry(ClockChannel, Channel, [], ClockRate)
+        
+        return Times.copy()
+    
+    # Gets the number of bins, the bin times and the indices of the bins within the gates of a histogram, the result and the measured clock rate are cached
+    # ClockChannel (int): The signed channel to use for the clock
+    # Channel (int): The signed channel to get data from
+    # Gates (list of 2-tuple of float): List of gates of (StartTime, EndTime) in nano seconds
+    # ClockRate (float): The clock rate for the histogram, if None it will use the cached clock rate or measure it
+    def _getHistogramGeometry(self, ClockChannel, Channel, Gates, ClockRate = None):
+        import time
+        import numpy as np
+        
+        # Get the clock rate
+        if ClockRate is None:
+            CachedRate = self._clockRates.get(ClockChannel, None)
             
-        Channel = self._channel
+            if CachedRate is not None and time.time() - CachedRate[1] < self._clockRateTTL:
+                ClockRate = CachedRate[0]
+                
+            else:
+                ClockRate = self._getClockRate(ClockChannel = abs(ClockChannel))
+                self._clockRates[ClockChannel] = (ClockRate, time.time())
+        
+        BinCount = int(1e12 / ClockRate / self._binWidth)
+        Gates = tuple((float(Gate[0]), float(Gate[1])) for Gate in Gates)
+        Key = (ClockChannel, Channel, self._binWidth, Gates)
+        
+        # The clock rate may have changed since it was cached
+        Geometry = self._histogramCache.get(Key, None)
+        
+        if Geometry is None or Geometry[0] != BinCount:
+            Times = np.arange(BinCount) * self._binWidth * 1e-3
+            GateIndex = None
             
-        # Get the count rate
-        if ClockRate is None:
-            ClockRate = self._getClockRate(ClockChannel = ClockChannel)
+            if len(Gates) > 0:
+                Mask = np.zeros(BinCount, dtype = bool)
+                
+                for Gate in Gates:
+                    Mask |= (Times >= Gate[0]) & (Times <= Gate[1])
+                    
+                GateIndex = np.nonzero(Mask)[0]
+            
+            # Remove the oldest geometry when full
+            self._histogramCache.pop(Key, None)
+            
+            if len(self._histogramCache) >= self._histogramCacheSize:
+                del self._histogramCache[next(iter(self._histogramCache))]
+                
+            Geometry = (BinCount, Times, GateIndex)
+            self._histogramCache[Key] = Geometry
+            
+        return Geometry
+    
+    # Sets the time a measured clock rate is reused for histograms
+    # TTL (float): The time in seconds, 0 to always measure it
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def setClockRateTTL(self, TTL, **kwargs):
+        self.runFunction("_setClockRateTTL", Args = (TTL,), **kwargs)
         
-        Duration = 1 / ClockRate
-        BinCount = int(1e12 * Duration / self._binWidth)
+    # Sets the time a measured clock rate is reused for histograms
+    # TTL (float): The time in seconds, 0 to always measure it
+    def _setClockRateTTL(self, TTL):
+        if float(TTL) < 0:
+            raise e.MinValueError("TTL", TTL, 0)
+            
+        self._clockRateTTL = float(TTL)
         
-        Sampler = self._TT.Histogram(self._device, ClockChannel, Channel, self._binWidth, BinCount)
+    # Gets the time a measured clock rate is reused for histograms
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def getClockRateTTL(self, **kwargs):
+        return self.runFunction("_getClockRateTTL", **kwargs)
+    
+    # Gets the time a measured clock rate is reused for histograms
+    def _getClockRateTTL(self):
+        return self._clockRateTTL
     
-        Times = np.array(Sampler.getIndex() * 1e-3)
+    # Clears the cached clock rates and histogram geometries, use this if the clock has changed
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def clearHistogramCache(self, **kwargs):
+        self.runFunction("_clearHistogramCache", **kwargs)
         
-        return Times
+    # Clears the cached clock rates and histogram geometries
+    def _clearHistogramCache(self):
+        self._clockRates.clear()
+        self._histogramCache.clear()
 
     # Gets the correlation between 2 channels, set them equal for autocorrelations
     # ChannelStart (int): The channel for which start clicks are detected, if None it will use the default channel
@@ -526,6 +691,22 @@ class swabianTimeTagger(c.external):
     # BinCount (int): The number of bins to use in the correlations, if None it will use the default bin count
     # IntegrationTime (float): The time to run the experiment for in seconds, if None use the default integration time
     def _getCorrelations(self, ChannelStart = None, ChannelStop = None, BinCount = None, IntegrationTime = None):
+        if IntegrationTime is None:
+            IntegrationTime = self._intTime
+            
+        Sampler, GetResult = self._createCorrelations(self._device, ChannelStart = ChannelStart, ChannelStop = ChannelStop, BinCount = BinCount)
+        
+        # Start the experiment
+        self._sample(Sampler, IntegrationTime)
+        
+        return GetResult()
+    
+    # Creates a correlation, returns (Sampler, GetResult) where GetResult is a function returning (Counts, NormCounts, Delays) when the sampler is done
+    # Tagger (TimeTagger): The time tagger to create it on
+    # ChannelStart (int): The channel for which start clicks are detected, if None it will use the default channel
+    # ChannelStop (int): The channel for which stop clicks are detected, if None it will use the default channel
+    # BinCount (int): The number of bins to use in the correlations, if None it will use the default bin count
+    def _createCorrelations(self, Tagger, ChannelStart = None, ChannelStop = None, BinCount = None):
         import numpy as np
         
         # Get the correct parameters
@@ -538,23 +719,86 @@ class swabianTimeTagger(c.external):
         if BinCount is None:
             BinCount = self._binCount
             
-        if IntegrationTime is None:
-            IntegrationTime = self._intTime
-            
         ChannelStart *= self._triggerMode[ChannelStart - 1]
         ChannelStop *= self._triggerMode[ChannelStop - 1]
             
-        # Start the experiment
-        Sampler = self._TT.Correlation(self._device, ChannelStop, ChannelStart, self._binWidth, BinCount)
-        self._sample(Sampler, IntegrationTime)
+        Sampler = self._TT.Correlation(Tagger, ChannelStop, ChannelStart, self._binWidth, BinCount)
         
         # Get the data
-        Counts = np.array(Sampler.getData(), dtype = int)
-        NormCounts = np.array(Sampler.getDataNormalized(), dtype = float)
-        Delays = np.array(Sampler.getIndex(), dtype = float) * 1e-3
+        def GetResult():
+            Counts = np.array(Sampler.getData(), dtype = int)
+            NormCounts = np.array(Sampler.getDataNormalized(), dtype = float)
+            Delays = np.array(Sampler.getIndex(), dtype = float) * 1e-3
+            
+            return Counts, NormCounts, Delays
         
-        return Counts, NormCounts, Delays
+        return Sampler, GetResult
 
+    # Runs several measurements at the same time and waits for them to finish, returns a list of the results in the same order as the measurements
+    # Measurements (list of 2-tuple of str, dict): Each measurement is (Type, Kwargs) where Type is "count", "histogram", "gatedCount" or "correlations" and Kwargs are the kwargs for the matching get method without IntegrationTime, a Type without a tuple uses the default kwargs
+    # IntegrationTime (float): The integration time in seconds, if None it will use the default
+    # UseQueue (bool): Whether to run the commands through the queue or not, ignored if the device was initialized with UseQueue = False
+    def measureMany(self, Measurements, IntegrationTime = None, **kwargs):
+        return self.startMeasurements(Measurements, IntegrationTime = IntegrationTime, **kwargs).collect(**kwargs)
+    
+    # Starts several measurements at the same time without waiting for them to finish, returns a swabianMeasurements handle whose collect method waits for them and returns the results
+    # Measurements (list of 2-tuple of str, dict): Each measurement is (Type, Kwargs) where Type is "count", "histogram", "gatedCount" or "correlations" and Kwargs are the kwargs for the matching get method without IntegrationTime, a Type without a tuple uses the default kwargs
+    # IntegrationTime (float): The integration time in seconds, if None it will use the default
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def startMeasurements(self, Measurements, IntegrationTime = None, **kwargs):
+        return self.runFunction("_startMeasurements", Args = (Measurements,), Kwargs = {"IntegrationTime": IntegrationTime}, **kwargs)
+    
+    # Starts several measurements at the same time without waiting for them to finish
+    # Measurements (list of 2-tuple of str, dict): Each measurement is (Type, Kwargs) where Type is "count", "histogram", "gatedCount" or "correlations" and Kwargs are the kwargs for the matching get method without IntegrationTime, a Type without a tuple uses the default kwargs
+    # IntegrationTime (float): The integration time in seconds, if None it will use the default
+    def _startMeasurements(self, Measurements, IntegrationTime = None):
+        import time
+        
+        if IntegrationTime is None:
+            IntegrationTime = self._intTime
+            
+        IntegrationTime = float(IntegrationTime)
+        CreateFunctions = {"count": self._createCount, "histogram": self._createHistogram, "gatedCount": self._createGatedCount, "correlations": self._createCorrelations}
+            
+        # Create all of the measurements in a group such that they start together
+        Group = self._TT.SynchronizedMeasurements(self._device)
+        Tagger = Group.getTagger()
+        Results = []
+        
+        for Measurement in Measurements:
+            if isinstance(Measurement, str):
+                Measurement = (Measurement, dict())
+                
+            Type, Kwargs = Measurement
+            
+            if not Type in CreateFunctions:
+                raise e.KeywordError("Type", Type, list(CreateFunctions.keys()))
+            
+            Kwargs = dict(Kwargs)
+            
+            if Type == "count":
+                Kwargs["IntegrationTime"] = IntegrationTime
+                
+            _, GetResult = CreateFunctions[Type](Tagger, **Kwargs)
+            Results.append(GetResult)
+            
+        Group.startFor(int(IntegrationTime * 1e12))
+        
+        return swabianMeasurements(self, Group, Results, IntegrationTime, time.time() + IntegrationTime)
+        
+    # Checks if a group of measurements is still running
+    # Group (TimeTagger.SynchronizedMeasurements): The group to check
+    def _isGroupRunning(self, Group):
+        return Group.isRunning()
+    
+    # Gets the results of a group of measurements which is done
+    # Results (list of func): The functions returning the result of each measurement
+    def _collectMeasurements(self, Results):
+        # Check for overflows
+        self._checkOverflows()
+        
+        return [GetResult() for GetResult in Results]
+    
     # Initialize a stream to gather data through
     # MaxSize (int): The maximum allowed number of events within the stream
     # Channels (list of int): A list of all the channels to get data from, leave empty for all channels
@@ -627,3 +871,189 @@ class swabianTimeTagger(c.external):
             raise e.OverflowError(self.deviceName, self)
         
         return Timestamps, Channels
+        
+    # Starts a continuous stream where a background thread keeps reading the time tags into a buffer of chunks which can be read with iterStream, this allows for measurements of any length, an old continuous stream is stopped first
+    # Channels (list of int): A list of all the channels to get data from, leave empty for all channels
+    # IntegrationTime (float): The integration time in seconds, None to run until stopContinuousStream is called
+    # MaxSize (int): The maximum allowed number of events within the stream between two reads
+    # MaxChunks (int): The maximum number of chunks to keep in the buffer, when it is full the oldest chunk is dropped
+    # ReadInterval (float): The time in seconds between each read of the stream
+    # UseQueue (bool): Whether to run the commands through the queue or not, ignored if the device was initialized with UseQueue = False
+    def startContinuousStream(self, Channels = [], IntegrationTime = None, MaxSize = 1000000, MaxChunks = 1000, ReadInterval = 0.01, **kwargs):
+        import threading as th
+        
+        if int(MaxChunks) < 1:
+            raise e.MinValueError("MaxChunks", MaxChunks, 1)
+        
+        self.stopContinuousStream()
+        
+        # Reset the buffer
+        with self._chunkCond:
+            self._chunks.clear()
+            self._maxChunks = int(MaxChunks)
+            self._streamStats = {"Events": 0, "Chunks": 0, "DroppedEvents": 0, "DroppedChunks": 0, "Overflows": 0}
+            
+        self.runFunction("_startContinuousStream", Kwargs = {"Channels": Channels, "IntegrationTime": IntegrationTime, "MaxSize": MaxSize}, **kwargs)
+        
+        # Start reading
+        self._streaming = True
+        self._streamStop.clear()
+        self._streamThread = th.Thread(target = self._runContinuousStream, args = (float(ReadInterval), kwargs), daemon = True)
+        self._streamThread.start()
+        
+    # Creates and starts the continuous stream
+    # Channels (list of int): A list of all the channels to get data from, leave empty for all channels
+    # IntegrationTime (float): The integration time in seconds, None to run until it is stopped
+    # MaxSize (int): The maximum allowed number of events within the stream between two reads
+    def _startContinuousStream(self, Channels = [], IntegrationTime = None, MaxSize = 1000000):
+        Channels = [Channel * self._triggerMode[Channel - 1] for Channel in Channels]
+        
+        self._continuousStream = self._TT.TimeTagStream(self._device, int(MaxSize), Channels)
+        
+        if IntegrationTime is None:
+            self._continuousStream.start()
+            
+        else:
+            self._continuousStream.startFor(int(float(IntegrationTime) * 1e12))
+            
+    # Keeps reading the continuous stream until it is stopped or finished, runs on its own thread
+    # ReadInterval (float): The time in seconds between each read of the stream
+    # Kwargs (dict): The kwargs for runFunction
+    def _runContinuousStream(self, ReadInterval, Kwargs):
+        Running = True
+        
+        while Running:
+            Stop = self._streamStop.wait(ReadInterval)
+            
+            try:
+                Timestamps, Channels, Overflow, Running = self.runFunction("_readContinuousStream", Kwargs = {"Stop": Stop}, **Kwargs)
+                
+            except Exception as m:
+                print(f"An error occured while reading the continuous stream from {self.deviceName}: {m}")
+                break
+                
+            self._addChunk(Timestamps, Channels, Overflow)
+            
+            if Stop:
+                break
+                
+        # Wake up anyone waiting for chunks
+        with self._chunkCond:
+            self._streaming = False
+            self._chunkCond.notify_all()
+            
+    # Reads all of the new time tags from the continuous stream, returns (Timestamps, Channels, Overflow, Running)
+    # Stop (bool): If True then the stream is stopped before reading the last time tags
+    def _readContinuousStream(self, Stop = False):
+        import numpy as np
+        
+        if Stop:
+            self._continuousStream.stop()
+            
+        Data = self._continuousStream.getData()
+        Timestamps = np.asarray(Data.getTimestamps(), dtype = np.int64)
+        Channels = np.asarray(Data.getChannels(), dtype = int)
+        
+        return Timestamps, Channels, Data.hasOverflows(), self._continuousStream.isRunning()
+    
+    # Adds a chunk to the buffer and drops the oldest chunk if it is full
+    # Timestamps (numpy.ndarray of int64): The time stamps in ps
+    # Channels (numpy.ndarray of int): The channel of each time stamp
+    # Overflow (bool): True if the stream overflowed since the last read
+    def _addChunk(self, Timestamps, Channels, Overflow):
+        with self._chunkCond:
+            if Overflow:
+                self._streamStats["Overflows"] += 1
+                print(f"{self.deviceName} had overflows in the continuous stream")
+                
+            if len(Timestamps) == 0:
+                return
+            
+            if len(self._chunks) >= self._maxChunks:
+                OldTimestamps, _ = self._chunks.popleft()
+                self._streamStats["DroppedChunks"] += 1
+                self._streamStats["DroppedEvents"] += len(OldTimestamps)
+                
+            self._chunks.append((Timestamps, Channels))
+            self._streamStats["Chunks"] += 1
+            self._streamStats["Events"] += len(Timestamps)
+            self._chunkCond.notify_all()
+            
+    # Stops the continuous stream and waits for the last time tags to be read into the buffer, the chunks in the buffer can still be read with iterStream
+    def stopContinuousStream(self):
+        if self._streamThread is None:
+            return
+        
+        self._streamStop.set()
+        self._streamThread.join()
+        self._streamThread = None
+        
+    # Checks if the continuous stream is still being read
+    def isStreaming(self):
+        return self._streaming
+    
+    # Iterates over the chunks from the continuous stream as they arrive until the stream has stopped and the buffer is empty, each chunk is (Timestamps, Channels) where Timestamps is a numpy array of int64 time stamps in ps and Channels is a numpy array with the channel of each time stamp
+    # Timeout (float): The maximum time in seconds to wait for a new chunk, None to wait forever
+    def iterStream(self, Timeout = None):
+        while True:
+            with self._chunkCond:
+                if not self._chunkCond.wait_for(lambda: len(self._chunks) > 0 or not self._streaming, Timeout):
+                    raise e.TimeoutError(self.deviceName, self)
+                
+                if len(self._chunks) == 0:
+                    return
+                
+                Chunk = self._chunks.popleft()
+                
+            yield Chunk
+            
+    # Gets the statistics of the continuous stream, returns a dict with Events and Chunks which are the number of events and chunks read, DroppedEvents and DroppedChunks which are the number dropped because the buffer was full, Overflows which is the number of reads with overflows and BufferedChunks which is the number of chunks in the buffer
+    def getStreamStats(self):
+        with self._chunkCond:
+            Stats = self._streamStats.copy()
+            Stats["BufferedChunks"] = len(self._chunks)
+            
+        return Stats
+
+
+# A group of measurements on a time tagger running at the same time, the queue of the time tagger is not blocked while they run
+class swabianMeasurements:
+    # Device (swabianTimeTagger): The time tagger running the measurements
+    # Group (TimeTagger.SynchronizedMeasurements): The group of measurements
+    # Results (list of func): The functions returning the result of each measurement
+    # IntegrationTime (float): The integration time in seconds
+    # EndTime (float): The time from time.time() when the measurements should be done
+    def __init__(self, Device, Group, Results, IntegrationTime, EndTime, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        self._device = Device
+        self._group = Group
+        self._results = Results
+        self._intTime = float(IntegrationTime)
+        self._endTime = float(EndTime)
+        
+    # Checks if the measurements are still running
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def isRunning(self, **kwargs):
+        return self._device.runFunction("_isGroupRunning", Args = (self._group,), **kwargs)
+    
+    # Waits for the measurements to finish and returns a list of the results in the same order as the measurements were given
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def collect(self, **kwargs):
+        import time
+        from .. import functions as f
+        
+        # Wait outside of the queue
+        f.time.sleep(self._endTime - time.time())
+        
+        Finished = False
+        for _ in range(int(self._intTime * 100) + 1):
+            if not self.isRunning(**kwargs):
+                Finished = True
+                break
+            f.time.sleep(0.01)
+            
+        if not Finished:
+            raise e.FinishMeasurementError(self._device.deviceName, self._device)
+            
+        return self._device.runFunction("_collectMeasurements", Args = (self._results,), **kwargs)
@@ -662,16 +662,18 @@ class timeBandit(c.serial):
     # Resend all settings, useful for when FPGA lost power
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     def sendSettings(self, **kwargs):
-        # self.resync(**kwargs)
-        self.setSequenceLength(self._sequenceLength, **kwargs)
-        self.setIntegrationTime(self._intTime, **kwargs)
-        
-        # Update the channels
-        for CH in self.CH:
-            CH.update(**kwargs)
-        
-        # Update the clock
-        self.updateOutputClock(**kwargs)
+        # Send all of the memory updates together
+        with self.batch(**kwargs):
+            # self.resync(**kwargs)
+            self.setSequenceLength(self._sequenceLength, **kwargs)
+            self.setIntegrationTime(self._intTime, **kwargs)
+            
+            # Update the channels
+            for CH in self.CH:
+                CH.update(**kwargs)
+            
+            # Update the clock
+            self.updateOutputClock(**kwargs)
             
     # Sets the output clock level
     # Level (str): Either off, safe_on or always_on
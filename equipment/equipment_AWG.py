@@ -27,8 +27,8 @@ class AWG(device):
         Labels = [f"CH {i + 1}" for i in range(ChannelCount)]
         Shapes = ["-"] * ChannelCount
         
-        self._plotAmplitude = pl.renewPlot(1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "AWG sequence amplitude", xLabels = "Time (ns)", yLabels = "Amplitude")
-        self._plotPhase = pl.renewPlot(1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "AWG sequence phase", xLabels = "Time (ns)", yLabels = "Phase")
+        self._plotAmplitude = pl.newPlot("renewPlot", 1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "AWG sequence amplitude", xLabels = "Time (ns)", yLabels = "Amplitude")
+        self._plotPhase = pl.newPlot("renewPlot", 1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "AWG sequence phase", xLabels = "Time (ns)", yLabels = "Phase")
         
     def _close(self):
         self._plotAmplitude.close()
@@ -20,6 +20,11 @@ class device:
     # Returns True if it is open
     def isOpen(self):
         return self._isOpen
+    
+    # Gets the objects which the equipment talks to, used to find which settings can be applied at the same time, must be overwritten by sub classes wrapping other devices
+    # Returns a list of objects including the equipment itself
+    def getDevices(self):
+        return [self]
         
     # Close the device, the method _close must be overwritten by the device
     def close(self):
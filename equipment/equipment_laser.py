@@ -63,7 +63,7 @@ class laser(device):
         
         # Make sure it is locking
         if not self.isLocking():
-            raise e.MethodError("Laser", self, "setLockFrequencyPersistent")
+            raise e.MethodError("Laser", self, "setLockFrequencyPersistent", Require = "locking")
             
         self.setLockFrequency(Value)
         
@@ -235,6 +235,11 @@ class laser(device):
             # Overwrite it
             self._lockTimer = None
             
+    # Gets the objects which the laser talks to
+    # Returns a list of the laser equipment, the laser controller and the wavemeter
+    def getDevices(self):
+        return [self, self.laser, self.wm]
+            
     def _close(self):
         self.unlock()
         
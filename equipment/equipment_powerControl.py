@@ -230,3 +230,13 @@ class powerControl(device):
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     def getPowerRange(self, **kwargs):
         return self.powermeter.getPowerRange(**kwargs)
+    
+    # Gets the objects which the power control talks to
+    # Returns a list of the power control, the PID, the powermeter and the FPGA of the time bandit channel if it is used
+    def getDevices(self):
+        Devices = [self, self.PID, self.powermeter]
+        
+        if self.timeBanditChannel is not None:
+            Devices.append(self.timeBanditChannel.FPGA)
+            
+        return Devices
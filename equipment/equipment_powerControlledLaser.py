@@ -22,4 +22,9 @@ class powerControlledLaser(device):
         
         # Save the laser and power control
         self.laser = Laser
-        self.power = PowerControl
\ No newline at end of file
+        self.power = PowerControl
+        
+    # Gets the objects which the laser and the power control talk to
+    # Returns a list of the power controlled laser and the devices from the laser and the power control
+    def getDevices(self):
+        return [self] + self.laser.getDevices() + self.power.getDevices()
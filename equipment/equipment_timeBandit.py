@@ -27,7 +27,7 @@ class timeBandit(device):
         Labels = [f"CH {i + 1}" for i in range(ChannelCount)]
         Shapes = ["-"] * ChannelCount
         
-        self._plot = pl.renewPlot(1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "TimeBandit sequence", xLabels = "Time (ns)", yLabels = "Voltage")
+        self._plot = pl.newPlot("renewPlot", 1, Shapes, Labels = Labels, Figsize = Figsize, Titles = "TimeBandit sequence", xLabels = "Time (ns)", yLabels = "Voltage")
         
     def _close(self):
         self._plot.close()
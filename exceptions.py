@@ -321,10 +321,12 @@ class MethodError(Exception):
     # DeviceName (str): The name of the device to display in the error message
     # Device (device): The device which has illigal method 
     # MethodName (str): The name of the illigal method     
-    def __init__(self, DeviceName, Device, MethodName):
+    # Require (str): What the device must be to use the method
+    def __init__(self, DeviceName, Device, MethodName, Require = "ready"):
         self.device = Device
         self.deviceName = str(DeviceName)
         self.method = str(MethodName)
+        self.require = str(Require)
         self.message = f"{self.deviceName} must be {self.require} to use {self.method}"
         
         super().__init__(self.message)
@@ -420,4 +422,13 @@ class QueueError(Exception):
     def __init__(self):
         self.message = "The queue is full"
         
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+        
+# Used when settings depend on each other such that they cannot be applied
+class DependencyError(Exception):
+    # Keys (list of str): The keys of the settings which could not be applied
+    def __init__(self, Keys):
+        self.keys = [str(Key) for Key in Keys]
+        self.message = f"Unable to apply the settings {', '.join(self.keys)} because they depend on each other"
+        
+        super().__init__(self.message)
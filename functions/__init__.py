@@ -2,4 +2,5 @@ from . import functions_responseCheck as responseCheck
 from . import functions_socket as socket
 from . import functions_settingHandlers as settingHandlers
 from . import functions_settingFinalizers as settingFinalizers
-from . import functions_time as time
\ No newline at end of file
+from . import functions_time as time
+from . import functions_timeTags as timeTags
\ No newline at end of file
@@ -299,6 +299,13 @@ def socketClient(BaseResponseCheck):
         if len(ReturnString) == 0:
             return "Did not receive a return strings"
         
+        # Arrays from binary frames are only sent on success
+        if not isinstance(ReturnString[0], str):
+            if BaseResponseCheck is None:
+                return None
+            
+            return BaseResponseCheck(Class, Command, [ReturnString[0]])
+        
         # Split
         SplitString = ReturnString[0].split("|")
         
@@ -1,5 +1,22 @@
 from .. import exceptions as e
 
+# Makes sure every key of the overwrites and pauses belongs to a setting of the handler
+# Overwrites (dict of list of str): A dict containing the lists of overwrites for each handler
+# Pause (dict of floats): A dict containing the time to pause after setting each parameter
+# Valid (list of str): The keys of the settings
+def _checkKeys(Overwrites, Pause, Valid):
+    for KeyName, Dict in [("Overwrites", Overwrites), ("Pause", Pause)]:
+        for Key in Dict:
+            if Key not in Valid:
+                raise e.KeywordError(KeyName, Key, Valid)
+
+# Gets the overwrites or pauses given for single channels of a channel setting, like "CH1.triggerLevel"
+# Dict (dict): The overwrites or pauses
+# Key (str): The key of the setting with "{}" in place of the channel, like "CH{}.triggerLevel"
+# Channels (list of str): The channels of the setting
+def _channelValues(Dict, Key, Channels):
+    return dict([(Channel, Dict[Key.format(Channel)]) for Channel in Channels if Key.format(Channel) in Dict])
+
 # Creates a setting handler for a keithly
 # Keithly (controllers.keithly): The keithly device to control
 # Name (str): The name in from of each setting
@@ -16,16 +33,16 @@ def keithly(Keithly, Name = "", Overwrites = dict(), Pause = dict()):
     Handler = lab.settingHandler()
     
     # Set current limit
-    Handler[f"{Name}currentLimit"] = lab.handle(f"{Name}currentLimit", Keithly.setCurrentLim, Overwrites = Overwrites.get("currentLimit", []), Pause = Pause.get("currentLimit", 0))
+    Handler[f"{Name}currentLimit"] = lab.handle(f"{Name}currentLimit", Keithly.setCurrentLim, Overwrites = Overwrites.get("currentLimit", []), Pause = Pause.get("currentLimit", 0), Devices = [Keithly])
     
     # Set current range
-    Handler[f"{Name}currentRange"] = lab.handle(f"{Name}currentRange", Keithly.setCurrentRange, Overwrites = Overwrites.get("currentRange", []), Pause = Pause.get("currentRange", 0))
+    Handler[f"{Name}currentRange"] = lab.handle(f"{Name}currentRange", Keithly.setCurrentRange, Overwrites = Overwrites.get("currentRange", []), Pause = Pause.get("currentRange", 0), Devices = [Keithly])
     
     # Set voltage limit
-    Handler[f"{Name}voltageLimit"] = lab.handle(f"{Name}voltageLimit", Keithly.setVoltageLim, Overwrites = Overwrites.get("voltageLimit", []), Pause = Pause.get("voltageLimit", 0))
+    Handler[f"{Name}voltageLimit"] = lab.handle(f"{Name}voltageLimit", Keithly.setVoltageLim, Overwrites = Overwrites.get("voltageLimit", []), Pause = Pause.get("voltageLimit", 0), Devices = [Keithly])
     
     # Set voltage
-    Handler[f"{Name}voltage"] = lab.handle(f"{Name}voltage", Keithly.setVoltage, Overwrites = Overwrites.get("voltage", []), Pause = Pause.get("voltage", 0))
+    Handler[f"{Name}voltage"] = lab.handle(f"{Name}voltage", Keithly.setVoltage, Overwrites = Overwrites.get("voltage", []), Pause = Pause.get("voltage", 0), Devices = [Keithly])
     
     return Handler
     
@@ -51,7 +68,7 @@ def laser(Laser, Lockable = True, Name = "", Overwrites = dict(), Pause = dict()
         Laser.setLaserFrequency(Value, **kwargs)
         Laser.setLockFrequency(Value)
     
-    Handler[f"{Name}frequency"] = lab.handle(f"{Name}frequency", SetLaserFrequency, Overwrites = Overwrites.get("frequency", []), Pause = Pause.get("frequency", 0))
+    Handler[f"{Name}frequency"] = lab.handle(f"{Name}frequency", SetLaserFrequency, Overwrites = Overwrites.get("frequency", []), Pause = Pause.get("frequency", 0), Devices = [Laser])
     
     # Activate
     def Activate(Value, **kwargs):
@@ -62,7 +79,7 @@ def laser(Laser, Lockable = True, Name = "", Overwrites = dict(), Pause = dict()
             else:
                 Laser.unlock()
             
-    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0))
+    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0), Devices = [Laser])
         
     return Handler
 
@@ -86,7 +103,7 @@ def power(PowerControl, Name = "", Overwrites = dict(), Pause = dict()):
     def SetPower(Value, **kwargs):
         PowerControl.setSetPower(Value)
         
-    Handler[f"{Name}power"] = lab.handle(f"{Name}power", SetPower, Overwrites = Overwrites.get("power", []), Pause = Pause.get("power", 0))
+    Handler[f"{Name}power"] = lab.handle(f"{Name}power", SetPower, Overwrites = Overwrites.get("power", []), Pause = Pause.get("power", 0), Devices = [PowerControl])
     
     # Activate
     def Activate(Value, **kwargs):
@@ -96,7 +113,7 @@ def power(PowerControl, Name = "", Overwrites = dict(), Pause = dict()):
         else:
             PowerControl.unlock(**kwargs)
             
-    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0), Order = 0)
+    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0), Order = 0, Devices = [PowerControl])
     
     return Handler
 
@@ -121,13 +138,13 @@ def PCLaser(Laser, Lockable = True, Name = "", Overwrites = dict(), Pause = dict
     def SetLaserFrequency(Value, **kwargs):
         Laser.laser.setLockFrequency(Value)
             
-    Handler[f"{Name}frequency"] = lab.handle(f"{Name}frequency", SetLaserFrequency, Overwrites = Overwrites.get("frequency", []), Pause = Pause.get("frequency", 0))
+    Handler[f"{Name}frequency"] = lab.handle(f"{Name}frequency", SetLaserFrequency, Overwrites = Overwrites.get("frequency", []), Pause = Pause.get("frequency", 0), Devices = [Laser])
     
     # Power
     def SetPower(Value, **kwargs):
         Laser.power.setSetPower(Value)
         
-    Handler[f"{Name}power"] = lab.handle(f"{Name}power", SetPower, Overwrites = Overwrites.get("power", []), Pause = Pause.get("power", 0))
+    Handler[f"{Name}power"] = lab.handle(f"{Name}power", SetPower, Overwrites = Overwrites.get("power", []), Pause = Pause.get("power", 0), Devices = [Laser])
     
     # Lock
     def Activate(Value, **kwargs):
@@ -141,7 +158,7 @@ def PCLaser(Laser, Lockable = True, Name = "", Overwrites = dict(), Pause = dict
                 Laser.laser.unlock()
             Laser.power.unlock(**kwargs)
             
-    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0), Order = 0)
+    Handler[f"{Name}active"] = lab.handle(f"{Name}active", Activate, Overwrites = Overwrites.get("active", []), Pause = Pause.get("active", 0), Order = 0, Devices = [Laser])
     
     return Handler
     
@@ -165,10 +182,10 @@ def rotationStage(RotationStage, Name = "", Overwrites = dict(), Pause = dict())
     def setZeroPos(Value, **kwargs):
         RotationStage.setZero(Value)
     
-    Handler[f"{Name}zeroPosition"] = lab.handle(f"{Name}zeroPosition", setZeroPos, Overwrites = Overwrites.get("zeroPosition", []), Pause = Pause.get("zeroPosition", 0))
+    Handler[f"{Name}zeroPosition"] = lab.handle(f"{Name}zeroPosition", setZeroPos, Overwrites = Overwrites.get("zeroPosition", []), Pause = Pause.get("zeroPosition", 0), Devices = [RotationStage])
     
     # Position
-    Handler[f"{Name}position"] = lab.handle(f"{Name}position", RotationStage.moveTo, Overwrites = Overwrites.get("position", []), Pause = Pause.get("position", 0))
+    Handler[f"{Name}position"] = lab.handle(f"{Name}position", RotationStage.moveTo, Overwrites = Overwrites.get("position", []), Pause = Pause.get("position", 0), Devices = [RotationStage])
     
     return Handler
   
@@ -177,8 +194,8 @@ def rotationStage(RotationStage, Name = "", Overwrites = dict(), Pause = dict())
 # TimeTagger (controllers.timeTagger): The time tagger to control
 # ChannelCount (int): The number of channels accessable
 # Name (str): The name in from of each setting
-# Overwrites (dict of list of str): A dict containing the lists of overwrites for each handler
-# Pause (dict of floats): A dict containing the time to pause after setting each parameter, defaults to 0
+# Overwrites (dict of list of str): A dict containing the lists of overwrites for each handler, the channel settings use keys like "CH*.triggerLevel" for all channels or "CH1.triggerLevel" for a single channel
+# Pause (dict of floats): A dict containing the time to pause after setting each parameter, defaults to 0, the channel settings use keys like "CH*.triggerLevel" for all channels or "CH1.triggerLevel" for a single channel
 def timeTagger(TimeTagger, ChannelCount, Name = "", Overwrites = dict(), Pause = dict()):
     from .. import lab
     from .. import controllers as c
@@ -186,23 +203,27 @@ def timeTagger(TimeTagger, ChannelCount, Name = "", Overwrites = dict(), Pause =
     if not isinstance(TimeTagger, c.swabianTimeTagger):
         raise e.TypeDefError("TimeTagger", TimeTagger, c.swabianTimeTagger)
     
+    Channels = [str(i) for i in range(1, ChannelCount + 1)]
+    ChannelParameters = ["triggerLevel", "triggerMode", "deadTime", "delay"]
+    _checkKeys(Overwrites, Pause, ["channel", "integrationTime", "clockChannel", "binWidth", "correlationBins", "correlationTime"] + [f"CH{Channel}.{Parameter}" for Parameter in ChannelParameters for Channel in ["*"] + Channels])
+    
     # Set up the handlers
     Handler = lab.settingHandler()
     
     # Default channel
-    Handler[f"{Name}channel"] = lab.handle(f"{Name}channel", TimeTagger.setDefaultChannel, Overwrites = Overwrites.get("channel", []), Pause = Pause.get("channel", 0))
+    Handler[f"{Name}channel"] = lab.handle(f"{Name}channel", TimeTagger.setDefaultChannel, Overwrites = Overwrites.get("channel", []), Pause = Pause.get("channel", 0), Devices = [TimeTagger])
     
     # Default integration time
-    Handler[f"{Name}integrationTime"] = lab.handle(f"{Name}integrationTime", TimeTagger.setDefaultIntegrationTime, Overwrites = Overwrites.get("integrationTime", []), Pause = Pause.get("integrationTime", 0))
+    Handler[f"{Name}integrationTime"] = lab.handle(f"{Name}integrationTime", TimeTagger.setDefaultIntegrationTime, Overwrites = Overwrites.get("integrationTime", []), Pause = Pause.get("integrationTime", 0), Devices = [TimeTagger])
     
     # Clock channel
-    Handler[f"{Name}clockChannel"] = lab.handle(f"{Name}clockChannel", TimeTagger.setClockChannel, Overwrites = Overwrites.get("clockChannel", []), Pause = Pause.get("clockChannel", 0))
+    Handler[f"{Name}clockChannel"] = lab.handle(f"{Name}clockChannel", TimeTagger.setClockChannel, Overwrites = Overwrites.get("clockChannel", []), Pause = Pause.get("clockChannel", 0), Devices = [TimeTagger])
     
     # Bin width
-    Handler[f"{Name}binWidth"] = lab.handle(f"{Name}binWidth", TimeTagger.setBinWidth, Overwrites = Overwrites.get("binWidth", []), Pause = Pause.get("binWidth", 0))    
+    Handler[f"{Name}binWidth"] = lab.handle(f"{Name}binWidth", TimeTagger.setBinWidth, Overwrites = Overwrites.get("binWidth", []), Pause = Pause.get("binWidth", 0), Devices = [TimeTagger])    
     
     # Correlation bins
-    Handler[f"{Name}correlationBins"] = lab.handle(f"{Name}correlationBins", TimeTagger.setDefaultCorrelationBins, Overwrites = Overwrites.get("correlationBins", []) + [f"{Name}correlationTime"], Pause = Pause.get("correlationBins", 0))    
+    Handler[f"{Name}correlationBins"] = lab.handle(f"{Name}correlationBins", TimeTagger.setDefaultCorrelationBins, Overwrites = Overwrites.get("correlationBins", []) + [f"{Name}correlationTime"], Pause = Pause.get("correlationBins", 0), Devices = [TimeTagger])    
     
     # Correlation time
     def SetCorrelationTime(Value, **kwargs):
@@ -212,41 +233,25 @@ def timeTagger(TimeTagger, ChannelCount, Name = "", Overwrites = dict(), Pause =
         # Set the correlation bins
         TimeTagger.setDefaultCorrelationBins(float(Value) / BinWidth, **kwargs)
     
-    Handler[f"{Name}correlationTime"] = lab.handle(f"{Name}correlationTime", SetCorrelationTime, Overwrites = Overwrites.get("correlationTime", []) + [f"{Name}correlationBins"], Pause = Pause.get("correlationTime", 0))    
+    Handler[f"{Name}correlationTime"] = lab.handle(f"{Name}correlationTime", SetCorrelationTime, Overwrites = Overwrites.get("correlationTime", []) + [f"{Name}correlationBins"], Pause = Pause.get("correlationTime", 0), Devices = [TimeTagger])    
     
-    # The channels
-    for i in range(1, ChannelCount + 1):
-        # Trigger level
-        def setTriggerLevel(Channel):
-            def function(Value, **kwargs):
-                TimeTagger.setTriggerLevel(Channel, Value, **kwargs)
-            return function
-                
-        Handler[f"{Name}CH{i}.triggerLevel"] = lab.handle(f"{Name}CH{i}.triggerLevel", setTriggerLevel(i), Overwrites = Overwrites.get(f"CH{i}.triggerLevel", []), Pause = Pause.get(f"CH{i}.triggerLevel", 0))
+    # The channels, each parameter is set for all of the channels with a single call
+    def channelFunction(Function):
+        def function(Values, **kwargs):
+            Function(dict([(int(Channel), Value) for Channel, Value in Values.items()]), **kwargs)
+        return function
     
-        # Trigger mode
-        def setTriggerMode(Channel):
-            def function(Value, **kwargs):
-                TimeTagger.setTriggerMode(Channel, Value, **kwargs)
-            return function
-                
-        Handler[f"{Name}CH{i}.triggerMode"] = lab.handle(f"{Name}CH{i}.triggerMode", setTriggerMode(i), Overwrites = Overwrites.get(f"CH{i}.triggerMode", []), Pause = Pause.get(f"CH{i}.triggerMode", 0))
+    # Trigger level
+    Handler[f"{Name}CH*.triggerLevel"] = lab.groupHandle(f"{Name}CH*.triggerLevel", channelFunction(TimeTagger.setTriggerLevels), Overwrites = Overwrites.get("CH*.triggerLevel", []), Pause = Pause.get("CH*.triggerLevel", 0), Devices = [TimeTagger], Fields = Channels, FieldOverwrites = _channelValues(Overwrites, "CH{}.triggerLevel", Channels), FieldPause = _channelValues(Pause, "CH{}.triggerLevel", Channels))
     
-        # Dead time
-        def setDeadTime(Channel):
-            def function(Value, **kwargs):
-                TimeTagger.setDeadTime(Channel, Value, **kwargs)
-            return function
-        
-        Handler[f"{Name}CH{i}.deadTime"] = lab.handle(f"{Name}CH{i}.deadTime", setDeadTime(i), Overwrites = Overwrites.get(f"CH{i}.deadTime", []), Pause = Pause.get(f"CH{i}.deadTime", 0))
+    # Trigger mode
+    Handler[f"{Name}CH*.triggerMode"] = lab.groupHandle(f"{Name}CH*.triggerMode", channelFunction(TimeTagger.setTriggerModes), Overwrites = Overwrites.get("CH*.triggerMode", []), Pause = Pause.get("CH*.triggerMode", 0), Devices = [TimeTagger], Fields = Channels, FieldOverwrites = _channelValues(Overwrites, "CH{}.triggerMode", Channels), FieldPause = _channelValues(Pause, "CH{}.triggerMode", Channels))
     
-        # Input delay
-        def setDelay(Channel):
-            def function(Value, **kwargs):
-                TimeTagger.setChannelDelay(Channel, Value, **kwargs)
-            return function
-        
-        Handler[f"{Name}CH{i}.delay"] = lab.handle(f"{Name}CH{i}.delay", setDelay(i), Overwrites = Overwrites.get(f"CH{i}.delay", []), Pause = Pause.get(f"CH{i}.delay", 0))
+    # Dead time
+    Handler[f"{Name}CH*.deadTime"] = lab.groupHandle(f"{Name}CH*.deadTime", channelFunction(TimeTagger.setDeadTimes), Overwrites = Overwrites.get("CH*.deadTime", []), Pause = Pause.get("CH*.deadTime", 0), Devices = [TimeTagger], Fields = Channels, FieldOverwrites = _channelValues(Overwrites, "CH{}.deadTime", Channels), FieldPause = _channelValues(Pause, "CH{}.deadTime", Channels))
+    
+    # Input delay
+    Handler[f"{Name}CH*.delay"] = lab.groupHandle(f"{Name}CH*.delay", channelFunction(TimeTagger.setChannelDelays), Overwrites = Overwrites.get("CH*.delay", []), Pause = Pause.get("CH*.delay", 0), Devices = [TimeTagger], Fields = Channels, FieldOverwrites = _channelValues(Overwrites, "CH{}.delay", Channels), FieldPause = _channelValues(Pause, "CH{}.delay", Channels))
     
     return Handler
     
@@ -255,8 +260,8 @@ def timeTagger(TimeTagger, ChannelCount, Name = "", Overwrites = dict(), Pause =
 # SNSPD (controllers.SNSPD): The SNSPD device to control
 # ChannelCount (int): The number of channels accessable
 # Name (str): The name in from of each setting
-# Overwrites (dict of list of str): A dict containing the lists of overwrites for each handler
-# Pause (dict of floats): A dict containing the time to pause after setting each parameter, defaults to 0
+# Overwrites (dict of list of str): A dict containing the lists of overwrites for each handler, the bias uses the key "*.bias" for all channels or keys like "1.bias" for a single channel
+# Pause (dict of floats): A dict containing the time to pause after setting each parameter, defaults to 0, the bias uses the key "*.bias" for all channels or keys like "1.bias" for a single channel
 def photonSpot(SNSPD, ChannelCount, Name = "", Overwrites = dict(), Pause = dict()):
     from .. import lab
     from .. import controllers as c
@@ -264,17 +269,17 @@ def photonSpot(SNSPD, ChannelCount, Name = "", Overwrites = dict(), Pause = dict
     if not isinstance(SNSPD, c.photonSpot):
         raise e.TypeDefError("SNSPD", SNSPD, c.photonSpot)
     
+    Channels = [str(i) for i in range(1, ChannelCount + 1)]
+    _checkKeys(Overwrites, Pause, [f"{Channel}.bias" for Channel in ["*"] + Channels])
+    
     # Set up the handlers
     Handler = lab.settingHandler()
     
-    # Set the bias current
-    for i in range(1, ChannelCount + 1):
-        def setBiasCurrent(Channel):
-            def function(Value, **kwargs):
-                SNSPD.setBias(Channel, Value, **kwargs)
-            return function
-            
-        Handler[f"{Name}{i}.bias"] = lab.handle(f"{Name}{i}.bias", setBiasCurrent(i), Overwrites = Overwrites.get(f"{i}.bias", []), Pause = Pause.get(f"{i}.bias", 0))
+    # Set the bias current of all of the channels with a single call
+    def setBiasCurrents(Values, **kwargs):
+        SNSPD.setBiases(dict([(int(Channel), Value) for Channel, Value in Values.items()]), **kwargs)
+        
+    Handler[f"{Name}*.bias"] = lab.groupHandle(f"{Name}*.bias", setBiasCurrents, Overwrites = Overwrites.get("*.bias", []), Pause = Pause.get("*.bias", 0), Devices = [SNSPD], Fields = Channels, FieldOverwrites = _channelValues(Overwrites, "{}.bias", Channels), FieldPause = _channelValues(Pause, "{}.bias", Channels))
     
     return Handler
 
@@ -14,4 +14,14 @@ def infoWrapper(Function):
     def Wrapper(*args, **kwargs):
         return True, Function(*args, **kwargs)
     
+    return Wrapper
+
+# A wrapper function to add error identifiers for a socket server method returning an array, the new return value will be True, numpy.ndarray(OldReturn), the array is sent as a binary frame to clients using binary frames
+# Function (func): The function to wrap
+def arrayWrapper(Function):
+    def Wrapper(*args, **kwargs):
+        import numpy as np
+        
+        return True, np.asarray(Function(*args, **kwargs))
+    
     return Wrapper
\ No newline at end of file
@@ -1,7 +1,7 @@
 # Sleeps while still allowing plots to be controlled
 # Time (float): The time to sleep, if negative or 0 then it will not sleep
 def sleep(Time):
-    import matplotlib.pyplot as plt
+    import sys
     import time
     import threading
     
@@ -10,7 +10,10 @@ def sleep(Time):
     if Time <= 0:
         return
     
-    if threading.current_thread() is threading.main_thread():
+    # Only pause matplotlib if it has been loaded and has figures, such that it is not needed when plotting in another process
+    plt = sys.modules.get("matplotlib.pyplot", None)
+    
+    if threading.current_thread() is threading.main_thread() and plt is not None and len(plt.get_fignums()) > 0:
         plt.pause(Time)
         
     else:
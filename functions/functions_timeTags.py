@@ -0,0 +1,188 @@
+# Functions to analyse recorded time tags without measuring again, all timestamps are in ps and must be sorted
+from .. import exceptions as e
+
+# Gets the timestamps of a single channel
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# Channel (int): The channel to get the timestamps of
+def _getChannel(Timestamps, Channels, Channel):
+    import numpy as np
+    
+    return np.asarray(Timestamps)[np.asarray(Channels) == int(Channel)].astype(np.int64, copy = False)
+
+# Gets the duration of a measurement in seconds from the first to the last timestamp
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+def _getDuration(Timestamps):
+    if len(Timestamps) < 2:
+        return 0.
+    
+    return float(Timestamps[-1] - Timestamps[0]) * 1e-12
+
+# Counts the number of events in some channels
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# Channel (int/list of int): The channel or channels to count
+def count(Timestamps, Channels, Channel):
+    import numpy as np
+    
+    # Numpy integers and 0-d arrays are single channels too
+    ToInt = np.ndim(Channel) == 0
+    Channel = np.atleast_1d(np.asarray(Channel, dtype = np.int64))
+    Channels = np.asarray(Channels)
+    
+    if len(Channels) == 0:
+        Counts = np.zeros(len(Channel), dtype = np.int64)
+    
+    # Count all channels in one pass
+    else:
+        Offset = int(Channels.min())
+        AllCounts = np.bincount((Channels - Offset).astype(np.intp, copy = False))
+        Index = Channel - Offset
+        Valid = (Index >= 0) & (Index < len(AllCounts))
+        Counts = np.zeros(len(Channel), dtype = np.int64)
+        Counts[Valid] = AllCounts[Index[Valid]]
+    
+    if ToInt:
+        return int(Counts[0])
+    
+    return Counts
+
+# Gets the count rate of some channels in counts per second
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# Channel (int/list of int): The channel or channels to get the count rate of
+# Duration (float): The duration of the measurement in seconds, None to use the time from the first to the last timestamp
+def countRate(Timestamps, Channels, Channel, Duration = None):
+    if Duration is None:
+        Duration = _getDuration(Timestamps)
+    
+    if Duration <= 0:
+        raise e.SharpMinValueError("Duration", Duration, 0)
+    
+    return count(Timestamps, Channels, Channel) / float(Duration)
+
+# Makes a start stop histogram of the time from the last clock event to each event, equivalent to swabianTimeTagger.getHistogram
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# ClockChannel (int): The channel to use for the clock
+# Channel (int): The channel to get data from
+# BinWidth (int): The width of a bin in ps
+# BinCount (int): The number of bins, None to fill one clock period using the mean clock rate
+# Gates (list of 2-tuple of float): List of gates of (StartTime, EndTime) in ns, bins outside all gates are set to 0, leave empty to not gate
+# ChunkSize (int): The maximum number of events to handle at once
+def histogram(Timestamps, Channels, ClockChannel, Channel, BinWidth = 4, BinCount = None, Gates = [], ChunkSize = 10000000):
+    import numpy as np
+    
+    BinWidth = int(BinWidth)
+    ChunkSize = int(ChunkSize)
+    
+    if ChunkSize < 1:
+        raise e.MinValueError("ChunkSize", ChunkSize, 1)
+    
+    Clock = _getChannel(Timestamps, Channels, ClockChannel)
+    Clicks = _getChannel(Timestamps, Channels, Channel)
+    
+    # Get the number of bins from the clock rate
+    if BinCount is None:
+        if len(Clock) < 2:
+            raise e.MinLengthError("The clock events", Clock, 2)
+        
+        BinCount = int((Clock[-1] - Clock[0]) / (len(Clock) - 1) / BinWidth)
+    
+    BinCount = int(BinCount)
+    Bins = np.zeros(BinCount, dtype = np.int64)
+    
+    # Find the last clock event before each event
+    for i in range(0, len(Clicks), ChunkSize):
+        Chunk = Clicks[i:i + ChunkSize]
+        Index = np.searchsorted(Clock, Chunk, side = "right") - 1
+        Valid = Index >= 0
+        
+        Delays = (Chunk[Valid] - Clock[Index[Valid]]) // BinWidth
+        Bins += np.bincount(Delays[Delays < BinCount], minlength = BinCount)
+    
+    Times = np.arange(BinCount) * BinWidth * 1e-3
+    
+    # Gate the data
+    if len(Gates) > 0:
+        Mask = np.zeros(BinCount, dtype = bool)
+        
+        for Gate in Gates:
+            Mask |= (Times >= Gate[0]) & (Times <= Gate[1])
+        
+        Bins[~Mask] = 0
+    
+    return Bins, Times
+
+# Gets the number of events within the gates of a start stop histogram, equivalent to swabianTimeTagger.getGatedCount
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# ClockChannel (int): The channel to use for the clock
+# Channel (int): The channel to get data from
+# Gates (list of 2-tuple of float): List of gates of (StartTime, EndTime) in ns
+# BinWidth (int): The width of a bin in ps
+# BinCount (int): The number of bins, None to fill one clock period using the mean clock rate
+# ChunkSize (int): The maximum number of events to handle at once
+def gatedCount(Timestamps, Channels, ClockChannel, Channel, Gates, BinWidth = 4, BinCount = None, ChunkSize = 10000000):
+    import numpy as np
+    
+    Bins, _ = histogram(Timestamps, Channels, ClockChannel, Channel, BinWidth = BinWidth, BinCount = BinCount, Gates = Gates, ChunkSize = ChunkSize)
+    
+    return int(np.sum(Bins))
+
+# Gets the correlation between 2 channels as a histogram of the time from each start event to every stop event within the range of the bins, set them equal for autocorrelations, equivalent to swabianTimeTagger.getCorrelations
+# Timestamps (numpy.ndarray of int): The timestamps in ps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# ChannelStart (int): The channel for which start clicks are detected
+# ChannelStop (int): The channel for which stop clicks are detected
+# BinWidth (int): The width of a bin in ps
+# BinCount (int): The number of bins, the bins are centered around a delay of 0
+# Duration (float): The duration of the measurement in seconds used for normalizing, None to use the time from the first to the last timestamp
+# ChunkSize (int): The maximum number of start events to handle at once
+def correlation(Timestamps, Channels, ChannelStart, ChannelStop, BinWidth = 4, BinCount = 2500, Duration = None, ChunkSize = 10000000):
+    import numpy as np
+    
+    BinWidth = int(BinWidth)
+    BinCount = int(BinCount)
+    ChunkSize = int(ChunkSize)
+    
+    if ChunkSize < 1:
+        raise e.MinValueError("ChunkSize", ChunkSize, 1)
+    
+    Start = _getChannel(Timestamps, Channels, ChannelStart)
+    Stop = _getChannel(Timestamps, Channels, ChannelStop)
+    
+    FirstDelay = -(BinCount // 2) * BinWidth
+    Counts = np.zeros(BinCount, dtype = np.int64)
+    
+    for i in range(0, len(Start), ChunkSize):
+        Chunk = Start[i:i + ChunkSize]
+        
+        # Find the range of stop events within the bins for each start event
+        Low = np.searchsorted(Stop, Chunk + FirstDelay, side = "left")
+        High = np.searchsorted(Stop, Chunk + FirstDelay + BinCount * BinWidth, side = "left")
+        
+        # Step through the k'th stop event of all start events at once
+        Active = np.nonzero(High > Low)[0]
+        Offset = 0
+        
+        while len(Active) > 0:
+            Delays = (Stop[Low[Active] + Offset] - Chunk[Active] - FirstDelay) // BinWidth
+            Counts += np.bincount(Delays, minlength = BinCount)
+            
+            Offset += 1
+            Active = Active[Low[Active] + Offset < High[Active]]
+    
+    # An event is not correlated with itself
+    if int(ChannelStart) == int(ChannelStop) and BinCount > 0:
+        Counts[BinCount // 2] -= len(Start)
+    
+    # Normalize such that uncorrelated events gives 1
+    if Duration is None:
+        Duration = _getDuration(Timestamps)
+    
+    Expected = len(Start) * len(Stop) * BinWidth * 1e-12 / float(Duration) if Duration > 0 else 0
+    NormCounts = Counts / Expected if Expected > 0 else np.zeros(BinCount, dtype = float)
+    Delays = (FirstDelay + np.arange(BinCount) * BinWidth) * 1e-3
+    
+    return Counts, NormCounts, Delays
\ No newline at end of file
@@ -1,29 +1,35 @@
 from . import exceptions as e
 
-# A base setting class
+# A base setting class, the items are stored in a flat dict with keys given as "field.field.name" together with an index of the keys under each field
 class baseSetting:
     def __init__(self, *args, **kwargs):
+        import weakref
+        
         super().__init__(*args, **kwargs)
         
-        # Dict to save everything inside and the default value
+        # Flat dict to save everything inside and the keys below each field
         self._dict = dict()
-        self._value = None
-        self._fullDict = None
+        self._index = dict()
+        
+        # The settings sharing the dicts, they are copied before writing if it is shared, copies which are deleted stop sharing by themselves
+        self._owners = weakref.WeakSet([self])
+        
+        # A branch is a view of the items below a field of its parent
+        self._parent = None
+        self._prefix = ""
         
     # Gets an item from the dict
     # ID (str): The ID of the item
     def __getitem__(self, ID):
-        Value = self.getBranch(ID)
+        ID = str(ID)
         
-        # Check if it is just an item
-        if not isinstance(Value, type(self)):
-            return Value
+        if self._parent is not None:
+            return self._parent[self._prefix + ID]
         
-        # If there is a sub setting make sure the item exists
-        if Value._value is None:
-            raise e.ItemExistError(ID, self)
+        if ID in self._dict:
+            return self._dict[ID]
         
-        return Value._value
+        self._missing(ID)
     
     # Sets an item to the dict
     # ID (str): The ID of the item
@@ -33,87 +39,131 @@ class baseSetting:
         if str(ID)[0] == "_":
             return
         
-        self._fullDict = None
+        ID = str(ID)
         
-        # Split
-        SplitID = str(ID).split(".", 1)
-
-        # If it should put it in a sub setting
-        if len(SplitID) > 1:
-            # Add new sub setting
-            if not SplitID[0] in self._dict:
-                self._dict[SplitID[0]] = type(self)()
-                
-            # Save the old item
-            elif not isinstance(self._dict[SplitID[0]], type(self)):
-                OldItem = self._dict[SplitID[0]]
-                self._dict[SplitID[0]] = type(self)()
-                self._dict[SplitID[0]]._value = OldItem
-
-            # Set item
-            self._dict[SplitID[0]][SplitID[1]] = Item
+        if self._parent is not None:
+            self._parent[self._prefix + ID] = Item
+            return
+        
+        # Just replace the item if it exists
+        if ID in self._dict:
+            self._unshare()
+            self._dict[ID] = Item
+            return
+        
+        self._unshare()
         
-        # If there is a sub setting
-        elif SplitID[0] in self._dict and isinstance(self._dict[SplitID[0]], type(self)):
-            self._dict[SplitID[0]]._value = Item
+        # Add it to the index of every field above it
+        Position = ID.find(".")
+        while Position >= 0:
+            self._index.setdefault(ID[:Position], dict())[ID] = None
+            Position = ID.find(".", Position + 1)
             
-        # Just set the item
-        else:
-            self._dict[SplitID[0]] = Item
+        self._dict[ID] = Item
+        
+    # Checks if an item exists
+    # ID (str): The ID of the item
+    def __contains__(self, ID):
+        if self._parent is not None:
+            return self._prefix + str(ID) in self._parent
+        
+        return str(ID) in self._dict
 
     # Returns an iterator for the dict of this object
     def __iter__(self):
-        return iter(self.toDict())
+        if self._parent is None:
+            return iter(list(self._dict))
+        
+        return iter([Key for Key, _ in self._items()])
+    
+    # Gets the (ID, Item) pairs of this setting, a branch takes the items below its field from the parent
+    def _items(self):
+        if self._parent is None:
+            return list(self._dict.items())
+        
+        Length = len(self._prefix)
+        Dict = self._parent._dict
+        
+        return [(Key[Length:], Dict[Key]) for Key in self._parent._index.get(self._prefix[:-1], ())]
     
-    # Copies the settings
+    # Copies the settings, the copy shares the data with this setting until one of them is changed
     def copy(self):
         NewSetting = type(self)()
-        NewSetting.loadDict(self.toDict())
+        
+        if self._parent is not None:
+            NewSetting.loadDict(self.toDict())
+            return NewSetting
+        
+        NewSetting._dict = self._dict
+        NewSetting._index = self._index
+        NewSetting._owners = self._owners
+        self._owners.add(NewSetting)
         return NewSetting
+    
+    # Makes sure the data of this setting is not shared with a copy before changing it
+    def _unshare(self):
+        import weakref
         
-    # Gets an item from the dict, may return a sub setting
+        if len(self._owners) > 1:
+            self._owners.discard(self)
+            self._owners = weakref.WeakSet([self])
+            self._dict = dict(self._dict)
+            self._index = dict([(Key, dict(Keys)) for Key, Keys in self._index.items()])
+            
+    # Raises the correct error for an item which does not exist
+    # ID (str): The ID of the item
+    def _missing(self, ID):
+        # If there is a sub setting without a value or one of the fields is an item then the item cannot exist
+        if ID in self._index or any(ID[:i] in self._dict for i in range(len(ID)) if ID[i] == "."):
+            raise e.ItemExistError(ID, self)
+        
+        raise KeyError(ID)
+        
+    # Gets an item from the dict, may return a sub setting which is a view of the items below the field, changes to either of them are seen by the other
     # ID (str): The ID of the branch
     def getBranch(self, ID):
-        # Split
-        SplitID = str(ID).split(".", 1)
-
-        # If it should take it from a sub setting
-        if len(SplitID) > 1:
-            if not isinstance(self._dict[SplitID[0]], type(self)):
-                raise e.ItemExistError(ID, self)
-                
-            return self._dict[SplitID[0]][SplitID[1]]
+        ID = str(ID)
+        
+        if self._parent is not None:
+            return self._parent.getBranch(self._prefix + ID)
+        
+        # Just an item
+        if ID not in self._index:
+            return self[ID]
         
-        # Otherwise just return
-        return self._dict[SplitID[0]]
+        # Create the view
+        Branch = type(self)()
+        Branch._parent = self
+        Branch._prefix = f"{ID}."
+            
+        return Branch
     
-    # Removes an item if it exists, does nothing if the item does not exist
+    # Removes an item if it exists, does nothing if the item does not exist, the items below it are kept
     # ID (str): The ID of the item
     def removeItem(self, ID):
-        # Check if the item is there
-        if ID not in self:
+        ID = str(ID)
+        
+        if self._parent is not None:
+            self._parent.removeItem(self._prefix + ID)
             return
         
-        # Reset full dict
-        self._fullDict = None
+        # Check if the item is there
+        if ID not in self._dict:
+            return
         
-        # Get the branch
-        SplitID = str(ID).rsplit(".", 1)
+        self._unshare()
+        self._dict.pop(ID)
         
-        # Get the setting in which it is located
-        if len(SplitID) > 1:
-            Setting = self.getBranch(SplitID[0])
+        # Remove it from the index
+        Position = ID.find(".")
+        while Position >= 0:
+            Field = ID[:Position]
+            self._index[Field].pop(ID)
             
-        else:
-            Setting = self
-        
-        # If the item is a sub setting
-        if isinstance(Setting[SplitID[-1]], type(self)):
-            Setting[SplitID[-1]]._value = None
-        
-        # Remove the item
-        else:
-            Setting._dict.pop(SplitID[-1])
+            if len(self._index[Field]) == 0:
+                self._index.pop(Field)
+                
+            Position = ID.find(".", Position + 1)
         
     # Merges another setting with this, the new one will overwrite
     # Setting (baseSetting): The setting to add
@@ -121,37 +171,24 @@ class baseSetting:
         if not isinstance(Setting, type(self)):
             raise e.TypeDefError("Setting", Setting, type(self))
         
-        for Key, Item in Setting.toDict().items():
+        # Share the data if this is empty
+        if self._parent is None and Setting._parent is None and len(self._dict) == 0:
+            self._owners.discard(self)
+            self._dict = Setting._dict
+            self._index = Setting._index
+            self._owners = Setting._owners
+            self._owners.add(self)
+            return
+        
+        for Key, Item in Setting._items():
             self[Key] = Item
         
-    
     # Converts the setting to a dict
     def toDict(self):
-        if self._fullDict is not None:
-            return self._fullDict.copy()
-        
-        Dict = dict()
+        if self._parent is None:
+            return dict(self._dict)
         
-        # Go through all elements
-        for Key, Value in self._dict.items():
-            # If it is a setupSetting get the dict and merge it
-            if isinstance(Value, type(self)):
-                NewDict = Value.toDict()
-                
-                # Add new items
-                for NewKey, NewValue in NewDict.items():
-                    Dict[f"{Key}.{NewKey}"] = NewValue
-                    
-                # Add original value
-                if Value._value is not None:
-                    Dict[Key] = Value._value
-                    
-            # Add other values
-            else:
-                Dict[Key] = Value
-            
-        self._fullDict = Dict
-        return Dict
+        return dict(self._items())
 
     # Creates the settings from a dict
     # Dict (dict): The dict to convert from
@@ -167,6 +204,33 @@ class baseSetting:
         Setting = cls()
         Setting.loadDict(Dict)
         return Setting
+    
+    # Finds the differences going from this setting to another, returns (Added, Changed, Removed) where Added and Changed are dicts with the values of Other and Removed is a list of keys
+    # Other (baseSetting): The setting to compare with
+    def diff(self, Other):
+        if not isinstance(Other, baseSetting):
+            raise e.TypeDefError("Other", Other, baseSetting)
+            
+        return diffDicts(self.toDict(), Other.toDict())
+
+
+# Finds the differences between two flat dicts of settings, returns (Added, Changed, Removed) where Added and Changed are dicts with the values of New and Removed is a list of keys
+# Old (dict): The dict to compare from
+# New (dict): The dict to compare to
+def diffDicts(Old, New):
+    Added = dict()
+    Changed = dict()
+    
+    for Key, Value in New.items():
+        if Key not in Old:
+            Added[Key] = Value
+            
+        elif Old[Key] != Value:
+            Changed[Key] = Value
+            
+    Removed = [Key for Key in Old if Key not in New]
+    
+    return Added, Changed, Removed
 
 
 # Saves a setup setting
@@ -274,6 +338,7 @@ class settingHandler(baseSetting):
         super().__init__(*args, **kwargs)
         
         self._waitQueue = []
+        self._groups = dict()
 
     # Sets an item to the dict
     # ID (str): The ID of the item
@@ -284,14 +349,61 @@ class settingHandler(baseSetting):
             
         super().__setitem__(ID, Item)
         
+        # Note down the group handles
+        if str(ID) in self:
+            self._groups.pop(str(ID), None)
+            
+            if isinstance(Item, groupHandle):
+                self._groups[str(ID)] = Item
+                
+    # Copies the handlers
+    def copy(self):
+        NewHandler = super().copy()
+        NewHandler._groups = dict(self._groups)
+        return NewHandler
+    
+    # Removes a handle if it exists
+    # ID (str): The ID of the handle
+    def removeItem(self, ID):
+        super().removeItem(ID)
+        self._groups.pop(str(ID), None)
+        
+    # Merges other handlers with this, the new ones will overwrite
+    # Setting (settingHandler): The handlers to add
+    def addSetting(self, Setting):
+        super().addSetting(Setting)
+        
+        for Key, Item in Setting._groups.items():
+            self._groups[Key] = Item
+            
+    # Finds the handle for a setting, handles for the exact key are used before group handles, returns None if there is no handle
+    # ID (str): The key of the setting
+    def find(self, ID):
+        ID = str(ID)
+        
+        if ID in self:
+            return self[ID]
+        
+        for Handle in self._groups.values():
+            if Handle.match(ID) is not None:
+                return Handle
+            
+        return None
+        
     # Process an item
     # AppliedSettings (setting): The settings to store the applied value
     # ID (str/setting): The ID or setting to handle
     # Value (any): The value of the setting to handle
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     def process(self, AppliedSettings, ID, Value, **kwargs):
-        if ID in self:
-            Func, Order = self[ID].process(AppliedSettings, Value, **kwargs)
+        Handle = self.find(ID)
+        
+        if Handle is not None:
+            # Group handles take a dict of values
+            if isinstance(Handle, groupHandle):
+                Value = {str(ID): Value}
+                
+            Func, Order = Handle.process(AppliedSettings, Value, **kwargs)
             if Order is not None:
                 self._waitQueue.append((Func, Order))
         
@@ -302,7 +414,186 @@ class settingHandler(baseSetting):
     def processSettings(self, AppliedSettings, Settings, **kwargs):
         for Key, Value in Settings.toDict().items():
             self.process(AppliedSettings, Key, Value, **kwargs)
+
+    # Processes everything in some settings, settings for different devices are applied at the same time
+    # The settings without an order are applied first and then each order from lowest to highest, within each order the handles sharing a device are applied in the same order as in the settings
+    # All the settings of a group handle within the same order are applied with a single call at the position of the first of them
+    # AppliedSettings (setting): The settings to store the applied value
+    # Settings (dict): The flat dict of the settings to process
+    # MaxWorkers (int): The maximum number of handles to run at the same time
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def processParallel(self, AppliedSettings, Settings, MaxWorkers = 8, **kwargs):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Find the handles and split them into stages by order
+        Stages = dict()
+        Groups = dict()
+        
+        for Key, Value in Settings.items():
+            Handle = self.find(Key)
+            
+            if Handle is None:
+                continue
+            
+            Stage = Stages.setdefault(Handle._order, [])
+            
+            # Collect the values of a group handle
+            if isinstance(Handle, groupHandle):
+                if id(Handle) in Groups:
+                    Groups[id(Handle)][Key] = Value
+                    
+                else:
+                    Groups[id(Handle)] = {Key: Value}
+                    Stage.append((Handle._key, Handle, Groups[id(Handle)]))
+                    
+            else:
+                Stage.append((Key, Handle, Value))
+        
+        StageOrders = sorted([Order for Order in Stages if Order is not None])
+        if None in Stages:
+            StageOrders = [None] + StageOrders
+        
+        # Make sure no handle has to wait for a handle in a later stage
+        StageIndex = dict([(ID, i) for i, Order in enumerate(StageOrders) for Item in Stages[Order] for ID in self._itemKeys(*Item)])
+        LateKeys = [Key for i, Order in enumerate(StageOrders) for Key, Handle, _ in Stages[Order] if any(StageIndex.get(After, -1) > i for After in Handle.after)]
+        
+        if len(LateKeys) > 0:
+            raise e.DependencyError(LateKeys)
+        
+        # Apply each stage
+        with ThreadPoolExecutor(max_workers = int(MaxWorkers)) as Executor:
+            for Order in StageOrders:
+                self._processStage(AppliedSettings, Stages[Order], Executor, **kwargs)
+    
+    # Replaces equipment by the objects it talks to such that handles of an equipment and of the devices it wraps are applied in order
+    # Devices (list of objects): The devices of a handle
+    # Returns a list of the objects without duplicates
+    def _expandDevices(self, Devices):
+        from . import equipment
         
+        Expanded = dict()
+        
+        for Device in Devices:
+            for Object in (Device.getDevices() if isinstance(Device, equipment.device) else [Device]):
+                Expanded[id(Object)] = Object
+                
+        return list(Expanded.values())
+    
+    # Applies a single stage of settings as a dependency graph
+    # AppliedSettings (setting): The settings to store the applied value
+    # Items (list of tuple): A list of (Key, Handle, Value) to apply
+    # Executor (ThreadPoolExecutor): The executor to run the handles on
+    def _processStage(self, AppliedSettings, Items, Executor, **kwargs):
+        from collections import deque
+        from concurrent.futures import wait, FIRST_COMPLETED
+        
+        # Build the graph, handles without devices act as barriers
+        Index = dict([(ID, i) for i, Item in enumerate(Items) for ID in self._itemKeys(*Item)])
+        Dependents = [[] for _ in Items]
+        Remaining = []
+        LastDevice = dict()
+        SinceBarrier = []
+        Barrier = None
+        
+        for i, (Key, Handle, _) in enumerate(Items):
+            Dependencies = set([Index[After] for After in Handle.after if After in Index])
+            
+            if Barrier is not None:
+                Dependencies.add(Barrier)
+            
+            if len(Handle.devices) == 0:
+                Dependencies.update(SinceBarrier)
+                Barrier = i
+                SinceBarrier = []
+                LastDevice = dict()
+            
+            else:
+                for Device in self._expandDevices(Handle.devices):
+                    if id(Device) in LastDevice:
+                        Dependencies.add(LastDevice[id(Device)])
+                    
+                    LastDevice[id(Device)] = i
+                
+                SinceBarrier.append(i)
+            
+            for Dependency in Dependencies:
+                Dependents[Dependency].append(i)
+            
+            Remaining.append(len(Dependencies))
+        
+        # Run the graph
+        Ready = deque([i for i, Count in enumerate(Remaining) if Count == 0])
+        Running = dict()
+        Finished = [False] * len(Items)
+        Error = None
+        
+        # Records a finished handle and frees the handles waiting for it
+        def finish(i):
+            Key, Handle, Value = Items[i]
+            Handle.record(AppliedSettings, Value)
+            Finished[i] = True
+            
+            for Dependent in Dependents[i]:
+                Remaining[Dependent] -= 1
+                
+                if Remaining[Dependent] == 0:
+                    Ready.append(Dependent)
+        
+        while len(Running) > 0 or (Error is None and len(Ready) > 0):
+            # Start everything which is ready
+            while Error is None and len(Ready) > 0:
+                i = Ready.popleft()
+                _, Handle, Value = Items[i]
+                
+                # Barriers are only ready when nothing else is running
+                if len(Handle.devices) == 0:
+                    try:
+                        Handle.apply(Value, **kwargs)
+                    
+                    except Exception as Err:
+                        Error = Err
+                        break
+                    
+                    finish(i)
+                
+                else:
+                    Running[Executor.submit(Handle.apply, Value, **kwargs)] = i
+            
+            if len(Running) == 0:
+                continue
+            
+            # Wait for something to finish
+            Done, _ = wait(list(Running), return_when = FIRST_COMPLETED)
+            
+            for Future in Done:
+                i = Running.pop(Future)
+                
+                if Future.exception() is not None:
+                    if Error is None:
+                        Error = Future.exception()
+                    
+                    continue
+                
+                finish(i)
+        
+        if Error is not None:
+            raise Error
+        
+        # Everything left must be waiting for each other
+        if not all(Finished):
+            raise e.DependencyError([Items[i][0] for i in range(len(Items)) if not Finished[i]])
+    
+    # Gets the keys of the settings handled by an item in processParallel
+    # Key (str): The key of the item
+    # Handle (handle): The handle of the item
+    # Value (any): The value of the item, a dict of values for a group handle
+    @staticmethod
+    def _itemKeys(Key, Handle, Value):
+        if isinstance(Handle, groupHandle):
+            return [Key] + list(Value)
+        
+        return [Key]
+    
     # Applies all the settings with a specific order
     def postProcess(self):
         # Sort the queue
@@ -323,7 +614,9 @@ class handle:
     # Overwrites (list of str): A list of all the settings to delete when handling a setting
     # Pause (float): The time to pause after applying this setting
     # Order (int): If not None then it will wait until the end of the settings and then apply all the rest in order from lowest to highest
-    def __init__(self, Key, Function, *args, Overwrites = [], Pause = 0, Order = None, **kwargs):
+    # Devices (list of objects): The devices this handle talks to, when applying settings in parallel handles sharing a device are applied in order while handles of different devices are applied at the same time, if empty then the handle is applied on its own
+    # After (list of str): The keys of settings which must be applied before this one when they are applied at the same time
+    def __init__(self, Key, Function, *args, Overwrites = [], Pause = 0, Order = None, Devices = [], After = [], **kwargs):
         super().__init__(*args, **kwargs)
         
         self._f = Function
@@ -331,6 +624,32 @@ class handle:
         self._key = str(Key)
         self._order = Order
         self._pause = float(Pause)
+        self.devices = list(Devices)
+        self.after = [str(Key) for Key in After]
+        
+    # Runs the function of the handle without touching the applied settings
+    # Value and kwargs are passed to the function
+    def apply(self, Value, **kwargs):
+        self._f(Value, **kwargs)
+        
+    # Notes down that the setting has been applied
+    # Settings (setting): The applied settings
+    # Value (any): The value which was applied
+    def record(self, Settings, Value):
+        # Remove overwrites
+        for Key in self.overwritten(self._key):
+            Settings.removeItem(Key)
+            
+        # Add setting
+        Settings[self._key] = Value
+        
+        # Add pause
+        Settings.addPause(self._pause)
+        
+    # Gets the keys of the settings which are removed when a setting is applied by this handle
+    # ID (str): The key of the applied setting
+    def overwritten(self, ID):
+        return list(self._overwrites)
         
     # Processes an item
     # Settings (setting): The applied settings
@@ -339,18 +658,8 @@ class handle:
     def process(self, Settings, Value, **kwargs):        
         # Function to do the handle
         def handleFunc():
-            # Run function
-            self._f(Value, **kwargs)
-
-            # Remove overwrites
-            for Key in self._overwrites:
-                Settings.removeItem(Key)
-                
-            # Add setting
-            Settings[self._key] = Value
-            
-            # Add pause
-            Settings.addPause(self._pause)
+            self.apply(Value, **kwargs)
+            self.record(Settings, Value)
             
         if self._order is None:
             handleFunc()
@@ -359,18 +668,94 @@ class handle:
         else:
             return handleFunc, self._order
         
+# A handle for handling all of the settings matching a pattern with a single call
+class groupHandle(handle):
+    # Key (str): The pattern for this handle, each "*" matches the text of a single field, like "CH*.triggerLevel"
+    # Function (callable): The function to run the handle, must take inputs (Values, UseQueue = True) where Values is a dict of the values with the text matched by "*" as keys, or a tuple of the matched texts if there are several "*"
+    # Overwrites (list of str): A list of all the settings to delete when handling a setting, each "*" is replaced by the matched text
+    # Pause (float): The time to pause after applying the settings
+    # Order (int): If not None then it will wait until the end of the settings and then apply all the rest in order from lowest to highest
+    # Devices (list of objects): The devices this handle talks to, if empty then the handle is applied on its own
+    # After (list of str): The keys of settings which must be applied before this one when they are applied at the same time
+    # Fields (list of str): The texts "*" is allowed to match, None to allow any field
+    # FieldOverwrites (dict of list of str): The overwrites to use instead of Overwrites for single fields, the keys are the texts matched by "*" or tuples of the matched texts if there are several "*"
+    # FieldPause (dict of float): The pause to use instead of Pause for single fields, the keys are like for FieldOverwrites
+    def __init__(self, Key, Function, *args, Fields = None, FieldOverwrites = dict(), FieldPause = dict(), **kwargs):
+        import re
+        
+        super().__init__(Key, Function, *args, **kwargs)
+        
+        self._fields = None if Fields is None else set([str(Field) for Field in Fields])
+        self._fieldOverwrites = dict([(Field, list(Overwrites)) for Field, Overwrites in FieldOverwrites.items()])
+        self._fieldPause = dict([(Field, float(Pause)) for Field, Pause in FieldPause.items()])
+        self._pattern = re.compile("([^.]+)".join([re.escape(Part) for Part in self._key.split("*")]))
+        
+    # Matches a key with the pattern, returns the text matched by "*", a tuple of texts if there are several "*" or None if it does not match
+    # ID (str): The key to match
+    def match(self, ID):
+        Match = self._pattern.fullmatch(str(ID))
+        
+        if Match is None:
+            return None
+        
+        Groups = Match.groups()
+        
+        if self._fields is not None and not all(Group in self._fields for Group in Groups):
+            return None
+        
+        if len(Groups) == 1:
+            return Groups[0]
+        
+        return Groups
+    
+    # Runs the function of the handle once for all of the values without touching the applied settings
+    # Values (dict): The values to apply with the keys of the settings as keys
+    # kwargs are passed to the function
+    def apply(self, Values, **kwargs):
+        self._f(dict([(self.match(ID), Value) for ID, Value in Values.items()]), **kwargs)
+        
+    # Notes down that the settings have been applied
+    # Settings (setting): The applied settings
+    # Values (dict): The values which were applied with the keys of the settings as keys
+    def record(self, Settings, Values):
+        for ID, Value in Values.items():
+            # Remove overwrites
+            for Key in self.overwritten(ID):
+                Settings.removeItem(Key)
+                
+            # Add setting
+            Settings[ID] = Value
+            
+        # Add the longest pause as the settings were applied together
+        Settings.addPause(max([self._fieldPause.get(self.match(ID), self._pause) for ID in Values], default = self._pause))
+        
+    # Gets the keys of the settings which are removed when a setting is applied by this handle, each "*" in the overwrites is replaced by the matched text
+    # ID (str): The key of the applied setting
+    def overwritten(self, ID):
+        Match = self.match(ID)
+        Parts = Match if isinstance(Match, tuple) else (Match,)
+        
+        return [Key.split("*")[0] + "".join([Part + Rest for Part, Rest in zip(Parts, Key.split("*")[1:])]) for Key in self._fieldOverwrites.get(Match, self._overwrites)]
+        
+
 # Holds functions to handle any setting, any item must be a function taking the arguments: Value (any): The value from the settings, Key (str): The key which retrieved this value, Settings (setting): The settings to finalize and return the new value for that key
 class settingFinalizer(baseSetting):
     # Finalizes a setting
     # Settings (setting): The settings to process
     def process(self, Settings):
-        NewSettings = Settings.copy()
+        return type(Settings).fromDict(self.processDict(Settings))
+    
+    # Finalizes a setting and returns the result as a flat dict, only the keys with a finalizer are touched
+    # Settings (setting): The settings to process
+    def processDict(self, Settings):
+        Dict = Settings.toDict()
+        NewDict = dict(Dict)
         
-        for Key, Value in Settings.toDict().items():
-            if Key in self:
-                NewSettings[Key] = self[Key](Value, Key, Settings)
+        for Key, Function in self.toDict().items():
+            if Key in Dict:
+                NewDict[Key] = Function(Dict[Key], Key, Settings)
                 
-        return NewSettings
+        return NewDict
             
 
 # A class to hold all of the equipment for the lab
@@ -482,6 +867,7 @@ class setup(object):
         self._settingsFinalizer = settingFinalizer()
         self._currentSettings = setting()
         self._appliedSettings = setting()
+        self._applyStats = {"Time": 0., "ApplyTime": 0., "PauseTime": 0., "Applied": 0, "Skipped": 0, "Parallel": False}
                 
         # Create a schedule queue for scripts
         self._scheduleQueue = c.queue()
@@ -604,6 +990,12 @@ class setup(object):
     def getAppliedSettings(self):
         return self._appliedSettings
     
+    # Checks if a setting has already been applied with the same value
+    # Name (str): The name of the setting
+    # Value (any): The value of the setting
+    def _isApplied(self, Name, Value):
+        return Name in self._appliedSettings and Value == self._appliedSettings[Name]
+    
     # Applies a single setting
     # Name (str): The name of the setting
     # Value (any): The value of the setting
@@ -611,27 +1003,103 @@ class setup(object):
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
     def applySetting(self, Name, Value, Reload = False, **kwargs):
         # Check if it already is loaded
-        if not Reload and Name in self._appliedSettings and Value == self._appliedSettings[Name]:
+        if not Reload and self._isApplied(Name, Value):
             return
         
         self._settingsHandler.process(self._appliedSettings, Name, Value, **kwargs)
         self._currentSettings[Name] = Value
     
-    # Applies a setting to the setup
+    # Applies a setting to the setup, only the settings which differ from the applied settings are applied
     # Settings (setting): The settings to apply to the setup
     # Reload (bool): If True then it will apply it even if it has already been applied
+    # Parallel (bool): If True then the settings of different devices are applied at the same time, handles without devices are still applied on their own
+    # MaxWorkers (int): The maximum number of settings to apply at the same time when Parallel is True
+    # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
+    def applySettings(self, Settings, Reload = False, Parallel = True, MaxWorkers = 8, **kwargs):
+        import time
+        
+        StartTime = time.perf_counter()
+        
+        # Finalize and find the settings which must be applied
+        RunSettings = self._settingsFinalizer.processDict(Settings)
+        Plan = self._makePlan(RunSettings, Reload)
+        
+        self._applyPlan(Plan, len(RunSettings) - len(Plan), StartTime, Parallel, MaxWorkers, **kwargs)
+        
+    # Makes a minimal change plan, returns a flat dict of the finalized settings which have not already been applied with the same value
+    # Settings (setting): The settings to plan
+    # Reload (bool): If True then all of the settings are put in the plan
+    def planSettings(self, Settings, Reload = False):
+        return self._makePlan(self._settingsFinalizer.processDict(Settings), Reload)
+    
+    # Applies a change plan from planSettings
+    # Plan (dict): The flat dict of settings to apply, they are not finalized again
+    # Parallel (bool): If True then the settings of different devices are applied at the same time, handles without devices are still applied on their own
+    # MaxWorkers (int): The maximum number of settings to apply at the same time when Parallel is True
     # UseQueue (bool): Whether to run the command through the queue or not, ignored if the device was initialized with UseQueue = False
-    def applySettings(self, Settings, **kwargs):
-        # Finalize
-        RunSettings = self._settingsFinalizer.process(Settings)
+    def applyPlan(self, Plan, Parallel = True, MaxWorkers = 8, **kwargs):
+        import time
+        
+        self._applyPlan(dict(Plan), 0, time.perf_counter(), Parallel, MaxWorkers, **kwargs)
+        
+    # Makes the change plan from finalized settings, settings which are already applied are still put in the plan if a planned setting overwrites them
+    # RunSettings (dict): The flat dict of finalized settings
+    # Reload (bool): If True then all of the settings are put in the plan
+    def _makePlan(self, RunSettings, Reload):
+        if Reload:
+            return dict(RunSettings)
         
-        # Go through each item and apply them
-        for Key, Item in RunSettings.toDict().items():
-            self.applySetting(Key, Item, **kwargs)
+        Applied = self._appliedSettings.toDict()
+        Planned = set([Key for Key, Item in RunSettings.items() if Key not in Applied or Applied[Key] != Item])
+        Unchecked = list(Planned)
+        
+        # Add the applied settings which are removed by the overwrites of planned settings
+        while len(Unchecked) > 0:
+            ID = Unchecked.pop()
+            Handle = self._settingsHandler.find(ID)
+            
+            if Handle is None:
+                continue
+            
+            for Key in Handle.overwritten(ID):
+                if Key in RunSettings and Key not in Planned:
+                    Planned.add(Key)
+                    Unchecked.append(Key)
+        
+        return dict([(Key, Item) for Key, Item in RunSettings.items() if Key in Planned])
+    
+    # Applies a change plan and notes down the timing
+    # Plan (dict): The flat dict of settings to apply
+    # Skipped (int): The number of settings left out of the plan
+    # StartTime (float): The perf_counter time when applying started
+    # Parallel (bool): If True then the settings of different devices are applied at the same time
+    # MaxWorkers (int): The maximum number of settings to apply at the same time when Parallel is True
+    def _applyPlan(self, Plan, Skipped, StartTime, Parallel, MaxWorkers, **kwargs):
+        import time
+        
+        # Apply them
+        if Parallel:
+            self._settingsHandler.processParallel(self._appliedSettings, Plan, MaxWorkers = MaxWorkers, **kwargs)
+            
+            for Key, Item in Plan.items():
+                self._currentSettings[Key] = Item
+        
+        else:
+            for Key, Item in Plan.items():
+                self.applySetting(Key, Item, Reload = True, **kwargs)
 
         # Post process
         self.postProcessSettings()
+        ApplyTime = time.perf_counter()
+        
         self._appliedSettings.pause()
+        EndTime = time.perf_counter()
+        
+        self._applyStats = {"Time": EndTime - StartTime, "ApplyTime": ApplyTime - StartTime, "PauseTime": EndTime - ApplyTime, "Applied": len(Plan), "Skipped": int(Skipped), "Parallel": bool(Parallel)}
+        
+    # Gets the timing of the last call to applySettings or applyPlan, returns a dict with the total time (Time), the time spent applying (ApplyTime), the time spent pausing (PauseTime), the number of applied settings (Applied), the number of skipped settings (Skipped) and whether it was done in parallel (Parallel)
+    def getApplyStats(self):
+        return dict(self._applyStats)
         
     # Applies the settings which has an order, not needed if settings were applied with applySettings
     def postProcessSettings(self):
@@ -649,8 +1117,10 @@ class setup(object):
     # Name (str): The name of the handler
     # Function (callable): The function to run when handling, should take arguments (Input, UseQueue = True)
     # Overwrites (list of str): The settings to overwrite when setting this setting
-    def addSettingHandler(self, Name, Function, Overwrites = []):
-        self._settingsHandler[Name] = handle(Name, Function, Overwrites = Overwrites)
+    # Devices (list of objects): The devices the handler talks to, if empty it is applied on its own
+    # After (list of str): The settings which must be applied before this one
+    def addSettingHandler(self, Name, Function, Overwrites = [], Devices = [], After = []):
+        self._settingsHandler[Name] = handle(Name, Function, Overwrites = Overwrites, Devices = Devices, After = After)
         
     # Adds setting handlers
     # SettingHandlers (setupSettingHandler): The handlers to add
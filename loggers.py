@@ -1,3 +1,5 @@
+from . import exceptions as e
+
 # Allow for multiple logs to be running on multiple threads logging PID input and output
 class PIDLogger(object):
     def __init__(self, Func):
@@ -7,7 +9,7 @@ class PIDLogger(object):
     # Starts a log of data with live plotting
     # File (str): The file path for where to save the log
     # MaxTime (float): The time in seconds to run the logging, 0 for infinity, must not be negative
-    # Period (floar): The time in seconds between each measurement, must not be negative
+    # Period (float): The time in seconds between each measurement, must be positive
     # MaxShow (int): The maximum number of data points to show at once, must be positive
     # WhiteSpaceIn (float): The size of the white space at the top and bottom of the signal in plot
     # WhiteSpaceOut (float): The size of the white space at the top and bottom of the signal out plot
@@ -16,7 +18,13 @@ class PIDLogger(object):
     # Plot (bool): If True then do live plotting
     # KeepFigure (bool): If False then it closes the live plotting when done
     # Wait (bool): If True then it will wait for the log to finish, if False then it will return immidiatly and return the stop event for the log for which to do .set() to stop the log
-    def log(self, File, MaxTime = 0, Period = 1, MaxShow = 10000, DataArgs = tuple(), DataKwargs = dict(), WhiteSpaceIn = 0.1, WhiteSpaceOut = 0.1, Name = None, figsize = (10, 10), Plot = True, KeepFigure = True, Wait = False):        
+    # Format (str): The format of the file, either "csv" for a line of text per sample or "columns" for a block file which can be read with columnReader
+    # FilePrefix (str): The prefix of the file name, the date, time and the given file name are added to it
+    # BlockSize (int): The number of samples to write at once for the "columns" format
+    # FlushInterval (float): The maximum time in seconds before the samples are written for the "columns" format, None to only write full blocks
+    # Compress (bool): If True then the blocks are compressed for the "columns" format
+    # Key (hashable): Logs with the same key share one call of the data function when they are due at the same time, use it for logs reading the same device, the samples are aligned to multiples of Period when given, None to never share
+    def log(self, File, MaxTime = 0, Period = 1, MaxShow = 10000, DataArgs = tuple(), DataKwargs = dict(), WhiteSpaceIn = 0.1, WhiteSpaceOut = 0.1, Name = None, figsize = (10, 10), Plot = True, KeepFigure = True, Wait = False, Format = "csv", FilePrefix = "TempArduino", BlockSize = 3600, FlushInterval = 60, Compress = True, Key = None):        
         import os
         from datetime import datetime
         import threading as th
@@ -36,8 +44,8 @@ class PIDLogger(object):
             raise Exception("MaxTime must not be negative")
             
         Period = float(Period)
-        if Period < 0:
-            raise Exception("Period must not be negative")
+        if Period <= 0:
+            raise e.SharpMinValueError("Period", Period, 0)
             
         MaxShow = int(MaxShow)
         if MaxShow <= 0:
@@ -46,6 +54,12 @@ class PIDLogger(object):
         WhiteSpaceIn = float(WhiteSpaceIn)
         WhiteSpaceOut = float(WhiteSpaceOut)
         
+        Format = str(Format).lower()
+        if not Format in ["csv", "columns"]:
+            raise e.KeywordError("Format", Format, Valid = ["csv", "columns"])
+            
+        FileKwargs = {"Format": Format, "BlockSize": BlockSize, "FlushInterval": FlushInterval, "Compress": Compress}
+        
         # Find the number of iterations
         if MaxTime == 0:
             MaxTime = 1e9
@@ -60,12 +74,12 @@ class PIDLogger(object):
             SplitName = SplitFile[1].split(".")
             
             if len(SplitName) < 2:
-                SplitName += ["csv"]
+                SplitName += ["csv" if Format == "csv" else "dat"]
     
             if len(SplitName) > 2:
                 raise Exception(f"File ({SplitFile[1]}) must only include 1 dot")
             
-            BaseFile = f"{SplitFile[0]}\\TempArduino_{Date}_{Time}_{SplitName[0]}"
+            BaseFile = os.path.join(SplitFile[0], f"{FilePrefix}_{Date}_{Time}_{SplitName[0]}")
                 
             # Check if file already exists
             if os.path.exists(f"{BaseFile}.{SplitName[1]}"):
@@ -87,82 +101,110 @@ class PIDLogger(object):
             if Name is not None:
                 TitleName = f" - {Name}"
 
-            Plotter = plotting.plot(MaxShow, 2, ("-.", "-", "-"), AxID = (0, 0, 1), Colors = ("red", "red", "blue"), Figsize = figsize, Titles = (f"Signal in{TitleName}", f"Signal out{TitleName}"), xLabels = "Time (s)", yLabels = "Signal", Labels = ("SetPoint", "Signal In", "Signal Out"), ShowBuffers = (WhiteSpaceIn, WhiteSpaceOut))
+            Plotter = plotting.newPlot("plot", MaxShow, 2, ("-.", "-", "-"), AxID = (0, 0, 1), Colors = ("red", "red", "blue"), Figsize = figsize, Titles = (f"Signal in{TitleName}", f"Signal out{TitleName}"), xLabels = "Time (s)", yLabels = "Signal", Labels = ("SetPoint", "Signal In", "Signal Out"), ShowBuffers = (WhiteSpaceIn, WhiteSpaceOut))
                     
         # If it should not wait then create the stop event
         StopEvent = th.Event()
         self.logs.append(StopEvent)
 
-        # If it should wait
-        if Wait:
-            return self._log(File, MaxTime = MaxTime, Period = Period, DataArgs = DataArgs, DataKwargs = DataKwargs, Plot = Plotter, KeepFigure = KeepFigure, StopEvent = StopEvent)
+        # The samples are taken by the shared scheduler such that the logs do not need a thread each
+        self._log(File, FileKwargs = FileKwargs, MaxTime = MaxTime, Period = Period, DataArgs = DataArgs, DataKwargs = DataKwargs, Plot = Plotter, KeepFigure = KeepFigure, StopEvent = StopEvent, Key = Key, Name = Name, Wait = Wait)
         
-        # Run the function in a new thread
-        th.Thread(target = self._log, args = (File,), kwargs = {"MaxTime": MaxTime, "Period": Period, "DataArgs": DataArgs, "DataKwargs": DataKwargs, "Plot": Plotter, "KeepFigure": KeepFigure, "StopEvent": StopEvent}).start()
+        if Wait:
+            return
 
         return StopEvent
     
     # Logs data with live plotting
     # File (str): The file path for where to save the log
-    # MaxTime (float): The time in seconds to run the logging, 0 for infinity, must not be negative
-    # Period (float): The time in seconds between each measurement, must not be negative
-    # Plot (plotting.plot): The plot to plot on, None if not plotting
-    # KeepFigure (bool): If False then it closes the live plotting when done
-    # StopEvent (threading.Event): The event to signal to stop the logging if it is set
-    def _log(self, File, **kwargs):
-        if File is not None:
-            with open(File, "w") as f:
-                self.__log(f, **kwargs)
-                
-        else:
-            self.__log(None, **kwargs)
-    
-    # Logs data with live plotting
-    # File (str): The file path for where to save the log
-    # MaxTime (float): The time in seconds to run the logging, 0 for infinity, must not be negative
-    # Period (float): The time in seconds between each measurement, must not be negative
+    # FileKwargs (dict): The format of the file and the kwargs for columnWriter if the format is "columns"
+    # MaxTime (float): The time in seconds to run the logging, must not be negative
+    # Period (float): The time in seconds between each measurement, must be positive
     # Plot (plotting.plot): The plot to plot on, None if not plotting
     # KeepFigure (bool): If False then it closes the live plotting when done
     # StopEvent (threading.Event): The event to signal to stop the logging if it is set
-    def __log(self, File, MaxTime = 0, Period = 1, DataArgs = tuple(), DataKwargs = dict(), Plot = None, KeepFigure = True, StopEvent = None):
+    # Key (hashable): Logs with the same key share one call of the data function when they are due at the same time
+    # Name (str): The name of the log used in the statistics of the scheduler
+    # Wait (bool): If True then it will wait for the log to finish and update the plot from this thread
+    def _log(self, File, FileKwargs = {"Format": "csv"}, MaxTime = 0, Period = 1, DataArgs = tuple(), DataKwargs = dict(), Plot = None, KeepFigure = True, StopEvent = None, Key = None, Name = None, Wait = False):
         import time
+        import collections
+        from . import connections
         from . import functions as fu
         
-        Count = int(MaxTime / Period)
+        FileKwargs = dict(FileKwargs)
+        Format = FileKwargs.pop("Format", "csv")
         
-        # Log start time
-        StartTime = time.time()
-                                    
-        # Write header
-        if File is not None:
+        # Open the file and write the header
+        if File is not None and Format == "columns":
+            File = columnWriter(File, ["Time", "SignalIn", "SetPoint", "SignalOut"], **FileKwargs)
+        
+        elif File is not None:
+            File = open(File, "w")
             File.write("Time,SignalIn,SetPoint,SignalOut\n")
-                    
-        # Run through the loop
-        for i in range(Count):
-            # Log the values
-            NewIn, NewSetPoint, NewOut = self._f(*DataArgs, **DataKwargs)
-            NewTime = time.time() - StartTime
-            
-            # Write to file
-            if File is not None:
-                File.write(f"{NewTime},{NewIn},{NewSetPoint},{NewOut}\n")
-            
-            # Plot
-            if Plot is not None:
-                Plot.update(NewTime, (NewSetPoint, NewIn, NewOut))
             
-            # Sleep
-            SleepTime = (i + 1) * Period - (time.time() - StartTime)
+        # When waiting the plot is updated from this thread instead of the scheduler
+        Pending = collections.deque() if Wait and Plot is not None else None
+        
+        Task = connections.getScheduler().add(Period, self.__log, FunctionArgs = (File, Plot, Pending, time.time()), Read = self._f, ReadArgs = DataArgs, ReadKwargs = DataKwargs, Key = Key, Name = Name, MaxCount = int(MaxTime / Period), StopEvent = StopEvent, Finish = lambda: self.__finish(File, None if Wait else Plot, KeepFigure), Align = Key is not None)
+        
+        if not Wait:
+            return Task
+        
+        while True:
+            Done = Task.wait(0)
             
-            fu.time.sleep(SleepTime)
-                    
-            # Stop if flag is set
-            if StopEvent is not None and StopEvent.is_set():
+            while Pending is not None and len(Pending) > 0:
+                Plot.update(*Pending.popleft())
+                
+            if Done:
                 break
+            
+            fu.time.sleep(min(Period, 0.1))
                 
         # Close figure
         if Plot is not None and not KeepFigure:
             Plot.close()
+            
+        return Task
+    
+    # Writes a sample to the file and plots it, it is called by the scheduler
+    # Count (int): The count of the sample
+    # Data (tuple of float): The return value of the data function, (SignalIn, SetPoint, SignalOut)
+    # File (file/columnWriter): The opened file to write to, None if not writing
+    # Plot (plotting.plot): The plot to plot on, None if not plotting
+    # Pending (collections.deque): The samples to plot by the waiting thread, None to plot immidiatly
+    # StartTime (float): The time the log started
+    def __log(self, Count, Data, File, Plot, Pending, StartTime):
+        import time
+        
+        NewIn, NewSetPoint, NewOut = Data
+        NewTime = time.time() - StartTime
+        
+        # Write to file
+        if isinstance(File, columnWriter):
+            File.write(NewTime, NewIn, NewSetPoint, NewOut)
+            
+        elif File is not None:
+            File.write(f"{NewTime},{NewIn},{NewSetPoint},{NewOut}\n")
+        
+        # Plot
+        if Pending is not None:
+            Pending.append((NewTime, (NewSetPoint, NewIn, NewOut)))
+        
+        elif Plot is not None:
+            Plot.update(NewTime, (NewSetPoint, NewIn, NewOut))
+                
+    # Closes the file and the figure when the log has finished
+    # File (file/columnWriter): The opened file, None if not writing
+    # Plot (plotting.plot): The plot to close, None if it should not be closed here
+    # KeepFigure (bool): If False then it closes the live plotting
+    def __finish(self, File, Plot, KeepFigure):
+        if File is not None:
+            File.close()
+            
+        if Plot is not None and not KeepFigure:
+            Plot.close()
                     
     # Kills all of the logs
     def killLogs(self):
@@ -171,3 +213,494 @@ class PIDLogger(object):
             
         self.logs = []
 
+
+# The record of a single time tag in a time tag file
+_timeTagRecord = [("Timestamp", "<i8"), ("Channel", "i1")]
+
+# The index entry of a chunk in a time tag file
+_timeTagIndex = [("StartTime", "<i8"), ("EndTime", "<i8"), ("Offset", "<i8"), ("Count", "<i8")]
+
+
+# Writes time tags to an append only file of fixed width records with an index of the chunks which can be read with timeTagReader
+# Each record is an int64 timestamp in ps and an int8 channel, the index is stored in File.idx with (StartTime, EndTime, Offset, Count) of each chunk
+class timeTagWriter(object):
+    # File (str): The file path for where to save the time tags
+    # Append (bool): If True then it will append to the file if it exists, if False then the file must not exist
+    def __init__(self, File, Append = False):
+        import os
+        import numpy as np
+        
+        self.file = str(File)
+        
+        if not Append and (os.path.exists(self.file) or os.path.exists(f"{self.file}.idx")):
+            raise e.FileExistError(self.file)
+            
+        # Continue from the end of the old file
+        Index = np.fromfile(f"{self.file}.idx", dtype = _timeTagIndex) if os.path.exists(f"{self.file}.idx") else np.zeros(0, dtype = _timeTagIndex)
+        
+        if len(Index) > 0:
+            self._count = int(Index["Offset"][-1] + Index["Count"][-1])
+            self._lastTime = int(Index["EndTime"][-1])
+            
+        else:
+            self._count = 0
+            self._lastTime = None
+            
+        self._data = open(self.file, "ab")
+        self._index = open(f"{self.file}.idx", "ab")
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        self.close()
+        
+    # Writes a chunk of time tags to the end of the file
+    # Timestamps (numpy.ndarray of int): The sorted timestamps in ps, must not be before the last written timestamp
+    # Channels (numpy.ndarray of int): The channel of each timestamp
+    def write(self, Timestamps, Channels):
+        import numpy as np
+        
+        Timestamps = np.asarray(Timestamps, dtype = np.int64)
+        Channels = np.asarray(Channels)
+        
+        if len(Timestamps) != len(Channels):
+            raise e.LengthError("Channels", Channels, len(Timestamps))
+        
+        if len(Timestamps) == 0:
+            return
+        
+        if len(Channels) > 0 and (Channels.min() < -128 or Channels.max() > 127):
+            raise e.RangeError("Channels", Channels, -128, 127)
+        
+        if self._lastTime is not None and Timestamps[0] < self._lastTime:
+            raise e.LargerVarError("The last written timestamp", self._lastTime, "Timestamps[0]", Timestamps[0])
+        
+        # Write the records
+        Records = np.empty(len(Timestamps), dtype = _timeTagRecord)
+        Records["Timestamp"] = Timestamps
+        Records["Channel"] = Channels
+        Records.tofile(self._data)
+        self._data.flush()
+        
+        # Write the index after the data such that a reader never sees a chunk before it is written
+        Chunk = np.array([(Timestamps[0], Timestamps[-1], self._count, len(Timestamps))], dtype = _timeTagIndex)
+        Chunk.tofile(self._index)
+        self._index.flush()
+        
+        self._count += len(Timestamps)
+        self._lastTime = int(Timestamps[-1])
+        
+    # Writes all of the chunks from the continuous stream of a time tagger until it has stopped
+    # TimeTagger (controllers.swabianTimeTagger): The time tagger to get the chunks from, startContinuousStream must have been called
+    # Timeout (float): The maximum time in seconds to wait for a new chunk, None to wait forever
+    # Wait (bool): If True then it will wait for the stream to finish, if False then it will write on a new thread and return the thread
+    def record(self, TimeTagger, Timeout = None, Wait = True):
+        import threading as th
+        
+        if not Wait:
+            Thread = th.Thread(target = self.record, args = (TimeTagger,), kwargs = {"Timeout": Timeout})
+            Thread.start()
+            
+            return Thread
+        
+        for Timestamps, Channels in TimeTagger.iterStream(Timeout = Timeout):
+            self.write(Timestamps, Channels)
+            
+    # Closes the file
+    def close(self):
+        self._data.close()
+        self._index.close()
+        
+        
+# Reads time tags written by timeTagWriter using memory maps such that only the requested part of the file is loaded
+class timeTagReader(object):
+    # File (str): The file path of the time tags
+    def __init__(self, File):
+        self.file = str(File)
+        self._records = None
+        
+        self.refresh()
+        
+    # Reloads the index to include chunks written since the reader was created
+    def refresh(self):
+        import numpy as np
+        
+        self._chunks = np.fromfile(f"{self.file}.idx", dtype = _timeTagIndex)
+        self._count = int(np.sum(self._chunks["Count"]))
+        
+        # A memory map can not be empty
+        if self._count > 0:
+            self._records = np.memmap(self.file, dtype = _timeTagRecord, mode = "r", shape = (self._count,))
+            
+        else:
+            self._records = None
+        
+    def __len__(self):
+        return self._count
+    
+    # Gets the number of chunks in the file
+    def getChunkCount(self):
+        return len(self._chunks)
+    
+    # Gets the time of the first and last time tag in ps, returns (None, None) if the file is empty
+    def getTimeRange(self):
+        if len(self._chunks) == 0:
+            return None, None
+        
+        return int(self._chunks["StartTime"][0]), int(self._chunks["EndTime"][-1])
+    
+    # Finds the index of the first time tag which is not before Time
+    # Time (int): The time in ps
+    def _findTime(self, Time):
+        import numpy as np
+        
+        # Find the chunk using the index and only search within that chunk
+        Chunk = int(np.searchsorted(self._chunks["EndTime"], Time, side = "left"))
+        
+        if Chunk >= len(self._chunks):
+            return self._count
+        
+        Offset = int(self._chunks["Offset"][Chunk])
+        Count = int(self._chunks["Count"][Chunk])
+        
+        return Offset + int(np.searchsorted(np.ascontiguousarray(self._records["Timestamp"][Offset:Offset + Count]), Time, side = "left"))
+    
+    # Gets the indices of the first time tag and one after the last time tag within a time range
+    # StartTime (int): The first time in ps to include, None to start from the beginning
+    # EndTime (int): The time in ps to stop before, None to continue to the end
+    def getIndexRange(self, StartTime = None, EndTime = None):
+        if self._count == 0:
+            return 0, 0
+        
+        Start = 0 if StartTime is None else self._findTime(int(StartTime))
+        End = self._count if EndTime is None else self._findTime(int(EndTime))
+        
+        return Start, max(Start, End)
+    
+    # Reads the time tags within a time range, returns (Timestamps, Channels) where Timestamps is a numpy array of int64 timestamps in ps and Channels is a numpy array of int8 channels
+    # StartTime (int): The first time in ps to include, None to start from the beginning
+    # EndTime (int): The time in ps to stop before, None to continue to the end
+    # Channels (int/list of int): The channel or channels to include, None to include all channels
+    def read(self, StartTime = None, EndTime = None, Channels = None):
+        Start, End = self.getIndexRange(StartTime = StartTime, EndTime = EndTime)
+        
+        return self._read(Start, End, Channels)
+    
+    # Reads the time tags between 2 indices
+    # Start (int): The index of the first time tag
+    # End (int): The index after the last time tag
+    # Channels (int/list of int): The channel or channels to include, None to include all channels
+    def _read(self, Start, End, Channels):
+        import numpy as np
+        
+        if End <= Start:
+            return np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int8)
+        
+        Records = self._records[Start:End]
+        Timestamps = np.array(Records["Timestamp"])
+        ReadChannels = np.array(Records["Channel"])
+        
+        if Channels is not None:
+            Mask = np.isin(ReadChannels, np.atleast_1d(np.asarray(Channels, dtype = np.int8)))
+            Timestamps = Timestamps[Mask]
+            ReadChannels = ReadChannels[Mask]
+            
+        return Timestamps, ReadChannels
+    
+    # Iterates over the time tags within a time range in pieces such that large files can be read with limited memory, yields (Timestamps, Channels) like read
+    # StartTime (int): The first time in ps to include, None to start from the beginning
+    # EndTime (int): The time in ps to stop before, None to continue to the end
+    # Channels (int/list of int): The channel or channels to include, None to include all channels
+    # ChunkSize (int): The maximum number of time tags to load at once
+    def iterRead(self, StartTime = None, EndTime = None, Channels = None, ChunkSize = 10000000):
+        ChunkSize = int(ChunkSize)
+        
+        if ChunkSize < 1:
+            raise e.MinValueError("ChunkSize", ChunkSize, 1)
+        
+        Start, End = self.getIndexRange(StartTime = StartTime, EndTime = EndTime)
+        
+        for i in range(Start, End, ChunkSize):
+            yield self._read(i, min(i + ChunkSize, End), Channels)
+            
+            
+# Converts time tags in memory to a file which can be read with timeTagReader
+# File (str): The file path for where to save the time tags
+# Timestamps (numpy.ndarray): The sorted timestamps
+# Channels (numpy.ndarray of int): The channel of each timestamp
+# TimeUnit (float): The length of a unit of Timestamps in ps, use 1000 for the timestamps in ns from swabianTimeTagger.getData
+# ChunkSize (int): The number of time tags in each chunk of the file
+def convertTimeTags(File, Timestamps, Channels, TimeUnit = 1, ChunkSize = 1000000):
+    import numpy as np
+    
+    ChunkSize = int(ChunkSize)
+    
+    if ChunkSize < 1:
+        raise e.MinValueError("ChunkSize", ChunkSize, 1)
+    
+    with timeTagWriter(File) as Writer:
+        for i in range(0, len(Timestamps), ChunkSize):
+            Chunk = np.asarray(Timestamps[i:i + ChunkSize])
+            
+            if float(TimeUnit) != 1:
+                Chunk = np.round(Chunk * float(TimeUnit))
+                
+            Writer.write(Chunk.astype(np.int64), Channels[i:i + ChunkSize])
+
+
+# The index entry of a block in a column file
+_columnIndex = [("StartTime", "<f8"), ("EndTime", "<f8"), ("Offset", "<i8"), ("Size", "<i8"), ("Count", "<i8")]
+
+
+# Writes rows of float values to an append only file of blocks which can be read with columnReader, the first column must be the time and must never decrease
+# The rows are gathered in memory and written as a block when BlockSize rows have been gathered or FlushInterval has passed, each block stores the columns one after another and may be compressed
+# The column names and compression are stored in File.hdr and the index is stored in File.idx with (StartTime, EndTime, Offset, Size, Count) of each block
+class columnWriter(object):
+    # File (str): The file path for where to save the rows
+    # Columns (list of str): The name of each column
+    # BlockSize (int): The maximum number of rows in a block
+    # FlushInterval (float): The maximum time in seconds to keep rows in memory before writing them, None to only write full blocks
+    # Compress (bool): If True then the blocks are compressed with zlib
+    # Append (bool): If True then it will append to the file if it exists, the columns must be the same, if False then the file must not exist
+    def __init__(self, File, Columns, BlockSize = 3600, FlushInterval = 60, Compress = True, Append = False):
+        import os
+        import json
+        import time
+        import numpy as np
+        
+        self.file = str(File)
+        self.columns = [str(Column) for Column in Columns]
+        
+        if len(self.columns) < 1:
+            raise e.MinLengthError("Columns", Columns, 1)
+        
+        if int(BlockSize) < 1:
+            raise e.MinValueError("BlockSize", BlockSize, 1)
+            
+        if FlushInterval is not None and float(FlushInterval) < 0:
+            raise e.MinValueError("FlushInterval", FlushInterval, 0)
+        
+        if not Append and (os.path.exists(self.file) or os.path.exists(f"{self.file}.idx")):
+            raise e.FileExistError(self.file)
+            
+        self._blockSize = int(BlockSize)
+        self._flushInterval = None if FlushInterval is None else float(FlushInterval)
+        self._compress = bool(Compress)
+        
+        # Continue from the end of the old file
+        if os.path.exists(f"{self.file}.hdr"):
+            with open(f"{self.file}.hdr", "r") as f:
+                Header = json.load(f)
+                
+            if Header["Columns"] != self.columns:
+                raise e.KeywordError("Columns", self.columns, Valid = Header["Columns"])
+            
+            self._compress = Header["Compress"]
+            
+        else:
+            with open(f"{self.file}.hdr", "w") as f:
+                json.dump({"Columns": self.columns, "Compress": self._compress}, f)
+        
+        Index = np.fromfile(f"{self.file}.idx", dtype = _columnIndex) if os.path.exists(f"{self.file}.idx") else np.zeros(0, dtype = _columnIndex)
+        
+        if len(Index) > 0:
+            self._offset = int(Index["Offset"][-1] + Index["Size"][-1])
+            self._lastTime = float(Index["EndTime"][-1])
+            
+        else:
+            self._offset = 0
+            self._lastTime = None
+        
+        # The rows waiting to be written
+        self._rows = np.zeros((self._blockSize, len(self.columns)))
+        self._rowCount = 0
+        self._lastFlush = time.time()
+            
+        self._data = open(self.file, "ab")
+        self._index = open(f"{self.file}.idx", "ab")
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, ExceptionType, ExceptionValue, Traceback):
+        self.close()
+        
+    # Adds a row, it is written when the block is full or the flush interval has passed
+    # Values (float): The value of each column
+    def write(self, *Values):
+        import time
+        
+        if len(Values) != len(self.columns):
+            raise e.LengthError("Values", Values, len(self.columns))
+        
+        Time = float(Values[0])
+        
+        if self._lastTime is not None and Time < self._lastTime:
+            raise e.LargerVarError("The last written time", self._lastTime, "Values[0]", Time)
+        
+        self._rows[self._rowCount] = Values
+        self._rowCount += 1
+        self._lastTime = Time
+        
+        if self._rowCount == self._blockSize or (self._flushInterval is not None and time.time() - self._lastFlush >= self._flushInterval):
+            self.flush()
+            
+    # Adds many rows at once
+    # Rows (numpy.ndarray of float): A 2D array with a row for each sample and a column for each column
+    def writeRows(self, Rows):
+        import numpy as np
+        
+        Rows = np.asarray(Rows, dtype = float)
+        
+        if Rows.ndim != 2 or Rows.shape[1] != len(self.columns):
+            raise e.LengthError("The rows of Rows", Rows, len(self.columns))
+        
+        for Row in Rows:
+            self.write(*Row)
+        
+    # Writes the rows in memory as a block
+    def flush(self):
+        import time
+        import zlib
+        import numpy as np
+        
+        self._lastFlush = time.time()
+        
+        if self._rowCount == 0:
+            return
+        
+        Rows = self._rows[:self._rowCount]
+        Block = np.ascontiguousarray(Rows.T).tobytes()
+        
+        if self._compress:
+            Block = zlib.compress(Block)
+            
+        self._data.write(Block)
+        self._data.flush()
+        
+        # Write the index after the data such that a reader never sees a block before it is written
+        Entry = np.array([(Rows[0, 0], Rows[-1, 0], self._offset, len(Block), self._rowCount)], dtype = _columnIndex)
+        Entry.tofile(self._index)
+        self._index.flush()
+        
+        self._offset += len(Block)
+        self._rowCount = 0
+        
+    # Writes the remaining rows and closes the file
+    def close(self):
+        if self._data.closed:
+            return
+        
+        self.flush()
+        self._data.close()
+        self._index.close()
+        
+        
+# Reads files written by columnWriter, only the blocks within the requested time window are read
+class columnReader(object):
+    # File (str): The file path of the rows
+    def __init__(self, File):
+        import json
+        
+        self.file = str(File)
+        
+        with open(f"{self.file}.hdr", "r") as f:
+            Header = json.load(f)
+            
+        self.columns = Header["Columns"]
+        self._compress = Header["Compress"]
+        
+        self.refresh()
+        
+    # Reloads the index to include blocks written since the reader was created
+    def refresh(self):
+        import numpy as np
+        
+        self._blocks = np.fromfile(f"{self.file}.idx", dtype = _columnIndex)
+        self._count = int(np.sum(self._blocks["Count"]))
+        
+    def __len__(self):
+        return self._count
+    
+    # Gets the number of blocks in the file
+    def getBlockCount(self):
+        return len(self._blocks)
+    
+    # Gets the time of the first and last row, returns (None, None) if the file is empty
+    def getTimeRange(self):
+        if len(self._blocks) == 0:
+            return None, None
+        
+        return float(self._blocks["StartTime"][0]), float(self._blocks["EndTime"][-1])
+    
+    # Reads a block, returns a 2D array with a row for each column
+    # Block (int): The index of the block
+    # f (file): The opened data file
+    def _readBlock(self, Block, f):
+        import zlib
+        import numpy as np
+        
+        f.seek(int(self._blocks["Offset"][Block]))
+        Data = f.read(int(self._blocks["Size"][Block]))
+        
+        if self._compress:
+            Data = zlib.decompress(Data)
+            
+        return np.frombuffer(Data, dtype = float).reshape(len(self.columns), int(self._blocks["Count"][Block]))
+    
+    # Reads the rows within a time window, returns a dict with a numpy array for each column
+    # StartTime (float): The first time to include, None to start from the beginning
+    # EndTime (float): The time to stop before, None to continue to the end
+    # Columns (list of str): The columns to read, None to read all of them
+    def read(self, StartTime = None, EndTime = None, Columns = None):
+        import numpy as np
+        
+        if Columns is None:
+            Columns = self.columns
+            
+        for Column in Columns:
+            if not Column in self.columns:
+                raise e.KeywordError("Columns", Column, Valid = self.columns)
+                
+        ColumnIDs = [self.columns.index(Column) for Column in Columns]
+        
+        # Find the blocks within the window using the index
+        First = 0 if StartTime is None else int(np.searchsorted(self._blocks["EndTime"], float(StartTime), side = "left"))
+        Last = len(self._blocks) if EndTime is None else int(np.searchsorted(self._blocks["StartTime"], float(EndTime), side = "left"))
+        
+        Data = [np.zeros((len(self.columns), 0))]
+        
+        with open(self.file, "rb") as f:
+            for Block in range(First, Last):
+                Data.append(self._readBlock(Block, f))
+                
+        Data = np.concatenate(Data, axis = 1)
+        
+        # Only keep the rows within the window
+        Mask = np.ones(Data.shape[1], dtype = bool)
+        
+        if StartTime is not None:
+            Mask &= Data[0] >= float(StartTime)
+            
+        if EndTime is not None:
+            Mask &= Data[0] < float(EndTime)
+        
+        return {Column: Data[ID][Mask] for Column, ID in zip(Columns, ColumnIDs)}
+    
+    
+# Converts a csv log from PIDLogger to a file which can be read with columnReader
+# CSVFile (str): The file path of the csv log
+# File (str): The file path for where to save the rows
+# BlockSize (int): The number of rows in each block
+# Compress (bool): If True then the blocks are compressed
+def convertLog(CSVFile, File, BlockSize = 3600, Compress = True):
+    import numpy as np
+    
+    with open(CSVFile, "r") as f:
+        Columns = f.readline().strip().split(",")
+        
+    Rows = np.loadtxt(CSVFile, delimiter = ",", skiprows = 1, ndmin = 2)
+    
+    with columnWriter(File, Columns, BlockSize = BlockSize, FlushInterval = None, Compress = Compress) as Writer:
+        Writer.writeRows(Rows)
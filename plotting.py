@@ -1,5 +1,56 @@
+import os
+import sys
+import itertools
 import matplotlib
-matplotlib.use("Qt5Agg")
+
+# Chooses Qt for the live plots unless a backend has been chosen with MPLBACKEND, without Qt or a display it falls back to Agg such that the library can be imported on servers
+def _chooseBackend():
+    import importlib.util
+    
+    if "MPLBACKEND" in os.environ:
+        return
+    
+    HasQt = importlib.util.find_spec("PyQt5") is not None or importlib.util.find_spec("PySide2") is not None
+    HasDisplay = not sys.platform.startswith("linux") or "DISPLAY" in os.environ or "WAYLAND_DISPLAY" in os.environ
+    
+    if HasQt and HasDisplay:
+        matplotlib.use("Qt5Agg")
+        
+    else:
+        matplotlib.use("Agg")
+        
+_chooseBackend()
+
+# How plots created with newPlot are run
+_plotMode = {"Remote": False, "Backend": None, "SaveDir": None}
+_plotCount = itertools.count()
+_plotClasses = ["histogram", "plot", "renewPlot"]
+
+# Sets how plots created with newPlot are run, this is used by the plots made in loggers and equipment
+# Remote (bool): If True then the plots are run in a separate process such that updating them never waits for the drawing
+# Backend (str): The matplotlib backend to use in the separate process, "Agg" to not show the plots, None to use the default
+# SaveDir (str): The directory to save every frame of each plot into as a png file, None to not save them
+def setPlotMode(Remote = False, Backend = None, SaveDir = None):
+    _plotMode["Remote"] = bool(Remote)
+    _plotMode["Backend"] = Backend
+    _plotMode["SaveDir"] = SaveDir
+    
+# Creates a live plot using the mode set by setPlotMode
+# PlotClass (str): The name of the live plot class, must be one of "histogram", "plot" or "renewPlot"
+# args and kwargs are used for the plot class
+def newPlot(PlotClass, *args, **kwargs):
+    from . import exceptions as e
+    
+    if not PlotClass in _plotClasses:
+        raise e.KeywordError("PlotClass", PlotClass, Valid = _plotClasses)
+        
+    if _plotMode["SaveDir"] is not None and not "SaveFile" in kwargs:
+        kwargs["SaveFile"] = os.path.join(_plotMode["SaveDir"], f"{PlotClass}_{next(_plotCount)}.png")
+        
+    if _plotMode["Remote"]:
+        return remotePlot(PlotClass, *args, Backend = _plotMode["Backend"], **kwargs)
+    
+    return globals()[PlotClass](*args, **kwargs)
 
 # Sets up an ax to allow zooming in live plotting
 # Ax (matplotlib.Axes): The ax to set up
@@ -31,19 +82,237 @@ def axSetYLim(Ax, yMin, yMax):
     Ax._currentView = (Ax._currentView[0], Ax._currentView[1], yMin, yMax)
     axUpdate(Ax)
 
+# Sets the limits of both axes without changing user zoom
+# Ax (matplotlib.Axes): The ax to change limits for
+# xMin (float): The minimum x value
+# xMax (float): The maximum x value
+# yMin (float): The minimum y value
+# yMax (float): The maximum y value
+def axSetLim(Ax, xMin, xMax, yMin, yMax):
+    Ax._currentView = (xMin, xMax, yMin, yMax)
+    axUpdate(Ax)
+
+# A buffer of fixed size where new values overwrite the oldest ones without moving any data, every value is stored twice such that the newest values are always available as a contiguous array
+class ringBuffer:
+    # Size (int): The maximum number of values to keep
+    # Shape (tuple of int): The shape of each value
+    # Fill (float): The value to fill the buffer with before any values are added
+    # TrackExtremes (bool): If True then the minimum and maximum of the values in the buffer are kept up to date on each append with monotonic queues, only for single values
+    def __init__(self, Size, *args, Shape = tuple(), Fill = 0., TrackExtremes = False, **kwargs):
+        import numpy as np
+        import collections
+        
+        super().__init__(*args, **kwargs)
+        
+        self._size = max(1, int(Size))
+        self._fill = Fill
+        self._data = np.full((2 * self._size,) + tuple(Shape), Fill, dtype = float)
+        self._pos = 0
+        self._count = 0
+        
+        # The queues hold (Index, Value) of the values which may still become the minimum or maximum
+        self._added = 0
+        self._minQueue = None
+        self._maxQueue = None
+        
+        if TrackExtremes:
+            self._minQueue = collections.deque()
+            self._maxQueue = collections.deque()
+        
+    def __len__(self):
+        return self._count
+    
+    # Adds a value, overwriting the oldest value if the buffer is full
+    # Value (float/numpy.ndarray): The value to add
+    def append(self, Value):
+        self._data[self._pos] = Value
+        self._data[self._pos + self._size] = Value
+        
+        self._pos = (self._pos + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        
+        if self._minQueue is not None:
+            self._trackExtremes(float(Value))
+            
+        self._added += 1
+        
+    # Updates the minimum and maximum with a new value
+    # Value (float): The new value
+    def _trackExtremes(self, Value):
+        # Values which can never be the extreme again are removed
+        while len(self._minQueue) > 0 and self._minQueue[-1][1] >= Value:
+            self._minQueue.pop()
+            
+        while len(self._maxQueue) > 0 and self._maxQueue[-1][1] <= Value:
+            self._maxQueue.pop()
+            
+        self._minQueue.append((self._added, Value))
+        self._maxQueue.append((self._added, Value))
+        
+        # Remove the values which have been overwritten
+        Oldest = self._added - self._size
+        
+        while self._minQueue[0][0] <= Oldest:
+            self._minQueue.popleft()
+            
+        while self._maxQueue[0][0] <= Oldest:
+            self._maxQueue.popleft()
+            
+    # Gets the minimum of the values in the buffer, None if it is empty, requires TrackExtremes
+    def getMin(self):
+        if len(self._minQueue) == 0:
+            return None
+        
+        return self._minQueue[0][1]
+    
+    # Gets the maximum of the values in the buffer, None if it is empty, requires TrackExtremes
+    def getMax(self):
+        if len(self._maxQueue) == 0:
+            return None
+        
+        return self._maxQueue[0][1]
+        
+    # Gets a view of the newest values with the oldest first, the view must not be changed and is only valid until the next append
+    # Count (int): The number of values to get, None to get all values in the buffer
+    def getValues(self, Count = None):
+        if Count is None:
+            Count = self._count
+            
+        End = self._pos + self._size
+        
+        return self._data[End - int(Count):End]
+    
+    # Gets the value which will be overwritten by the next append
+    def getOldest(self):
+        return self._data[self._pos]
+    
+    # Gets the newest value
+    def getNewest(self):
+        return self._data[self._pos + self._size - 1]
+    
+    # Checks if the buffer is full
+    def isFull(self):
+        return self._count == self._size
+    
+    # Removes all values
+    def clear(self):
+        self._data[:] = self._fill
+        self._pos = 0
+        self._count = 0
+        self._added = 0
+        
+        if self._minQueue is not None:
+            self._minQueue.clear()
+            self._maxQueue.clear()
+
+# Accumulates arrays by an exponential moving average or by the average of a sliding window of the newest arrays, all memory is allocated when the first array is added
+class accumulator:
+    # Mode (str): The accumulation mode, must be one of "off": Use the newest array only, "ema": Exponential moving average where each new array has a weight of 1 / Count, "window": The average of the newest Count arrays
+    # Count (int): The number of arrays to average over
+    def __init__(self, Mode = "off", Count = 10, *args, **kwargs):
+        from . import exceptions as e
+        
+        super().__init__(*args, **kwargs)
+        
+        Mode = str(Mode).lower()
+        
+        if not Mode in ["off", "ema", "window"]:
+            raise e.KeywordError("Mode", Mode, Valid = ["off", "ema", "window"])
+            
+        if int(Count) < 1:
+            raise e.MinValueError("Count", Count, 1)
+            
+        self._mode = Mode
+        self._count = int(Count)
+        self.reset()
+        
+    # Adds an array and returns the accumulated array, the returned array must not be changed
+    # Values (numpy.ndarray): The array to add
+    def add(self, Values):
+        import numpy as np
+        
+        Values = np.asarray(Values, dtype = float)
+        self._added += 1
+        
+        if self._mode == "off":
+            self._value = Values
+            
+        # Allocate the memory with the first array
+        elif self._value is None:
+            self._value = Values.copy()
+            
+            if self._mode == "window":
+                self._buffer = ringBuffer(self._count, Shape = Values.shape)
+                self._buffer.append(Values)
+                self._sum = Values.copy()
+        
+        # Exponential moving average
+        elif self._mode == "ema":
+            self._value += (Values - self._value) / self._count
+            
+        # Average of the window
+        else:
+            if self._buffer.isFull():
+                self._sum -= self._buffer.getOldest()
+                
+            self._sum += Values
+            self._buffer.append(Values)
+            np.divide(self._sum, len(self._buffer), out = self._value)
+            
+        return self._value
+    
+    # Gets a copy of the accumulated array, None if nothing has been added
+    def get(self):
+        if self._value is None:
+            return None
+        
+        return self._value.copy()
+    
+    # Gets the number of arrays added since the last reset
+    def getCount(self):
+        return self._added
+    
+    # Removes all the accumulated arrays
+    def reset(self):
+        self._value = None
+        self._buffer = None
+        self._sum = None
+        self._added = 0
+
 # A class to implement live plotting, it must be subclassed and the update function must be expanded
 class livePlot:
     # Fig (matplotlib.Figure): The figure of this plot
     # Axes (list of matplotlib.Axes): The list of axes used in this plot
-    def __init__(self, Fig, Axes, *args, InitArgs = tuple(), InitKwargs = dict(), **kwargs):
+    # Blit (bool): If True then only the lines and titles are redrawn on top of a cached background, the whole figure is only redrawn when the limits of an axis change
+    # MaxFrameRate (float): The maximum number of redraws per second, updates coming faster are drawn with the next redraw, None for no limit
+    # SaveFile (str): The file to save the figure to every time it is redrawn, None to not save it
+    def __init__(self, Fig, Axes, *args, Blit = False, MaxFrameRate = None, SaveFile = None, InitArgs = tuple(), InitKwargs = dict(), **kwargs):
+        from . import exceptions as e
+        
         super().__init__(*args, **kwargs)
                 
         # Save figure and axes
         self.fig = Fig
         self.axes = Axes
         
-        # Add callback
-        self.fig.canvas.toolbar.actions()[0].triggered.connect(self.home)
+        # Add callback, there is no toolbar without a gui
+        if hasattr(self.fig.canvas.toolbar, "actions"):
+            self.fig.canvas.toolbar.actions()[0].triggered.connect(self.home)
+        
+        # Setup drawing
+        if MaxFrameRate is not None and float(MaxFrameRate) <= 0:
+            raise e.SharpMinValueError("MaxFrameRate", MaxFrameRate, 0)
+            
+        self._blit = bool(Blit)
+        self._minFrameTime = 0. if MaxFrameRate is None else 1 / float(MaxFrameRate)
+        self._lastFrame = 0.
+        self._pending = False
+        self._background = None
+        self._limits = None
+        self._saveFile = SaveFile
+        
+        if self._blit:
+            self.fig.canvas.mpl_connect("draw_event", self._onDraw)
         
         # Set up the axes
         for Ax in self.axes:
@@ -67,9 +336,82 @@ class livePlot:
         
     # Updates the plot with new values
     def update(self):
-        self.fig.canvas.draw()
+        import time
+        
+        # Limit the frame rate, the newest values are drawn with the next frame
+        Now = time.perf_counter()
+        
+        if Now - self._lastFrame < self._minFrameTime:
+            self._pending = True
+            self.fig.canvas.flush_events()
+            return
+        
+        self._lastFrame = Now
+        self._pending = False
+        self._prepareFrame()
+        
+        if self._blit:
+            self._blitDraw()
+            
+        else:
+            self.fig.canvas.draw()
+            
+        if self._saveFile is not None:
+            self.fig.savefig(self._saveFile)
+            
         self.fig.canvas.flush_events()
         
+    # Updates the artists before a frame is drawn, it is not called for skipped frames
+    def _prepareFrame(self):
+        pass
+        
+    # Draws the newest values if they were skipped because of the frame rate limit
+    def flush(self):
+        if self._pending:
+            self._lastFrame = 0.
+            livePlot.update(self)
+        
+    # Gets the artists which are redrawn on every update when blitting
+    def _getBlitArtists(self):
+        Artists = []
+        
+        for Ax in self.axes:
+            Artists += Ax.get_lines()
+            Artists.append(Ax.title)
+            
+        return Artists
+    
+    # Redraws only the artists on top of the cached background, redraws everything if the limits have changed
+    def _blitDraw(self):
+        Artists = self._getBlitArtists()
+        Limits = [(Ax.get_xlim(), Ax.get_ylim()) for Ax in self.axes]
+        
+        # The background is out of date
+        if self._background is None or Limits != self._limits or not all(Artist.get_animated() for Artist in Artists):
+            for Artist in Artists:
+                Artist.set_animated(True)
+                
+            self._limits = Limits
+            self.fig.canvas.draw()
+            return
+            
+        self.fig.canvas.restore_region(self._background)
+        
+        for Artist in Artists:
+            self.fig.draw_artist(Artist)
+            
+        self.fig.canvas.blit(self.fig.bbox)
+        
+    # Caches the background after a full redraw and draws the artists on top
+    # Event (matplotlib.backend_bases.DrawEvent): The draw event
+    def _onDraw(self, Event):
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._limits = [(Ax.get_xlim(), Ax.get_ylim()) for Ax in self.axes]
+        
+        for Artist in self._getBlitArtists():
+            if Artist.get_animated():
+                self.fig.draw_artist(Artist)
+        
     # Closes the figure
     def close(self):
         import matplotlib.pyplot as plt
@@ -109,7 +451,9 @@ class histogram(livePlot):
     # GateYLabels (list of str): The y labels for each of the gates
     # GatePrecision (list of int): The number of digits to show for each of the gate values
     # GateFontSize (int): The size of the gate titles
-    def __init__(self, xValues, *args, GateCount = 0, Gates = [], History = 10, GateShowBuffer = 0.1, BaseSize = (8, 4), GatesPerRow = 2, BackgroundMode = "off", Title = "Histogram", xLabel = "Time (ns)", yLabel = "Counts", GateTitles = None, GateXLabels = None, GateYLabels = None, GatePrecision = None, GateFontSize = 40, **kwargs):
+    # Accumulate (str): How to accumulate the histograms, must be one of "off": Show the newest histogram, "ema": Show the exponential moving average where each new histogram has a weight of 1 / AccumulateCount, "window": Show the average of the newest AccumulateCount histograms
+    # AccumulateCount (int): The number of histograms to accumulate over
+    def __init__(self, xValues, *args, GateCount = 0, Gates = [], History = 10, GateShowBuffer = 0.1, BaseSize = (8, 4), GatesPerRow = 2, BackgroundMode = "off", Title = "Histogram", xLabel = "Time (ns)", yLabel = "Counts", GateTitles = None, GateXLabels = None, GateYLabels = None, GatePrecision = None, GateFontSize = 40, Accumulate = "off", AccumulateCount = 10, **kwargs):
         import numpy as np
         import matplotlib.pyplot as plt
         from . import exceptions as e
@@ -150,9 +494,13 @@ class histogram(livePlot):
         self._fontSize = GateFontSize
         
         self._maxValueCount = int(History)
-        self._gateX = np.zeros(History)
         self._gateBuffer = float(GateShowBuffer)
         
+        # Make sure the accumulation settings are correct
+        self._accumulate = str(Accumulate).lower()
+        self._accumulateCount = int(AccumulateCount)
+        accumulator(self._accumulate, self._accumulateCount)
+        
         # Initialize the plots
         InitArgs = (xValues,)
         InitKwargs = {"GateCount": GateCount, "Gates": Gates, "History": History, "BackgroundMode": BackgroundMode, "Title": Title, "xLabel": xLabel, "yLabel": yLabel, "GateXLabels": GateXLabels, "GateYLabels": GateYLabels}
@@ -175,6 +523,8 @@ class histogram(livePlot):
             self._lineHistSub, = self._axHist.plot(xValues, np.zeros_like(xValues), "-", color = "yellow")
         
         self._histBackValues = np.zeros_like(xValues)
+        self._histAcc = accumulator(self._accumulate, self._accumulateCount)
+        self._histBackAcc = accumulator(self._accumulate, self._accumulateCount)
         
         # Format histogram
         axSetYLim(self._axHist, -1, 1)
@@ -190,13 +540,15 @@ class histogram(livePlot):
         if BackgroundMode == "subtract":
             self._gateLinesSub = [self._axGates[i].plot(np.zeros(History), np.zeros(History), "-", color = "yellow")[0] for i in range(GateCount)]
         
-        self._gateValues = [np.zeros(History) for _ in range(GateCount)]
+        # The gate histories are kept in ring buffers such that nothing is moved or allocated on update
+        self._gateX = ringBuffer(History)
+        self._gateValues = [ringBuffer(History) for _ in range(GateCount)]
         self._gateValuesBack = [None] * GateCount
         if BackgroundMode in ["on", "subtract"]:
-            self._gateValuesBack = [np.zeros(History) for _ in range(GateCount)]
+            self._gateValuesBack = [ringBuffer(History) for _ in range(GateCount)]
         self._gateValuesSub = [None] * GateCount
         if BackgroundMode == "subtract":
-            self._gateValuesSub = [np.zeros(History) for _ in range(GateCount)]
+            self._gateValuesSub = [ringBuffer(History) for _ in range(GateCount)]
         
         # Plot them
         for Gate in Gates:
@@ -223,6 +575,11 @@ class histogram(livePlot):
 
         if GateValuesBackground is None:
             GateValuesBackground = [None] * len(GateValues)
+            
+        # Accumulate the histograms
+        Bins = self._histAcc.add(Bins)
+        if BinsBackground is not None and self._lineHistBack is not None:
+            BinsBackground = self._histBackAcc.add(BinsBackground)
         
         # Update the histogram
         self._lineHist.set_ydata(Bins)
@@ -245,48 +602,44 @@ class histogram(livePlot):
             if self._showValues < self._maxValueCount:
                 self._showValues += 1
                 
-            self._gateX = np.roll(self._gateX, -1)
-            self._gateX[-1] = self._gateX[-2] + 1
+            self._gateX.append(self._gateX.getNewest() + 1)
 
-            for i, (Ax, Line, LineSub, Values, ValuesBack, ValuesSub, NewValue, NewValueBack, Title, Prec) in enumerate(zip(self._axGates, self._gateLines, self._gateLinesSub, self._gateValues, self._gateValuesBack, self._gateValuesSub, GateValues, GateValuesBackground, self._gateTitles, self._gatePrec)):
+            for Ax, Line, LineSub, Values, ValuesBack, ValuesSub, NewValue, NewValueBack, Title, Prec in zip(self._axGates, self._gateLines, self._gateLinesSub, self._gateValues, self._gateValuesBack, self._gateValuesSub, GateValues, GateValuesBackground, self._gateTitles, self._gatePrec):
                 # Add new value
-                Values = np.roll(Values, -1)
-                self._gateValues[i] = Values
-                Values[-1] = NewValue
+                Values.append(NewValue)
                 if ValuesBack is not None:
-                    ValuesBack = np.roll(ValuesBack, -1)
-                    self._gateValuesBack[i] = ValuesBack
                     if NewValueBack is not None:
-                        ValuesBack[-1] = NewValueBack  
+                        ValuesBack.append(NewValueBack)
                     else:
-                        ValuesBack[-1] = ValuesBack[-2]  
+                        ValuesBack.append(ValuesBack.getNewest())
                 if ValuesSub is not None:
-                    ValuesSub = np.roll(ValuesSub, -1)
-                    self._gateValuesSub[i] = ValuesSub
-                    ValuesSub[-1] = Values[-1] - ValuesBack[-1]
+                    ValuesSub.append(Values.getNewest() - ValuesBack.getNewest())
                 
                 # Update title
                 PutTitle = f"{Title}{NewValue:.{Prec}g}"
                 if ValuesBack is not None:
-                    STN = (Values[-1] - ValuesBack[-1]) / max(1, ValuesBack[-1])
+                    STN = (Values.getNewest() - ValuesBack.getNewest()) / max(1, ValuesBack.getNewest())
                     PutTitle = f"{PutTitle} ({STN:.2g})"
                 Ax.set_title(PutTitle, fontsize = self._fontSize)
                 
                 # Update plot
                 if self._showValues > 1:
-                    Line.set_xdata(self._gateX[-self._showValues:])
+                    xValues = self._gateX.getValues(self._showValues)
+                    Line.set_xdata(xValues)
                     if ValuesSub is not None:
-                        LineSub.set_xdata(self._gateX[-self._showValues:])
-                    axSetXLim(Ax, self._gateX[-self._showValues], self._gateX[-1])
+                        LineSub.set_xdata(xValues)
+                    axSetXLim(Ax, xValues[0], xValues[-1])
     
-                    Line.set_ydata(Values[-self._showValues:])
+                    ShowValues = Values.getValues(self._showValues)
+                    Line.set_ydata(ShowValues)
                     if ValuesSub is not None:
-                        LineSub.set_ydata(ValuesSub[-self._showValues:])  
-                    Min = np.min((Values[-self._showValues:]))
-                    Max = np.max((Values[-self._showValues:]))
+                        ShowValuesSub = ValuesSub.getValues(self._showValues)
+                        LineSub.set_ydata(ShowValuesSub)  
+                    Min = np.min(ShowValues)
+                    Max = np.max(ShowValues)
                     if ValuesSub is not None:
-                        Min = min(Min, np.min((ValuesSub[-self._showValues:])))
-                        Max = max(Max, np.max((ValuesSub[-self._showValues:])))
+                        Min = min(Min, np.min(ShowValuesSub))
+                        Max = max(Max, np.max(ShowValuesSub))
                     BuffSize = (Max - Min) * self._gateBuffer
                     if BuffSize == 0:
                         BuffSize = 1
@@ -295,6 +648,28 @@ class histogram(livePlot):
         # Update canvas
         super().update()
         
+    # Gets the accumulated histogram, None if there has not been any updates
+    def getBins(self):
+        return self._histAcc.get()
+    
+    # Gets the accumulated background histogram, None if there has not been any background updates
+    def getBinsBackground(self):
+        return self._histBackAcc.get()
+    
+    # Gets the number of histograms accumulated since the last reset
+    def getAccumulatedCount(self):
+        return self._histAcc.getCount()
+    
+    # Gets the history of the gates with the oldest value first, returns (x, Values, ValuesBackground, ValuesSubtracted) where Values, ValuesBackground and ValuesSubtracted are lists with an array for each gate, or None for each gate if not used
+    def getGateHistory(self):
+        def Copy(Buffer):
+            if Buffer is None:
+                return None
+            
+            return Buffer.getValues(self._showValues).copy()
+        
+        return self._gateX.getValues(self._showValues).copy(), [Copy(Values) for Values in self._gateValues], [Copy(Values) for Values in self._gateValuesBack], [Copy(Values) for Values in self._gateValuesSub]
+        
         
 # Creates a live plot for normal data that is gathered one point at the time
 class plot(livePlot):
@@ -312,7 +687,6 @@ class plot(livePlot):
     # ShowBuffers (list of float/float): The white space buffer at the top and buttom of each plot in percentage, if only one is given then it will be the same for each plot
     def __init__(self, MaxSize, AxCount, Shapes, *args, AxID = None, Colors = None, BackgroundModes = None, Labels = None, Figsize = (8, 8), Titles = "", xLabels = "", yLabels = "", ShowBuffers = 0.1, **kwargs):
         import matplotlib.pyplot as plt
-        import numpy as np
 
         AxCount = int(AxCount)
                 
@@ -364,7 +738,7 @@ class plot(livePlot):
         self._axCount = AxCount
 
         self._maxSize = max(1, int(MaxSize))
-        self._x = np.zeros(self._maxSize)
+        self._x = ringBuffer(self._maxSize, TrackExtremes = True)
         
         InitArgs = (Shapes,)
         InitKwargs = {"AxID": AxID, "Colors": Colors, "BackgroundModes": BackgroundModes, "Labels": Labels, "Titles": Titles, "xLabels": xLabels, "yLabels": yLabels}
@@ -374,13 +748,12 @@ class plot(livePlot):
     # Initializes the plot
     def _init(self, Shapes, AxID = None, Colors = None, BackgroundModes = None, Labels = None, Titles = "", xLabels = "", yLabels = ""):
         from . import exceptions as e
-        import numpy as np
 
         # Set the ax ID
         self._ID = AxID
 
         # Make sure the size is not too low
-        self._pos = 0
+        self._x.clear()
                 
         # Create plots and save arrays
         self._values = []
@@ -406,8 +779,8 @@ class plot(livePlot):
                 Color = (Color,) * 3
 
             if BackgroundMode != "subtract_only":
-                self._values.append(np.zeros(self._maxSize))
-                NewLine, = self.axes[ID].plot(self._x, self._values[-1], Shape, color = Color[0], label = Label)                
+                self._values.append(ringBuffer(self._maxSize, TrackExtremes = True))
+                NewLine, = self.axes[ID].plot([], [], Shape, color = Color[0], label = Label)                
                 self._lines.append(NewLine)
 
             else:
@@ -416,8 +789,8 @@ class plot(livePlot):
             
             # Background values
             if BackgroundMode in ["on", "subtract"]:
-                self._valuesBack.append(np.zeros(self._maxSize))                
-                NewLine, = self.axes[ID].plot(self._x, self._valuesBack[-1], Shape, color = Color[1], label = f"{Label} background")                
+                self._valuesBack.append(ringBuffer(self._maxSize, TrackExtremes = True))                
+                NewLine, = self.axes[ID].plot([], [], Shape, color = Color[1], label = f"{Label} background")                
                 self._linesBack.append(NewLine)
 
             else:
@@ -426,8 +799,8 @@ class plot(livePlot):
                 
             # Subtracted values
             if BackgroundMode in ["subtract", "subtract_only", "subtract_noback"]:
-                self._valuesSub.append(np.zeros(self._maxSize))
-                NewLine, = self.axes[ID].plot(self._x, self._valuesSub[-1], Shape, color = Color[2], label = f"{Label} subtracted")
+                self._valuesSub.append(ringBuffer(self._maxSize, TrackExtremes = True))
+                NewLine, = self.axes[ID].plot([], [], Shape, color = Color[2], label = f"{Label} subtracted")
                 self._linesSub.append(NewLine)
 
             else:
@@ -451,7 +824,6 @@ class plot(livePlot):
     # BackgroundValues (list of float): The values of the background for each plot, None if not needed
     def update(self, x, Values, BackgroundValues = None):
         import numbers
-        import numpy as np
         
         # Make sure they are tuples
         if isinstance(Values, numbers.Number):
@@ -461,14 +833,6 @@ class plot(livePlot):
         if BackgroundValues is None:
             BackgroundValues = (None,) * len(Values)
         
-        # Roll arrays
-        self._x = np.roll(self._x, -1)
-        
-        for i in range(len(self._values)):
-            for List in [self._values, self._valuesBack, self._valuesSub]:
-                if List[i] is not None:
-                    List[i] = np.roll(List[i], -1)
-    
         # Get latest background values
         for i, Value in enumerate(BackgroundValues):
             if Value is not None:
@@ -482,38 +846,38 @@ class plot(livePlot):
                 SubList.append(Value - ValueBack)
     
         # Add the values
-        self._x[-1] = x
+        self._x.append(x)
         
-        for Arrays, List in zip([self._values, self._valuesBack, self._valuesSub], [Values, self._lastBackground, SubList]):
-            for Array, Value in zip(Arrays, List):
-                if Array is not None:
-                    Array[-1] = Value
+        for Buffers, List in zip([self._values, self._valuesBack, self._valuesSub], [Values, self._lastBackground, SubList]):
+            for Buffer, Value in zip(Buffers, List):
+                if Buffer is not None:
+                    Buffer.append(Value)
         
-        if self._pos < self._maxSize:
-            self._pos += 1
+        super().update()
         
-        # Update plots
-        if self._pos > 1:
+    # Gives the newest values to the lines and updates the limits, this is only done when a frame is drawn
+    def _prepareFrame(self):
+        if len(self._x) > 1:
             MinValues = [None] * self._axCount
             MaxValues = [None] * self._axCount
+            xValues = self._x.getValues()
             
-            for Lines, Arrays in zip([self._lines, self._linesBack, self._linesSub], [self._values, self._valuesBack, self._valuesSub]):
-                for ID, Line, Array in zip(self._ID, Lines, Arrays):
+            for Lines, Buffers in zip([self._lines, self._linesBack, self._linesSub], [self._values, self._valuesBack, self._valuesSub]):
+                for ID, Line, Buffer in zip(self._ID, Lines, Buffers):
                     if Line is not None:
-                        Line.set_xdata(self._x[-self._pos:])
-                        Line.set_ydata(Array[-self._pos:])
+                        Line.set_data(xValues, Buffer.getValues())
                         
                         # Find min and max
-                        NewMin = np.min(Array[-self._pos:])                    
+                        NewMin = Buffer.getMin()
                         if MinValues[ID] is None or MinValues[ID] > NewMin:
                             MinValues[ID] = NewMin
                             
-                        NewMax = np.max(Array[-self._pos:])
+                        NewMax = Buffer.getMax()
                         if MaxValues[ID] is None or MaxValues[ID] < NewMax:
                             MaxValues[ID] = NewMax
                                    
-            MinX = np.min(self._x[-self._pos:])
-            MaxX = np.max(self._x[-self._pos:])
+            MinX = self._x.getMin()
+            MaxX = self._x.getMax()
             
             if MinX == MaxX:
                 MinX -= 1
@@ -528,10 +892,7 @@ class plot(livePlot):
                 if BuffSize == 0:
                     BuffSize == 1
                                 
-                axSetXLim(Ax, MinX, MaxX)
-                axSetYLim(Ax, Min - BuffSize, Max + BuffSize)
-        
-        super().update()
+                axSetLim(Ax, MinX, MaxX, Min - BuffSize, Max + BuffSize)
         
        
 # A plot type which is periodicaly renewed overwrting all the previous data
@@ -689,6 +1050,103 @@ class renewPlot(livePlot):
             
         super().update()
         
+
+# Runs a live plot in the process started by remotePlot until it is closed
+# Queue (multiprocessing.Queue): The queue to get the method calls from
+# PlotClass (str): The name of the live plot class
+# Backend (str): The matplotlib backend to use, None to use the default
+# Args (tuple): The arguments for the plot class
+# Kwargs (dict): The kwargs for the plot class
+def _runRemotePlot(Queue, PlotClass, Backend, Args, Kwargs):
+    import queue
+    import math
+    
+    if Backend is not None:
+        matplotlib.use(Backend)
+        
+    import matplotlib.pyplot as plt
+    
+    Plot = globals()[PlotClass](*Args, **Kwargs)
+    plt.show(block = False)
+    MinFrameTime = Plot._minFrameTime
+    
+    while True:
+        # Get all the calls waiting
+        Calls = []
+        
+        try:
+            while True:
+                Calls.append(Queue.get_nowait())
+        
+        except queue.Empty:
+            pass
+        
+        # Only draw the newest frame if the plot is behind
+        Plot._minFrameTime = math.inf if len(Calls) > 1 else MinFrameTime
+        
+        for Name, args, kwargs in Calls:
+            if Name == "close":
+                Plot.close()
+                return
+            
+            getattr(Plot, Name)(*args, **kwargs)
+            
+        Plot._minFrameTime = MinFrameTime
+        Plot.flush()
+        
+        # Keep the window responsive while waiting
+        Plot.fig.canvas.start_event_loop(0.01)
+
+# Runs a live plot in a separate process such that updating it never waits for the drawing, if the process falls behind then it only draws the newest frame
+class remotePlot:
+    # PlotClass (str): The name of the live plot class to run, must be one of "histogram", "plot" or "renewPlot"
+    # Backend (str): The matplotlib backend to use in the process, "Agg" to not show the plot, None to use the default
+    # args and kwargs are used for the plot class
+    def __init__(self, PlotClass, *args, Backend = None, **kwargs):
+        import multiprocessing as mp
+        from . import exceptions as e
+        
+        if not PlotClass in _plotClasses:
+            raise e.KeywordError("PlotClass", PlotClass, Valid = _plotClasses)
+        
+        # Qt does not survive a fork so always spawn
+        Context = mp.get_context("spawn")
+        self._queue = Context.Queue()
+        self._process = Context.Process(target = _runRemotePlot, args = (self._queue, PlotClass, Backend, args, kwargs), daemon = True)
+        self._process.start()
+        
+    # Runs a method of the plot in the other process without waiting for it
+    # Name (str): The name of the method
+    # args and kwargs are used for the method
+    def call(self, Name, *args, **kwargs):
+        if self._process.is_alive():
+            self._queue.put((str(Name), args, kwargs))
+        
+    # Updates the plot with new values, see the update method of the plot class
+    def update(self, *args, **kwargs):
+        self.call("update", *args, **kwargs)
+        
+    # Homes the figure
+    def home(self):
+        self.call("home")
+        
+    # Resets the plot to the inital state
+    def reset(self):
+        self.call("reset")
+        
+    # Checks if the process is still running
+    def isAlive(self):
+        return self._process.is_alive()
+        
+    # Closes the figure and stops the process
+    # Timeout (float): The time to wait for the process to finish drawing before stopping it
+    def close(self, Timeout = 5):
+        self.call("close")
+        self._process.join(Timeout)
+        
+        if self._process.is_alive():
+            self._process.terminate()
+        
         
 if __name__ == "__main__":
     import numpy as np